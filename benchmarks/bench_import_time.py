@@ -0,0 +1,97 @@
+"""
+⏱️ Benchmark - Temps d'import au démarrage (python -X importtime)
+Mesure le coût d'import de chaque module applicatif et des dépendances les plus lourdes
+
+Usage :
+    python benchmarks/bench_import_time.py                      # rapport
+    python benchmarks/bench_import_time.py --save baseline.json # enregistre une référence
+    python benchmarks/bench_import_time.py --baseline baseline.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+APP_MODULES = [
+    'core.app_core',
+    'ui',
+    'ui.enhanced_components',
+    'services.secure_gemini_client',
+    'services.secure_cv_parser',
+    'services.secure_file_handler',
+    'services.secure_template_engine',
+    'services.enhanced_ai_service',
+    'utils.secure_crypto',
+    'utils.secure_logging',
+]
+
+HEAVY_DEPENDENCIES = ['pandas', 'plotly', 'google.generativeai', 'PyPDF2', 'docx', 'spacy', 'yake', 'instructor']
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """Parse la sortie -X importtime : module -> temps cumulé (µs)"""
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        parts = [part.strip() for part in line[len('import time:'):].split('|')]
+        if len(parts) != 3 or not parts[1].isdigit():
+            continue
+        cumulative[parts[2]] = int(parts[1])
+    return cumulative
+
+
+def measure_module(module: str) -> Tuple[int, Dict[str, int], str]:
+    """Importe `module` dans un interpréteur neuf et retourne (cumul µs, détail, erreur)"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        env={**os.environ, 'PYTHONDONTWRITEBYTECODE': '1'}
+    )
+    timings = parse_importtime(result.stderr)
+    error = ""
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "échec import"
+    return timings.get(module, 0), timings, error
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Temps d'import par module Phoenix CV")
+    parser.add_argument('--save', help="Fichier JSON où enregistrer les mesures")
+    parser.add_argument('--baseline', help="Fichier JSON de référence à comparer")
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+
+    report = {}
+    print(f"{'module':<38}{'cumul (ms)':>12}{'Δ réf (ms)':>12}   dépendances lourdes chargées")
+    for module in APP_MODULES:
+        total_us, timings, error = measure_module(module)
+        heavy = [dep for dep in HEAVY_DEPENDENCIES if dep in timings]
+        report[module] = {'cumulative_us': total_us, 'heavy_dependencies': heavy, 'error': error}
+
+        delta = ""
+        if module in baseline:
+            delta = f"{(total_us - baseline[module]['cumulative_us']) / 1000:+.1f}"
+
+        suffix = f"⚠️ {error}" if error else (", ".join(heavy) or "-")
+        print(f"{module:<38}{total_us / 1000:>12.1f}{delta:>12}   {suffix}")
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nMesures enregistrées dans {args.save}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+⏱️ Benchmark - Débit d'export PDF concurrent
+Lance N exports distincts en parallèle pour plusieurs tailles de pool
+
+Usage : PHOENIX_MASTER_KEY=... python benchmarks/bench_pdf_export.py [exports] [--encrypt]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from services.pdf_export_service import PDFExportService
+from services.secure_template_engine import SecureTemplateEngine
+from benchmarks.bench_template_render import build_large_profile
+
+
+def run(workers: int, htmls, encrypt: bool):
+    with tempfile.TemporaryDirectory() as cache_dir:
+        service = PDFExportService(
+            max_workers=workers, max_pending=len(htmls), job_timeout_seconds=300, cache_dir=cache_dir
+        )
+        # Démarrage de tous les workers (spawn) hors mesure
+        with ThreadPoolExecutor(max_workers=workers) as warmup:
+            list(warmup.map(
+                lambda i: service.export_pdf(f"<html><body><p>warmup {i}</p></body></html>", encrypt=False),
+                range(workers)
+            ))
+
+        latencies = []
+
+        def job(html_content):
+            start = time.perf_counter()
+            service.export_pdf(html_content, encrypt=encrypt)
+            latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(htmls)) as clients:
+            list(clients.map(job, htmls))
+        elapsed = time.perf_counter() - start
+        service.shutdown()
+
+    latencies.sort()
+    return len(htmls) / elapsed, latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.95) - 1]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 and sys.argv[1].isdigit() else 16
+    encrypt = '--encrypt' in sys.argv
+
+    engine = SecureTemplateEngine()
+    profile = build_large_profile()
+    htmls = []
+    for i in range(count):
+        profile.professional_summary = f"Profil de démonstration n°{i}"
+        htmls.append(engine.render_cv_secure(profile, 'modern_free', for_export=True))
+
+    print(f"{count} exports distincts, chiffrement={'oui' if encrypt else 'non'}")
+    for workers in (1, 2, 4):
+        throughput, p50, p95 = run(workers, htmls, encrypt)
+        print(f"workers={workers}  débit={throughput:6.2f} PDF/s  p50={p50:6.2f} s  p95={p95:6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
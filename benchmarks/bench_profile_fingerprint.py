@@ -0,0 +1,54 @@
+"""
+⏱️ Benchmark - Empreinte de profil (clé des caches de rendu, d'export et des jobs ATS)
+Compare l'ancienne empreinte (JSON trié de asdict) à l'instantané en tuples.
+
+Usage : python benchmarks/bench_profile_fingerprint.py [itérations]
+"""
+
+import hashlib
+import json
+import os
+import sys
+import timeit
+from dataclasses import asdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from models.cv_data import CVProfile, PersonalInfo, Experience, Education, Skill
+from services.render_cache import profile_fingerprint, profile_snapshot
+
+
+def legacy_fingerprint(profile: CVProfile) -> str:
+    payload = json.dumps(profile, default=asdict, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def build_profile() -> CVProfile:
+    return CVProfile(
+        personal_info=PersonalInfo(full_name="Marie Durand", email="marie.durand@example.com"),
+        professional_summary="Responsable logistique en reconversion vers la data. " * 6,
+        target_position="Data Analyst",
+        experiences=[
+            Experience(
+                title=f"Poste {i}", company="Entreprise", location="Lyon", start_date="2018", end_date="2022",
+                description="Pilotage des flux et des indicateurs. " * 5,
+                skills_used=["Excel", "SQL", "Power BI"], achievements=["Réduction des délais de 20 %"] * 3
+            )
+            for i in range(5)
+        ],
+        education=[Education(degree="Master", institution="Université", graduation_year="2015")] * 2,
+        skills=[Skill(name=f"Compétence {i}", level="Avancé", category="Technique") for i in range(15)]
+    )
+
+
+if __name__ == '__main__':
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    profile = build_profile()
+
+    for name, func in (
+        ('json + sha256', legacy_fingerprint),
+        ('instantané', profile_snapshot),
+        ('instantané + sha256', profile_fingerprint),
+    ):
+        per_call = timeit.timeit(lambda: func(profile), number=iterations) / iterations
+        print(f"{name:>20} : {per_call * 1e6:8.1f} µs")
@@ -0,0 +1,78 @@
+"""
+⏱️ Stress test - Rate limiting partagé entre process
+N process frappent la même clé : seul un backend partagé doit borner le total
+au quota, quel que soit le nombre de process. Mesure aussi la latence par vérification.
+
+Usage : python benchmarks/bench_rate_limit_backends.py [process] [appels_par_process]
+"""
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.rate_limit_backends import create_backend
+
+MAX_REQUESTS = 100
+WINDOW_SECONDS = 3600
+
+
+def worker(backend_name: str, db_path: str, calls: int, start_event, results):
+    backend = create_backend(backend_name, db_path)
+    start_event.wait()
+
+    allowed = 0
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        ok, _ = backend.hit('shared_session', MAX_REQUESTS, WINDOW_SECONDS)
+        latencies.append(time.perf_counter() - start)
+        allowed += ok
+
+    results.put((allowed, latencies))
+
+
+def run(backend_name: str, processes: int, calls: int):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'rate_limits.db')
+        create_backend(backend_name, db_path)
+
+        ctx = multiprocessing.get_context('spawn')
+        start_event = ctx.Event()
+        results = ctx.Queue()
+        workers = [
+            ctx.Process(target=worker, args=(backend_name, db_path, calls, start_event, results))
+            for _ in range(processes)
+        ]
+        for process in workers:
+            process.start()
+
+        start_event.set()
+        collected = [results.get() for _ in workers]
+        for process in workers:
+            process.join()
+
+    total_allowed = sum(allowed for allowed, _ in collected)
+    latencies = sorted(latency for _, worker_latencies in collected for latency in worker_latencies)
+    p50 = latencies[len(latencies) // 2] * 1e6
+    p95 = latencies[int(len(latencies) * 0.95)] * 1e6
+    p99 = latencies[int(len(latencies) * 0.99)] * 1e6
+
+    print(f"{backend_name:>6} : {total_allowed:5d} autorisés pour un quota de {MAX_REQUESTS} "
+          f"({processes} process × {calls} appels) | p50 {p50:.0f} µs, p95 {p95:.0f} µs, p99 {p99:.0f} µs")
+    return total_allowed
+
+
+if __name__ == '__main__':
+    processes = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    calls = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    run('memory', processes, calls)
+    allowed = run('sqlite', processes, calls)
+    if allowed != MAX_REQUESTS:
+        print(f"❌ Backend sqlite : {allowed} autorisés au lieu de {MAX_REQUESTS}")
+        sys.exit(1)
+    print("✅ Quota respecté globalement par le backend sqlite")
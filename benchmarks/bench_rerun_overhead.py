@@ -0,0 +1,62 @@
+"""
+⏱️ Benchmark - Surcoût d'initialisation des services par rerun Streamlit
+Avant : services reconstruits à chaque rerun / Après : conteneur process-wide
+
+Usage : python benchmarks/bench_rerun_overhead.py [itérations]
+Aucun appel à l'API Gemini : une clé factice suffit si GEMINI_API_KEY n'est pas définie.
+"""
+
+import os
+import sys
+import time
+import statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# La construction du client configure genai sans appeler l'API
+os.environ.setdefault('GEMINI_API_KEY', 'benchmark-placeholder-key-0000')
+
+from services.secure_gemini_client import SecureGeminiClient
+from services.secure_ats_optimizer import SecureATSOptimizer
+from services.secure_template_engine import SecureTemplateEngine
+from core.service_container import get_gemini_client, get_ats_optimizer, get_template_engine
+
+
+def init_services_avant():
+    """Initialisation historique de SecurePhoenixCVApp (une construction par rerun)"""
+    gemini_client = SecureGeminiClient()
+    SecureATSOptimizer(gemini_client)
+    SecureTemplateEngine()
+    gemini_client.executor.shutdown(wait=False)
+
+
+def init_services_apres():
+    """Initialisation via le conteneur de services"""
+    get_gemini_client()
+    get_ats_optimizer()
+    get_template_engine()
+
+
+def mesurer(func, iterations: int):
+    durees = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        durees.append((time.perf_counter() - start) * 1000)
+    return durees
+
+
+def main(iterations: int = 200):
+    # Premier appel hors mesure : remplit le cache du conteneur (coût payé une fois par process)
+    init_services_apres()
+
+    for label, func in (("avant (par rerun)", init_services_avant), ("après (conteneur)", init_services_apres)):
+        durees = mesurer(func, iterations)
+        print(
+            f"{label:<20} moyenne={statistics.mean(durees):8.3f} ms  "
+            f"p50={statistics.median(durees):8.3f} ms  max={max(durees):8.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,83 @@
+"""
+⏱️ Benchmark - Rendu incrémental des sections (profil 10 expériences / 5 formations / 30 compétences)
+Chaque itération reçoit un profil reconstruit (nouveaux objets, comme à un rerun de la page
+de création) ; seul le rendu des sections est mesuré.
+- sans cache : rendu direct de chaque élément
+- cache, profil inchangé : un accès au cache par section
+- cache, une expérience modifiée : seule cette expérience est rendue à nouveau
+
+Usage : python benchmarks/bench_section_render.py [iterations]
+"""
+
+import os
+import sys
+import time
+import statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from bench_template_render import build_large_profile
+from services.secure_template_engine import SecureTemplateEngine
+
+
+def render_sections_uncached(engine: SecureTemplateEngine, profile) -> str:
+    """Rendu historique des sections : chaque élément est rendu à chaque appel"""
+    categories = {}
+    for skill in profile.skills[:30]:
+        categories.setdefault(skill.category or "Autres", []).append((skill.name, skill.level))
+
+    return "".join((
+        "".join(map(engine._render_experience_item_secure, profile.experiences[:10])),
+        "".join(map(engine._render_education_item_secure, profile.education[:5])),
+        "".join(engine._render_skill_category_secure(category, items) for category, items in categories.items()),
+    ))
+
+
+def render_sections_cached(engine: SecureTemplateEngine, profile) -> str:
+    return "".join((
+        engine._render_experiences_secure(profile.experiences),
+        engine._render_education_secure(profile.education),
+        engine._render_skills_secure(profile.skills),
+    ))
+
+
+def edited_profile(iteration: int):
+    profile = build_large_profile()
+    profile.experiences[3].description += f" Révision {iteration}."
+    return profile
+
+
+def mesurer(render, profiles):
+    durees = []
+    for profile in profiles:
+        start = time.perf_counter()
+        render(profile)
+        durees.append((time.perf_counter() - start) * 1_000_000)
+    durees.sort()
+    return statistics.mean(durees), durees[len(durees) // 2], durees[int(len(durees) * 0.95) - 1]
+
+
+def main(iterations: int = 1000):
+    engine = SecureTemplateEngine()
+    # Rendu initial : remplit le cache comme le premier affichage de la page
+    render_sections_cached(engine, build_large_profile())
+
+    scenarios = {
+        "sans cache": (render_sections_uncached, [build_large_profile() for _ in range(iterations)]),
+        "cache, profil inchangé": (render_sections_cached, [build_large_profile() for _ in range(iterations)]),
+        "cache, 1 expérience modifiée": (render_sections_cached, [edited_profile(i) for i in range(iterations)]),
+    }
+
+    resultats = {}
+    for label, (render, profiles) in scenarios.items():
+        resultats[label] = mesurer(lambda profile: render(engine, profile), profiles)
+        moyenne, p50, p95 = resultats[label]
+        print(f"{label:<30} moyenne={moyenne:7.1f} µs  p50={p50:7.1f} µs  p95={p95:7.1f} µs")
+
+    reference = resultats["sans cache"][1]
+    for label in ("cache, profil inchangé", "cache, 1 expérience modifiée"):
+        print(f"Accélération ({label}) : x{reference / resultats[label][1]:.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
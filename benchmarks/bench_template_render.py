@@ -0,0 +1,116 @@
+"""
+⏱️ Benchmark - Rendu de template CV (profil 10 expériences / 30 compétences)
+Compare l'ancien rendu (remplacements successifs + bleach par rendu) au template compilé
+
+Usage : python benchmarks/bench_template_render.py [iterations]
+"""
+
+import html
+import os
+import sys
+import time
+import statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from models.cv_data import CVProfile, PersonalInfo, Experience, Education, Skill
+from services.secure_template_engine import SecureTemplateEngine, DOCUMENT_SHELL
+from utils.secure_validator import SecureValidator
+
+
+def build_large_profile() -> CVProfile:
+    """Profil de référence : 10 expériences, 5 formations, 30 compétences"""
+    experiences = [
+        Experience(
+            title=f"Poste {i}",
+            company=f"Entreprise {i}",
+            location="Paris",
+            start_date="01/2015",
+            end_date="12/2016",
+            description="Coordination d'équipes pluridisciplinaires & gestion de projets critiques. " * 4,
+            skills_used=["Communication", "Organisation"],
+            achievements=["Réduction des délais de 20%"]
+        )
+        for i in range(10)
+    ]
+    education = [
+        Education(degree=f"Diplôme {i}", institution=f"École {i}", location="Lyon", graduation_year="2014")
+        for i in range(5)
+    ]
+    skills = [
+        Skill(name=f"Compétence {i}", level="Avancé", category=("Technique", "Soft Skills", "Langues")[i % 3])
+        for i in range(30)
+    ]
+    return CVProfile(
+        personal_info=PersonalInfo(
+            full_name="Marie Dupont",
+            email="marie.demo@phoenix.cv",
+            phone="06 00 00 00 00",
+            address="Paris, France",
+            linkedin="linkedin.com/in/demo"
+        ),
+        professional_summary="Profil de démonstration <reconversion> vers le développement web.",
+        target_position="Développeur Web",
+        target_sector="Technologie",
+        current_sector="Santé",
+        experiences=experiences,
+        education=education,
+        skills=skills
+    )
+
+
+def legacy_render(engine: SecureTemplateEngine, profile: CVProfile, template_id: str) -> str:
+    """Reproduction de l'ancien algorithme : 10 str.replace puis bleach sur le document complet"""
+    template = engine.get_template(template_id)
+    html_content = template.html_template
+
+    safe_replacements = {
+        '{{FULL_NAME}}': html.escape(profile.personal_info.full_name),
+        '{{EMAIL}}': html.escape(profile.personal_info.email),
+        '{{PHONE}}': html.escape(profile.personal_info.phone),
+        '{{ADDRESS}}': html.escape(profile.personal_info.address),
+        '{{LINKEDIN}}': html.escape(profile.personal_info.linkedin),
+        '{{PROFESSIONAL_SUMMARY}}': html.escape(profile.professional_summary),
+        '{{TARGET_POSITION}}': html.escape(profile.target_position)
+    }
+    for placeholder, safe_value in safe_replacements.items():
+        html_content = html_content.replace(placeholder, safe_value)
+
+    html_content = html_content.replace('{{EXPERIENCES}}', engine._render_experiences_secure(profile.experiences))
+    html_content = html_content.replace('{{EDUCATION}}', engine._render_education_secure(profile.education))
+    html_content = html_content.replace('{{SKILLS}}', engine._render_skills_secure(profile.skills))
+
+    full_html = DOCUMENT_SHELL % {'css_styles': template.css_styles, 'html_template': html_content}
+    full_html = full_html.replace('{{FULL_NAME}}', html.escape(profile.personal_info.full_name))
+    return SecureValidator.sanitize_html_output(full_html)
+
+
+def mesurer(func, iterations: int):
+    durees = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        durees.append((time.perf_counter() - start) * 1000)
+    durees.sort()
+    return statistics.mean(durees), durees[len(durees) // 2], durees[int(len(durees) * 0.95) - 1]
+
+
+def main(iterations: int = 500):
+    engine = SecureTemplateEngine()
+    profile = build_large_profile()
+    template_id = 'modern_free'
+
+    resultats = {
+        "ancien (replace + bleach)": mesurer(lambda: legacy_render(engine, profile, template_id), iterations),
+        "compilé (single join)": mesurer(lambda: engine._render_template_secure(engine.get_template(template_id), profile, False), iterations),
+    }
+
+    for label, (moyenne, p50, p95) in resultats.items():
+        print(f"{label:<28} moyenne={moyenne:7.3f} ms  p50={p50:7.3f} ms  p95={p95:7.3f} ms")
+
+    ancien, compile_ = resultats["ancien (replace + bleach)"][0], resultats["compilé (single join)"][0]
+    print(f"\nAccélération : x{ancien / compile_:.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
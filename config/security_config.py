@@ -1,4 +1,7 @@
+import functools
 import os
+import tempfile
+from typing import Tuple
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import base64
@@ -21,17 +24,119 @@ class SecurityConfig:
     FILE_UPLOADS_PER_HOUR = 5
     CV_GENERATION_PER_DAY = 20
     
+    # memory : par process ; sqlite : partagé entre les process Streamlit d'un même hôte
+    RATE_LIMIT_BACKEND = os.environ.get('PHOENIX_RATE_LIMIT_BACKEND', 'memory')
+    RATE_LIMIT_SQLITE_PATH = os.environ.get(
+        'PHOENIX_RATE_LIMIT_DB', os.path.join(tempfile.gettempdir(), 'phoenix_cv_rate_limits.db')
+    )
+    
+    # Budget Gemini du process (à diviser par le nombre de réplicas)
+    GEMINI_REQUESTS_PER_MINUTE = int(os.environ.get('PHOENIX_GEMINI_RPM', 15))
+    GEMINI_TOKENS_PER_MINUTE = int(os.environ.get('PHOENIX_GEMINI_TPM', 1000000))
+    GEMINI_MAX_QUEUE_DEPTH = 100
+    GEMINI_QUEUE_TIMEOUT_SECONDS = 30
+    
+    JOB_QUEUE_DB_PATH = os.environ.get(
+        'PHOENIX_JOB_DB', os.path.join(tempfile.gettempdir(), 'phoenix_cv_jobs.db')
+    )
+    JOB_QUEUE_WORKERS = int(os.environ.get('PHOENIX_JOB_WORKERS', 2))
+    JOB_RESULT_TTL_SECONDS = 24 * 3600
+    
+    # Exposition Prometheus (GET /metrics) ; 0 = désactivée
+    METRICS_PORT = int(os.environ.get('PHOENIX_METRICS_PORT', 0))
+    METRICS_HOST = os.environ.get('PHOENIX_METRICS_HOST', '127.0.0.1')
+    # Traces par action utilisateur : buffer mémoire, et fichier JSONL (OTLP) si défini
+    TRACE_BUFFER_SIZE = 100
+    TRACE_FILE = os.environ.get('PHOENIX_TRACE_FILE')
+    
     SESSION_TIMEOUT_MINUTES = 30
     MAX_SESSIONS_PER_USER = 3
+    # État lourd des sessions (profils) : budget mémoire du process, puis disque chiffré
+    SESSION_STORE_MEMORY_BUDGET = int(os.environ.get('PHOENIX_SESSION_MEMORY_BUDGET', 64 * 1024 * 1024))
+    SESSION_STORE_DIR = os.environ.get(
+        'PHOENIX_SESSION_DIR', os.path.join(tempfile.gettempdir(), 'phoenix_cv_sessions')
+    )
+    SESSION_STORE_REAP_INTERVAL_SECONDS = 60
     
     LOG_RETENTION_DAYS = 90
     MAX_LOG_FILE_SIZE = 50 * 1024 * 1024
     
+    PDF_EXPORT_WORKERS = int(os.environ.get('PHOENIX_PDF_WORKERS', 2))
+    PDF_EXPORT_MAX_PENDING = 8
+    PDF_EXPORT_TIMEOUT_SECONDS = 60
+    EXPORT_CACHE_DIR = os.environ.get(
+        'PHOENIX_EXPORT_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'phoenix_cv_exports')
+    )
+    EXPORT_CACHE_MAX_FILES = 500
+    EXPORT_SPOOL_MAX_MEMORY = 1024 * 1024
+    GALLERY_CACHE_DIR = os.environ.get(
+        'PHOENIX_GALLERY_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'phoenix_cv_gallery')
+    )
+    
     ALLOWED_HTML_TAGS = ['b', 'i', 'u', 'br', 'p', 'div', 'span']
     ALLOWED_HTML_ATTRIBUTES = {'class': [], 'id': []}
+    # Structure des templates statiques (fichiers de confiance, pas du contenu utilisateur)
+    TEMPLATE_HTML_TAGS = [
+        'b', 'i', 'u', 'br', 'p', 'div', 'span', 'strong', 'em', 'small',
+        'header', 'footer', 'section', 'article', 'aside', 'main', 'nav',
+        'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'ul', 'ol', 'li', 'hr',
+        'table', 'thead', 'tbody', 'tr', 'th', 'td'
+    ]
+    TEMPLATE_HTML_ATTRIBUTES = {'*': ['class', 'id']}
+    
+    @staticmethod
+    def has_encryption_key_source() -> bool:
+        """Au moins une source de clé configurée (clé dérivée injectée ou clé maître)"""
+        return any(os.environ.get(name) for name in (
+            'PHOENIX_ENCRYPTION_KEY', 'PHOENIX_ENCRYPTION_KEY_FILE', 'PHOENIX_MASTER_KEY'
+        ))
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def get_encryption_keys() -> Tuple[bytes, ...]:
+        """
+        Trousseau de clés Fernet, la clé primaire en tête, résolu une fois par process :
+        1. PHOENIX_ENCRYPTION_KEY_FILE : une clé pré-dérivée par ligne, la première est primaire
+        2. PHOENIX_ENCRYPTION_KEY : clé pré-dérivée, et PHOENIX_PREVIOUS_ENCRYPTION_KEYS
+           (séparées par des virgules) pour relire les données chiffrées avant rotation
+        3. PHOENIX_MASTER_KEY : dérivation PBKDF2 (coûteuse, faite au premier usage seulement)
+        """
+        key_file = os.environ.get('PHOENIX_ENCRYPTION_KEY_FILE')
+        if key_file:
+            try:
+                with open(key_file, 'r', encoding='utf-8') as f:
+                    keys = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+            except OSError:
+                raise SecurityException("Encryption key file unreadable")
+        elif os.environ.get('PHOENIX_ENCRYPTION_KEY'):
+            keys = [os.environ['PHOENIX_ENCRYPTION_KEY']] + [
+                key.strip() for key in os.environ.get('PHOENIX_PREVIOUS_ENCRYPTION_KEYS', '').split(',')
+                if key.strip()
+            ]
+        else:
+            return (SecurityConfig._derive_master_key(),)
+        
+        if not keys:
+            raise SecurityException("Encryption key not configured")
+        return tuple(SecurityConfig._validate_fernet_key(key) for key in keys)
     
     @staticmethod
     def get_encryption_key() -> bytes:
+        """Clé primaire du trousseau"""
+        return SecurityConfig.get_encryption_keys()[0]
+    
+    @staticmethod
+    def _validate_fernet_key(key: str) -> bytes:
+        try:
+            raw = base64.urlsafe_b64decode(key.encode('ascii'))
+        except (ValueError, UnicodeEncodeError):
+            raise SecurityException("Invalid encryption key format")
+        if len(raw) != SecurityConfig.ENCRYPTION_KEY_LENGTH:
+            raise SecurityException("Invalid encryption key length")
+        return key.encode('ascii')
+    
+    @staticmethod
+    def _derive_master_key() -> bytes:
         key_material = os.environ.get('PHOENIX_MASTER_KEY')
         if not key_material:
             raise SecurityException("Master key not configured")
@@ -8,7 +8,13 @@ import os
 import re
 import logging
 import hmac
-import pandas as pd
+import json
+import time
+
+from utils.lazy_imports import lazy_import
+
+# pandas ne sert qu'aux dataframes admin : import différé au premier usage
+pd = lazy_import("pandas")
 
 # Imports sécurisés
 from config.security_config import SecurityConfig
@@ -16,13 +22,18 @@ from utils.exceptions import SecurityException, ValidationException
 from utils.secure_logging import secure_logger
 from utils.secure_validator import SecureValidator
 from utils.secure_crypto import secure_crypto
-from utils.rate_limiter import rate_limiter
+from utils.rate_limiter import rate_limiter, RATE_LIMIT_REJECTIONS
+from utils.metrics import metrics
+from utils.tracing import tracer, STATUS_ERROR
 from models.cv_data import CVTier, PersonalInfo, CVProfile, Experience, Education, Skill
 from services.secure_session_manager import secure_session
-from services.secure_gemini_client import SecureGeminiClient
-from services.secure_ats_optimizer import SecureATSOptimizer
-from services.secure_template_engine import SecureTemplateEngine
-# from services.secure_cv_parser import SecureCVParser  # À implémenter si besoin
+from services.gemini_quota_scheduler import QUOTA_REJECTIONS
+from services.secure_gemini_client import GEMINI_LATENCY
+from core.streamlit_context import bind_streamlit_request_context
+from core.service_container import (
+    get_gemini_client, get_cv_parser, get_ats_optimizer, get_template_engine, get_pdf_export_service,
+    get_docx_export_service, get_template_gallery, get_job_queue, get_metrics_server
+)
 
 # Imports UI modulaires
 from ui import (
@@ -52,6 +63,12 @@ class SecurePhoenixCVApp:
         
         # Initialisation session sécurisée
         secure_session.init_secure_session()
+        
+        # Cache de rendu propre à la session utilisateur, dans le stockage serveur budgété
+        self.render_cache = secure_session.get_render_cache()
+        
+        # Contexte de requête (session, politique de rate limiting) pour les utils et services
+        bind_streamlit_request_context()
     
     def _setup_secure_app(self):
         """Configuration sécurisée de Streamlit"""
@@ -73,13 +90,22 @@ class SecurePhoenixCVApp:
     def _init_secure_services(self):
         """Initialisation sécurisée des services"""
         try:
-            self.gemini_client = SecureGeminiClient()
-            # self.cv_parser = SecureCVParser(self.gemini_client)  # À implémenter si besoin
-            self.cv_parser = None  # Temporaire pour le refactoring
-            self.ats_optimizer = SecureATSOptimizer(self.gemini_client)
-            self.template_engine = SecureTemplateEngine()
+            start_time = time.perf_counter()
+            
+            # Services lourds partagés au niveau process (voir core/service_container.py) :
+            # un rerun Streamlit ne fait plus que des lookups de cache
+            self.gemini_client = get_gemini_client()
+            self.cv_parser = get_cv_parser()
+            self.ats_optimizer = get_ats_optimizer()
+            self.template_engine = get_template_engine()
+            self.pdf_exporter = get_pdf_export_service()
+            self.docx_exporter = get_docx_export_service()
+            self.template_gallery = get_template_gallery()
+            self.job_queue = get_job_queue()
+            get_metrics_server()
             
-            secure_logger.log_security_event("SERVICES_INITIALIZED", {})
+            init_ms = (time.perf_counter() - start_time) * 1000
+            secure_logger.log_security_event("SERVICES_INITIALIZED", {"init_ms": round(init_ms, 3)})
             
         except Exception as e:
             secure_logger.log_security_event(
@@ -120,10 +146,12 @@ class SecurePhoenixCVApp:
     def _security_checks(self):
         """Vérifications de sécurité préalables"""
         # Vérifier les variables d'environnement critiques
-        required_env = ['GEMINI_API_KEY', 'PHOENIX_MASTER_KEY']
-        for env_var in required_env:
-            if not os.environ.get(env_var):
-                raise SecurityException(f"Variable d'environnement manquante: {env_var}")
+        if not os.environ.get('GEMINI_API_KEY'):
+            raise SecurityException("Variable d'environnement manquante: GEMINI_API_KEY")
+        
+        # Clé de chiffrement : pré-dérivée (variable ou fichier) ou clé maître PBKDF2
+        if not SecurityConfig.has_encryption_key_source():
+            raise SecurityException("Variable d'environnement manquante: PHOENIX_MASTER_KEY")
         
         # Vérifier la session sécurisée
         if 'secure_session_id' not in st.session_state:
@@ -153,7 +181,10 @@ class SecurePhoenixCVApp:
         elif page == 'create_cv':
             render_create_cv_page_secure(
                 self.gemini_client,
-                lambda profile: display_generated_cv_secure(profile, self.template_engine, self.ats_optimizer)
+                lambda profile: display_generated_cv_secure(
+                    profile, self.template_engine, self.ats_optimizer, self.render_cache,
+                    self.pdf_exporter, self.docx_exporter, self.job_queue
+                )
             )
         elif page == 'upload_cv':
             if self.cv_parser:
@@ -161,15 +192,20 @@ class SecurePhoenixCVApp:
                     self.cv_parser,
                     lambda profile: display_parsed_cv_secure(
                         profile,
-                        lambda prof: display_generated_cv_secure(prof, self.template_engine, self.ats_optimizer)
-                    )
+                        lambda prof: display_generated_cv_secure(
+                            prof, self.template_engine, self.ats_optimizer, self.render_cache,
+                            self.pdf_exporter, self.docx_exporter, self.job_queue
+                        )
+                    ),
+                    self.job_queue
                 )
             else:
                 st.error("🚫 Service CV Parser non disponible")
         elif page == 'templates':
             render_templates_page_secure(
                 self.template_engine,
-                create_demo_profile_secure
+                create_demo_profile_secure,
+                self.template_gallery
             )
         elif page == 'pricing':
             render_pricing_page_secure()
@@ -195,7 +231,9 @@ def main_secure():
         logger.info("🛡️ Démarrage Phoenix CV Secure Application")
         
         # Vérifications de sécurité critiques
-        required_env_vars = ['GEMINI_API_KEY', 'PHOENIX_MASTER_KEY']
+        required_env_vars = ['GEMINI_API_KEY']
+        if not SecurityConfig.has_encryption_key_source():
+            required_env_vars.append('PHOENIX_MASTER_KEY')
         
         for env_var in required_env_vars:
             if not os.environ.get(env_var):
@@ -217,7 +255,7 @@ def main_secure():
             st.stop()
         
         master_key = os.environ.get('PHOENIX_MASTER_KEY')
-        if len(master_key) < 32:
+        if master_key is not None and len(master_key) < 32:
             st.error("🚫 Clé maître trop faible (minimum 32 caractères)")
             secure_logger.log_security_event("WEAK_MASTER_KEY", {}, "CRITICAL")
             st.stop()
@@ -281,20 +319,90 @@ def render_security_dashboard():
     
     st.title("🛡️ Phoenix CV - Dashboard Sécurité")
     
-    # Métriques de sécurité temps réel
+    # Métriques temps réel du process (registre utils/metrics.py)
+    store_stats = secure_session.store.stats()
+    gemini_latency = GEMINI_LATENCY.percentiles((0.5, 0.95))
+    blocked = RATE_LIMIT_REJECTIONS.total() + QUOTA_REJECTIONS.total()
+    uptime_minutes = int(metrics.uptime_seconds // 60)
+    
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("🔒 Sessions Actives", "47", "↑ 12%")
+        st.metric("🔒 Sessions Actives", store_stats['memory_sessions'] + store_stats['disk_sessions'])
     
     with col2:
-        st.metric("🚫 Tentatives Bloquées", "3", "↓ 85%")
+        st.metric("🚫 Tentatives Bloquées", int(blocked))
     
     with col3:
-        st.metric("⚡ Score Sécurité", "9.2/10", "↑ 0.3")
+        st.metric(
+            "⚡ Latence Gemini p95", f"{gemini_latency[0.95] * 1000:.0f} ms", f"p50 {gemini_latency[0.5] * 1000:.0f} ms",
+            delta_color="off"
+        )
     
     with col4:
-        st.metric("🛡️ Uptime Sécurisé", "99.97%", "✅ Stable")
+        st.metric("🛡️ Uptime Process", f"{uptime_minutes // 60} h {uptime_minutes % 60:02d} min")
+    
+    # Percentiles de latence par opération
+    st.markdown("### ⏱️ Latences")
+    
+    latency_rows = []
+    for name, label in (
+        ('phoenix_gemini_request_seconds', "Appel Gemini"),
+        ('phoenix_gemini_quota_wait_seconds', "Attente quota Gemini"),
+        ('phoenix_extraction_seconds', "Extraction document"),
+        ('phoenix_validation_seconds', "Validation"),
+        ('phoenix_render_seconds', "Rendu HTML"),
+        ('phoenix_ai_generation_seconds', "Génération IA enrichie"),
+    ):
+        histogram = metrics.get(name)
+        if histogram is None:
+            continue
+        for labels, summary in histogram.summary().items():
+            latency_rows.append({
+                "opération": label,
+                "détail": ", ".join(value for value in labels if value) or "-",
+                "appels": summary['count'],
+                "p50 (ms)": round(summary['p50'] * 1000, 1),
+                "p95 (ms)": round(summary['p95'] * 1000, 1),
+                "p99 (ms)": round(summary['p99'] * 1000, 1),
+                "max (ms)": round(summary['max'] * 1000, 1)
+            })
+    
+    if latency_rows:
+        st.dataframe(pd.DataFrame(latency_rows), use_container_width=True)
+    else:
+        st.info("Aucune mesure de latence pour le moment")
+    
+    # Traces des dernières actions utilisateur (span racine et étapes)
+    st.markdown("### 🔎 Traces Récentes")
+    
+    traces = tracer.recent_traces()
+    if traces:
+        trace_rows = []
+        for trace in traces[:20]:
+            # Spans terminés après leur racine (jobs en arrière-plan) : publiés sans elle
+            root = next((span for span in trace if span.parent_id is None), trace[0])
+            steps = sorted(
+                (span for span in trace if span is not root), key=lambda span: span.duration_ms, reverse=True
+            )
+            trace_rows.append({
+                "corrélation": root.trace_id[:16],
+                "action": root.name,
+                "durée (ms)": round(root.duration_ms, 1),
+                "spans": len(trace),
+                "étape la plus longue": f"{steps[0].name} ({steps[0].duration_ms:.0f} ms)" if steps else "-",
+                "statut": "erreur" if any(span.status_code == STATUS_ERROR for span in trace) else "ok"
+            })
+        st.dataframe(pd.DataFrame(trace_rows), use_container_width=True)
+        
+        st.download_button(
+            "⬇️ Exporter (JSON OpenTelemetry)",
+            data=json.dumps(tracer.export_otlp_json(), ensure_ascii=False),
+            file_name="phoenix_cv_traces.json",
+            mime="application/json"
+        )
+    else:
+        st.info("Aucune trace enregistrée pour le moment")
     
     # Événements sécurité récents
     st.markdown("### 📊 Événements Sécurité Récents")
@@ -306,19 +414,45 @@ def render_security_dashboard():
     else:
         st.info("Aucun événement sécurité récent")
     
+    # File d'attente du quota Gemini (process courant)
+    st.markdown("### 🤖 Quota Gemini")
+    
+    quota_metrics = get_gemini_client().scheduler.metrics()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Requêtes / min", quota_metrics['requests_last_minute'])
+    col2.metric("Tokens / min", quota_metrics['tokens_last_minute'])
+    col3.metric("En file", quota_metrics['queue_depth'], f"{quota_metrics['rejected']} rejet(s)")
+    
+    st.dataframe(
+        pd.DataFrame.from_dict(quota_metrics['tiers'], orient='index'),
+        use_container_width=True
+    )
+    
+    # Stockage serveur des sessions (process courant)
+    st.markdown("### 💾 Sessions Serveur")
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("En mémoire", store_stats['memory_sessions'], f"{store_stats['restored']} relue(s) du disque")
+    col2.metric(
+        "Mémoire utilisée",
+        f"{store_stats['memory_bytes'] / 1024:.0f} Ko",
+        f"budget {store_stats['memory_budget_bytes'] / (1024 * 1024):.0f} Mo"
+    )
+    col3.metric("Sur disque", store_stats['disk_sessions'], f"{store_stats['reaped']} expirée(s)")
+
     # Alertes sécurité
     st.markdown("### 🚨 Alertes Sécurité")
     
-    # Simulation d'alertes
-    alerts = [
-        {"niveau": "INFO", "message": "Mise à jour certificat SSL planifiée", "timestamp": "2025-07-29 14:30"},
-        {"niveau": "SUCCESS", "message": "Backup chiffré complété avec succès", "timestamp": "2025-07-29 12:00"},
-        {"niveau": "WARNING", "message": "Rate limit atteint pour utilisateur anonyme", "timestamp": "2025-07-29 11:45"}
-    ]
+    alerts = secure_logger.recent_alerts()
+    if not alerts:
+        st.success("Aucune alerte récente")
     
+    level_color = {"WARNING": "🟡", "ERROR": "🔴", "CRITICAL": "🚨"}
     for alert in alerts:
-        level_color = {"INFO": "🔵", "SUCCESS": "🟢", "WARNING": "🟡", "ERROR": "🔴"}
-        st.markdown(f"{level_color.get(alert['niveau'], '⚪')} **{alert['niveau']}** - {alert['message']} - {alert['timestamp']}")
+        st.markdown(
+            f"{level_color.get(alert['severity'], '⚪')} **{alert['severity']}** - "
+            f"{alert['event_type']} - {alert['timestamp'][:19].replace('T', ' ')}"
+        )
 
 
 def run_security_tests():
@@ -0,0 +1,124 @@
+"""
+🧩 Conteneur de services Phoenix CV
+Durées de vie des services : process (ressources lourdes) ou session (état utilisateur)
+"""
+
+from typing import Any, Callable, Dict
+
+import streamlit as st
+
+from services.secure_gemini_client import SecureGeminiClient
+from services.secure_ats_optimizer import SecureATSOptimizer
+from services.secure_template_engine import SecureTemplateEngine
+
+SESSION_SERVICES_KEY = '_phoenix_session_services'
+
+
+# Services process-wide : construits une seule fois par process Streamlit
+# et partagés entre toutes les sessions et tous les reruns.
+
+@st.cache_resource(show_spinner=False)
+def get_gemini_client() -> SecureGeminiClient:
+    """Client Gemini partagé (ThreadPoolExecutor et genai configurés une fois)"""
+    return SecureGeminiClient()
+
+
+@st.cache_resource(show_spinner=False)
+def get_ats_optimizer() -> SecureATSOptimizer:
+    """Optimiseur ATS partagé"""
+    return SecureATSOptimizer(get_gemini_client())
+
+
+@st.cache_resource(show_spinner=False)
+def get_cv_parser():
+    """Parser de CV partagé (extraction locale, structuration par Gemini)"""
+    from services.secure_cv_parser import SecureCVParser
+    return SecureCVParser(get_gemini_client())
+
+
+@st.cache_resource(show_spinner=False)
+def get_template_engine() -> SecureTemplateEngine:
+    """Moteur de templates partagé (templates nettoyés une seule fois)"""
+    return SecureTemplateEngine()
+
+
+@st.cache_resource(show_spinner=False)
+def get_pdf_export_service():
+    """Moteur d'export PDF partagé (pool de process et cache disque)"""
+    from services.pdf_export_service import PDFExportService
+    return PDFExportService()
+
+
+@st.cache_resource(show_spinner=False)
+def get_docx_export_service():
+    """Export DOCX partagé (cache par empreinte profil/template, thèmes lus dans les manifests)"""
+    from services.docx_export_service import DOCXExportService
+    return DOCXExportService(get_template_engine().registry)
+
+
+@st.cache_resource(show_spinner=False)
+def get_template_gallery():
+    """Galerie de templates : aperçus pré-rendus au démarrage du process"""
+    from services.template_gallery import TemplateGallery
+    from ui.display_components import create_demo_profile_secure
+
+    gallery = TemplateGallery(get_template_engine(), create_demo_profile_secure)
+    gallery.prerender_all()
+    return gallery
+
+
+@st.cache_resource(show_spinner=False)
+def get_job_queue():
+    """File de jobs IA partagée ; les jobs interrompus par un redémarrage sont relancés"""
+    from services.job_queue import JobQueue
+
+    job_queue = JobQueue()
+    job_queue.register(
+        'ats_analysis',
+        lambda payload: get_ats_optimizer().analyze_ats_compatibility_secure(
+            payload['profile'], payload.get('job_description', '')
+        )
+    )
+    job_queue.register(
+        'cv_parse',
+        lambda payload: get_cv_parser().parse_cv_with_ai_secure(payload['cv_text'])
+    )
+    job_queue.resume_pending()
+    return job_queue
+
+
+@st.cache_resource(show_spinner=False)
+def get_metrics_server():
+    """Endpoint Prometheus du process, si PHOENIX_METRICS_PORT est défini"""
+    from config.security_config import SecurityConfig
+    from utils.metrics import start_metrics_server
+
+    if not SecurityConfig.METRICS_PORT:
+        return None
+    return start_metrics_server(SecurityConfig.METRICS_PORT, SecurityConfig.METRICS_HOST)
+
+
+@st.cache_resource(show_spinner=False)
+def get_enhanced_ai_service():
+    """Service IA enrichi partagé"""
+    from services.enhanced_ai_service import EnhancedAIService
+    return EnhancedAIService()
+
+
+@st.cache_resource(show_spinner=False)
+def get_premium_features_service():
+    """Services premium partagés, adossés au service IA partagé"""
+    from services.premium_features_service import PremiumFeaturesService
+    return PremiumFeaturesService(ai_service=get_enhanced_ai_service())
+
+
+# Services de session : un exemplaire par session utilisateur, conservé entre reruns
+
+def get_session_service(name: str, factory: Callable[[], Any]) -> Any:
+    """Retourne le service de session `name`, créé via `factory` au premier accès"""
+    services: Dict[str, Any] = st.session_state.setdefault(SESSION_SERVICES_KEY, {})
+
+    if name not in services:
+        services[name] = factory()
+
+    return services[name]
@@ -0,0 +1,34 @@
+"""
+Adaptateur Streamlit du contexte de requête
+Le RequestContext est construit une fois par session et conservé dans st.session_state ;
+chaque rerun se contente de le réactiver dans le thread du script.
+"""
+
+import streamlit as st
+
+from models.cv_data import CVTier
+from utils.request_context import ANONYMOUS_SESSION_ID, RequestContext, set_request_context
+
+REQUEST_CONTEXT_KEY = '_phoenix_request_context'
+
+
+def reject_rate_limited_streamlit():
+    """Politique de rejet Streamlit : message utilisateur puis arrêt du rerun"""
+    st.error("🚫 Trop de requêtes. Veuillez patienter avant de réessayer.")
+    st.stop()
+
+
+def bind_streamlit_request_context() -> RequestContext:
+    """Active le contexte de la session Streamlit courante (créé au premier rerun)"""
+    session_id = st.session_state.get('secure_session_id', ANONYMOUS_SESSION_ID)
+    tier = st.session_state.get('user_tier', CVTier.FREE).value
+
+    context = st.session_state.get(REQUEST_CONTEXT_KEY)
+    if context is None or context.session_id != session_id or context.tier != tier:
+        context = RequestContext(
+            session_id=session_id, on_rate_limited=reject_rate_limited_streamlit, tier=tier
+        )
+        st.session_state[REQUEST_CONTEXT_KEY] = context
+
+    set_request_context(context)
+    return context
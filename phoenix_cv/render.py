@@ -0,0 +1,178 @@
+"""
+Rendu de CV en masse, hors Streamlit
+Lit des profils JSONL, les rend en parallèle sur un pool de process et écrit HTML et/ou PDF.
+
+    python -m phoenix_cv.render profils.jsonl --output-dir out/ --format both --workers 4
+
+Chaque ligne JSONL est soit un profil CVProfile, soit un objet
+{"id": ..., "template_id": ..., "profile": {...}}.
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from models.cv_data import CVProfile, PersonalInfo, Experience, Education, Skill
+
+SAFE_OUTPUT_NAME_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+# Moteur de templates propre à chaque process worker
+_engine = None
+
+
+def profile_from_dict(data: Dict[str, Any]) -> CVProfile:
+    """Reconstruit un CVProfile depuis sa forme JSON"""
+    data = dict(data)
+    return CVProfile(
+        personal_info=PersonalInfo(**data.pop('personal_info', {})),
+        experiences=[Experience(**exp) for exp in data.pop('experiences', [])],
+        education=[Education(**edu) for edu in data.pop('education', [])],
+        skills=[Skill(**skill) for skill in data.pop('skills', [])],
+        **data
+    )
+
+
+def _init_worker(quiet: bool):
+    global _engine
+    from services.secure_template_engine import SecureTemplateEngine
+
+    if quiet:
+        from utils.secure_logging import secure_logger
+        secure_logger.logger.setLevel(logging.WARNING)
+        logging.getLogger('xhtml2pdf').setLevel(logging.ERROR)
+
+    _engine = SecureTemplateEngine()
+
+
+def _render_job(job: Tuple[str, str, Dict[str, Any], str, str]) -> Tuple[str, float, float, Optional[str]]:
+    """Rend un profil ; retourne (nom, latence HTML ms, latence PDF ms, erreur)"""
+    name, template_id, profile_data, output_dir, output_format = job
+    pdf_ms = 0.0
+
+    try:
+        profile = profile_from_dict(profile_data)
+
+        start = time.perf_counter()
+        html_content = _engine.render_cv_secure(profile, template_id, for_export=True)
+        html_ms = (time.perf_counter() - start) * 1000
+
+        if output_format in ('html', 'both'):
+            with open(os.path.join(output_dir, f"{name}.html"), 'w', encoding='utf-8') as f:
+                f.write(html_content)
+
+        if output_format in ('pdf', 'both'):
+            from services.pdf_export_service import _render_pdf_file
+
+            start = time.perf_counter()
+            _render_pdf_file(html_content, os.path.join(output_dir, f"{name}.pdf"))
+            pdf_ms = (time.perf_counter() - start) * 1000
+
+        return name, html_ms, pdf_ms, None
+    except Exception as e:
+        return name, 0.0, 0.0, str(e)[:200]
+
+
+def _read_jobs(
+    input_path: str, default_template: str, output_dir: str, output_format: str
+) -> Tuple[List[Tuple], List[Tuple[str, str]]]:
+    """
+    Lit les jobs du fichier JSONL ; retourne (jobs, erreurs par ligne).
+    Une ligne invalide ou un id déjà utilisé est signalé sans interrompre la lecture :
+    deux jobs n'écrivent jamais dans le même fichier de sortie.
+    """
+    jobs = []
+    errors = []
+    names: Dict[str, int] = {}
+    with open(input_path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+
+            label = f"ligne {line_number}"
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                errors.append((label, f"JSON invalide: {e}"))
+                continue
+            if not isinstance(record, dict):
+                errors.append((label, "objet JSON attendu"))
+                continue
+
+            profile_data = record.get('profile', record)
+            template_id = record.get('template_id', default_template)
+
+            name = str(record.get('id', ''))
+            if not SAFE_OUTPUT_NAME_PATTERN.match(name):
+                name = f"cv_{line_number:06d}"
+
+            if name in names:
+                errors.append((label, f"id {name} déjà utilisé ligne {names[name]}"))
+                continue
+            names[name] = line_number
+
+            jobs.append((name, template_id, profile_data, output_dir, output_format))
+    return jobs, errors
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(percent / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Rendu de CV en masse (JSONL → HTML/PDF)")
+    parser.add_argument('input', help="Fichier JSONL de profils")
+    parser.add_argument('--output-dir', default='rendered_cvs')
+    parser.add_argument('--template', default='modern_free', help="Template par défaut")
+    parser.add_argument('--format', choices=('html', 'pdf', 'both'), default='html')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--verbose', action='store_true', help="Affiche les événements de rendu")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    jobs, read_errors = _read_jobs(args.input, args.template, args.output_dir, args.format)
+    for label, error in read_errors[:20]:
+        print(f"  ignoré {label}: {error}", file=sys.stderr)
+    if not jobs:
+        print("Aucun profil à rendre")
+        return 1 if read_errors else 0
+
+    # Des lots par worker amortissent le coût d'IPC sans déséquilibrer la charge
+    chunksize = max(1, len(jobs) // (args.workers * 4))
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=args.workers, initializer=_init_worker, initargs=(not args.verbose,)
+    ) as executor:
+        results = list(executor.map(_render_job, jobs, chunksize=chunksize))
+    elapsed = time.perf_counter() - start
+
+    errors = [(name, error) for name, _, _, error in results if error]
+    html_latencies = sorted(html_ms for _, html_ms, _, error in results if not error)
+    pdf_latencies = sorted(pdf_ms for _, _, pdf_ms, error in results if not error and pdf_ms)
+
+    print(f"{len(results) - len(errors)}/{len(results)} CV rendus en {elapsed:.2f}s "
+          f"({len(results) / elapsed:.1f} CV/s, {args.workers} worker(s))")
+    print(f"Rendu HTML : p50 {_percentile(html_latencies, 50):.2f} ms, "
+          f"p95 {_percentile(html_latencies, 95):.2f} ms")
+    if pdf_latencies:
+        print(f"Conversion PDF : p50 {_percentile(pdf_latencies, 50):.1f} ms, "
+              f"p95 {_percentile(pdf_latencies, 95):.1f} ms")
+
+    for name, error in errors[:20]:
+        print(f"  échec {name}: {error}", file=sys.stderr)
+
+    return 1 if errors or read_errors else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
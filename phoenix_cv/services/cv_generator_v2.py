@@ -1,17 +1,72 @@
 # services/cv_generator_v2.py
 import logging
-import google.generativeai as genai
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import asyncio
-
-# NOUVEAU : Imports pour les innovations
-import instructor
-import yake
-import spacy
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 from models.cv_models import CVRequest, CVResponse, ATSOptimization, Experience, Competence, AccrocheIA # Assumons que ces modèles existent
 from services.data_anonymizer import DataAnonymizer
+from services.nlp_model_registry import nlp_registry
 from tenacity import retry, stop_after_attempt, wait_fixed
+from utils.lazy_imports import lazy_import
+
+# Dépendances lourdes (Gemini, Instructor, Yake) importées au premier usage
+genai = lazy_import("google.generativeai")
+instructor = lazy_import("instructor")
+yake = lazy_import("yake")
+
+
+class KeywordCache:
+    """Cache LRU + TTL des mots-clés extraits, indexé par texte d'annonce normalisé"""
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: int = 3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, List[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(annonce_text: str) -> str:
+        """Clé stable : annonce normalisée (casse, espaces) puis hashée"""
+        normalized = re.sub(r'\s+', ' ', annonce_text).strip().lower()
+        return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[List[str]]:
+        """Retourne les mots-clés en cache s'ils ne sont pas expirés"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            stored_at, keywords = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return list(keywords)
+
+    def set(self, key: str, keywords: List[str]):
+        """Enregistre les mots-clés et évince l'entrée la moins récente si besoin"""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), list(keywords))
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
 
 class CVGeneratorServiceV2:
     """
@@ -19,14 +74,36 @@ class CVGeneratorServiceV2:
     extraction de mots-clés intelligente et exécution asynchrone.
     """
     
-    def __init__(self):
+    def __init__(self, max_reformulations_concurrentes: int = 4, timeout_reformulation_s: float = 30.0):
         self.anonymizer = DataAnonymizer()
-        # NOUVEAU : Client Gemini "patché" par Instructor
-        self.model = instructor.patch(genai.GenerativeModel('models/gemini-1.5-flash'))
-        # NOUVEAU : Extracteur de mots-clés Yake
-        self.kw_extractor = yake.KeywordExtractor(lan="fr", top=20, n=3)
-        # NOUVEAU : Modèle spaCy pour le parsing
-        self.nlp = spacy.load("fr_core_news_md")
+        # Parallélisme des appels LLM de reformulation d'expériences
+        self.max_reformulations_concurrentes = max(1, max_reformulations_concurrentes)
+        self.timeout_reformulation_s = timeout_reformulation_s
+        self._model = None
+        self._kw_extractor = None
+        # Yake est purement CPU : exécuté hors de la boucle asyncio, résultats mis en cache
+        self.kw_cache = KeywordCache()
+        self._kw_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="yake")
+        # Le modèle spaCy est partagé via nlp_registry (chargé une fois par process)
+
+    @property
+    def model(self):
+        """Client Gemini "patché" par Instructor, créé au premier appel IA"""
+        if self._model is None:
+            self._model = instructor.patch(genai.GenerativeModel('models/gemini-1.5-flash'))
+        return self._model
+
+    @property
+    def kw_extractor(self):
+        """Extracteur de mots-clés Yake, créé à la première extraction"""
+        if self._kw_extractor is None:
+            self._kw_extractor = yake.KeywordExtractor(lan="fr", top=20, n=3)
+        return self._kw_extractor
+
+    @property
+    def nlp(self):
+        """Pipeline spaCy allégé (tokenisation + NER), partagé entre instances"""
+        return nlp_registry.get()
 
     # NOUVEAU : Fonction de parsing de CV texte brut
     def parser_cv_texte(self, cv_text: str) -> CVRequest:
@@ -34,10 +111,13 @@ class CVGeneratorServiceV2:
         # Ceci est une implémentation simplifiée. Un vrai parsing serait plus complexe.
         # Idéalement, on utiliserait un modèle NER custom.
         doc = self.nlp(cv_text)
-        
+        logging.info("Parsing du CV via spaCy...")
+        return self._construire_requete_depuis_doc(doc)
+
+    def _construire_requete_depuis_doc(self, doc) -> CVRequest:
+        """Construit un CVRequest à partir d'un Doc spaCy"""
         # Logique d'extraction à développer...
         # Pour la démo, on retourne un objet pré-rempli.
-        logging.info("Parsing du CV via spaCy...")
         # ... la logique d'extraction remplirait dynamiquement cet objet
         return CVRequest(
             prenom="Jean", nom="Valjean", email="test@test.com", telephone="0600000000",
@@ -52,6 +132,12 @@ class CVGeneratorServiceV2:
             centres_interet=[]
         )
 
+    def parser_cvs_textes(self, cv_texts: List[str], n_process: int = 1, batch_size: int = 32) -> List[CVRequest]:
+        """Parsing en lot de CV texte brut (nlp.pipe, multi-process si n_process > 1)"""
+        logging.info(f"Parsing en lot de {len(cv_texts)} CV via spaCy...")
+        docs = nlp_registry.pipe(cv_texts, batch_size=batch_size, n_process=n_process)
+        return [self._construire_requete_depuis_doc(doc) for doc in docs]
+
     # NOUVEAU : Fonction asynchrone principale
     async def generer_cv_complet_async(self, cv_text: str, annonce_text: str, template_id: str) -> CVResponse:
         """Point d'entrée principal asynchrone."""
@@ -211,19 +297,21 @@ ACCROCHE CV :"""
     async def _optimiser_experiences_async(self, request: CVRequest) -> List[Dict[str, Any]]:
         """Optimise la présentation des expériences pour reconversion ou ATS"""
         
-        experiences_optimisees = []
+        # Toutes les reformulations partent en parallèle, bornées par le sémaphore :
+        # la durée totale suit l'expérience la plus lente, pas la somme des appels
+        semaphore = asyncio.Semaphore(self.max_reformulations_concurrentes)
         
-        for exp in request.experiences:
+        async def optimiser_experience(exp: Experience) -> Dict[str, Any]:
             if request.est_reconversion:
                 # Reformuler avec angle reconversion
-                description_optimisee = await self._reformuler_experience_reconversion_async(
-                    exp, request.nouveau_domaine, request.competences_transferables
+                description_optimisee = await self._reformuler_experience_protegee_async(
+                    exp, request.nouveau_domaine, request.competences_transferables, semaphore
                 )
             else:
                 # Optimisation ATS classique
                 description_optimisee = self._optimiser_experience_ats(exp, request.secteur_cible)
             
-            exp_optimisee = {
+            return {
                 "poste": exp.poste,
                 "entreprise": exp.entreprise,
                 "periode": f"{exp.date_debut} - {exp.date_fin or 'Actuellement'}",
@@ -233,10 +321,36 @@ ACCROCHE CV :"""
                 "competences_mises_en_avant": exp.competences_developpees,
                 "angle_reconversion": exp.reconversion_angle
             }
-            
-            experiences_optimisees.append(exp_optimisee)
         
-        return experiences_optimisees
+        # gather conserve l'ordre des expériences
+        experiences_optimisees = await asyncio.gather(
+            *(optimiser_experience(exp) for exp in request.experiences)
+        )
+        
+        return list(experiences_optimisees)
+    
+    async def _reformuler_experience_protegee_async(
+        self,
+        experience: Experience,
+        nouveau_domaine: str,
+        competences_transferables: List[str],
+        semaphore: asyncio.Semaphore
+    ) -> str:
+        """Reformulation avec timeout par expérience et repli sur la description originale"""
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(
+                    self._reformuler_experience_reconversion_async(
+                        experience, nouveau_domaine, competences_transferables
+                    ),
+                    timeout=self.timeout_reformulation_s
+                )
+            except asyncio.TimeoutError:
+                logging.warning("Reformulation expérience expirée, description originale conservée.")
+            except Exception as e:
+                logging.warning(f"Reformulation expérience en échec ({str(e)[:100]}), description originale conservée.")
+        
+        return experience.description
     
     @retry(stop=stop_after_attempt(2), wait=wait_fixed(1))
     async def _reformuler_experience_reconversion_async(
@@ -319,8 +433,7 @@ Reformule cette expérience pour {nouveau_domaine} :"""
         """Analyse ATS intelligente basée sur l'annonce réelle."""
         logging.info("Analyse ATS avec Yake en cours...")
         
-        keywords_annonce_tuples = self.kw_extractor.extract_keywords(annonce_text)
-        keywords_annonce = [kw for kw, score in keywords_annonce_tuples]
+        keywords_annonce = await self.extraire_mots_cles_async(annonce_text)
         
         # Logique de comparaison et de scoring...
         score_global = 75 # Simulé
@@ -334,6 +447,35 @@ Reformule cette expérience pour {nouveau_domaine} :"""
             mots_cles_a_ajouter=keywords_annonce[10:15]
         )
         
+    def _extraire_mots_cles_sync(self, annonce_text: str) -> List[str]:
+        """Extraction Yake brute (bloquante), sans cache"""
+        return [kw for kw, score in self.kw_extractor.extract_keywords(annonce_text)]
+
+    async def extraire_mots_cles_async(self, annonce_text: str) -> List[str]:
+        """Extrait les mots-clés d'une annonce, via le cache puis un thread dédié"""
+        key = KeywordCache.make_key(annonce_text)
+        cached = self.kw_cache.get(key)
+        if cached is not None:
+            return cached
+
+        loop = asyncio.get_running_loop()
+        keywords = await loop.run_in_executor(self._kw_executor, self._extraire_mots_cles_sync, annonce_text)
+        self.kw_cache.set(key, keywords)
+        return list(keywords)
+
+    async def extraire_mots_cles_batch_async(self, annonces: List[str]) -> List[List[str]]:
+        """Extraction en lot pour les traitements massifs (annonces dupliquées calculées une fois)"""
+        uniques: Dict[str, str] = {}
+        for annonce in annonces:
+            uniques.setdefault(KeywordCache.make_key(annonce), annonce)
+
+        resultats = await asyncio.gather(
+            *(self.extraire_mots_cles_async(annonce) for annonce in uniques.values())
+        )
+        par_cle = dict(zip(uniques.keys(), resultats))
+
+        return [list(par_cle[KeywordCache.make_key(annonce)]) for annonce in annonces]
+
     async def _generer_conseils_amelioration_async(self, request: CVRequest, score_ats: Optional[int] = None) -> List[str]:
         """Génère des conseils personnalisés d'amélioration du CV"""
         
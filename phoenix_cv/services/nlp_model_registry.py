@@ -0,0 +1,68 @@
+# services/nlp_model_registry.py
+import logging
+import threading
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+# Composants inutiles au parsing de CV (tokenisation + NER suffisent) :
+# exclus au chargement, ils ne sont jamais montés en mémoire.
+# Le NER des modèles fr_core_news_* embarque son propre tok2vec : le tok2vec partagé
+# ne sert qu'aux composants exclus ci-dessus.
+COMPOSANTS_EXCLUS_PARSING = ("tok2vec", "parser", "morphologizer", "attribute_ruler", "lemmatizer", "senter")
+
+MODELE_PAR_DEFAUT = "fr_core_news_md"
+
+
+class NLPModelRegistry:
+    """
+    Registre process-wide des modèles spaCy : chaque pipeline est chargé
+    une seule fois, à la première utilisation, puis partagé entre instances.
+    """
+
+    def __init__(self):
+        self._models: Dict[Tuple[str, Tuple[str, ...]], object] = {}
+        self._lock = threading.Lock()
+
+    def get(self, model_name: str = MODELE_PAR_DEFAUT, exclude: Iterable[str] = COMPOSANTS_EXCLUS_PARSING):
+        """Retourne le pipeline demandé, chargé paresseusement"""
+        key = (model_name, tuple(sorted(exclude)))
+
+        nlp = self._models.get(key)
+        if nlp is not None:
+            return nlp
+
+        with self._lock:
+            # Double vérification : un autre thread a pu charger le modèle entre-temps
+            nlp = self._models.get(key)
+            if nlp is None:
+                import spacy
+
+                logging.info(f"Chargement du modèle spaCy {model_name} (exclus: {', '.join(key[1]) or 'aucun'})...")
+                nlp = spacy.load(model_name, exclude=list(key[1]))
+                self._models[key] = nlp
+
+        return nlp
+
+    def pipe(
+        self,
+        textes: Iterable[str],
+        model_name: str = MODELE_PAR_DEFAUT,
+        batch_size: int = 32,
+        n_process: int = 1
+    ) -> Iterator:
+        """
+        Traitement par lot via nlp.pipe (n_process > 1 pour le parsing massif).
+        Les Doc sont produits au fil de l'eau : l'appelant n'en garde que ce qu'il consomme.
+        """
+        nlp = self.get(model_name)
+        return nlp.pipe(textes, batch_size=batch_size, n_process=n_process)
+
+    def loaded_models(self) -> List[str]:
+        with self._lock:
+            return [name for name, _ in self._models]
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+
+
+nlp_registry = NLPModelRegistry()
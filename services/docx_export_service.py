@@ -0,0 +1,177 @@
+import html
+import io
+from typing import Any, Dict
+
+from models.cv_data import CVProfile
+from services.render_cache import BoundedLRUCache, profile_fingerprint
+from utils.lazy_imports import lazy_import
+from utils.secure_logging import secure_logger
+from utils.exceptions import SecurityException, ValidationException
+
+docx = lazy_import("docx")
+docx_shared = lazy_import("docx.shared")
+
+
+def _text(value) -> str:
+    """Les champs validés sont stockés échappés HTML : le DOCX reçoit le texte brut"""
+    return html.unescape(value or "")
+
+
+class DOCXExportService:
+    """Export DOCX construit directement depuis CVProfile (sans passer par le HTML)"""
+
+    def __init__(self, template_registry, max_entries: int = 32, max_bytes: int = 16 * 1024 * 1024):
+        # Déclinaison DOCX des templates (couleur d'accent, police) lue dans leur manifest
+        self.template_registry = template_registry
+        # Un seul exemplaire des octets DOCX par (empreinte profil, template)
+        self._cache = BoundedLRUCache(max_entries=max_entries, max_bytes=max_bytes)
+
+    def export_docx(self, profile: CVProfile, template_id: str) -> bytes:
+        """Retourne le DOCX du profil, généré une fois par contenu/template"""
+        if template_id not in self.template_registry:
+            raise ValidationException(f"Template non autorisé: {template_id}")
+
+        try:
+            return self._cache.get_or_build(
+                f"{profile_fingerprint(profile)}:{template_id}",
+                lambda: self._build_docx(profile, template_id)
+            )
+        except Exception as e:
+            secure_logger.log_security_event(
+                "DOCX_EXPORT_ERROR",
+                {"template_id": template_id, "error": str(e)[:100]},
+                "ERROR"
+            )
+            raise SecurityException("Erreur lors de l'export DOCX")
+
+    def _build_docx(self, profile: CVProfile, template_id: str) -> bytes:
+        """Construit le document puis le sérialise en mémoire"""
+        theme = self._theme(template_id)
+        document = docx.Document()
+
+        normal_style = document.styles['Normal']
+        normal_style.font.name = theme['font']
+        normal_style.font.size = docx_shared.Pt(10.5)
+
+        self._add_header(document, profile, theme)
+
+        if profile.professional_summary:
+            self._add_section_title(document, "Profil Professionnel", theme)
+            document.add_paragraph(_text(profile.professional_summary))
+
+        self._add_experiences(document, profile, theme)
+        self._add_education(document, profile, theme)
+        self._add_skills(document, profile, theme)
+        self._add_extras(document, profile, theme)
+
+        # getvalue() rend le tampon du BytesIO sans copie : un seul exemplaire des octets DOCX
+        buffer = io.BytesIO()
+        document.save(buffer)
+        content = buffer.getvalue()
+
+        secure_logger.log_security_event(
+            "DOCX_GENERATED",
+            {"template_id": template_id, "size": len(content)}
+        )
+        return content
+
+    def _theme(self, template_id: str) -> Dict[str, Any]:
+        info = self.template_registry.info(template_id)
+        accent = info.docx_accent.lstrip('#')
+        return {
+            'accent': tuple(int(accent[index:index + 2], 16) for index in (0, 2, 4)),
+            'font': info.docx_font
+        }
+
+    def _add_header(self, document, profile: CVProfile, theme):
+        info = profile.personal_info
+
+        title = document.add_heading(_text(info.full_name), level=0)
+        self._apply_accent(title, theme)
+
+        if profile.target_position:
+            document.add_heading(_text(profile.target_position), level=2)
+
+        contact = " | ".join(
+            _text(value) for value in (info.email, info.phone, info.address, info.linkedin) if value
+        )
+        if contact:
+            document.add_paragraph(contact)
+
+    def _add_section_title(self, document, title: str, theme):
+        heading = document.add_heading(title, level=1)
+        self._apply_accent(heading, theme)
+
+    def _add_experiences(self, document, profile: CVProfile, theme):
+        self._add_section_title(document, "Expérience Professionnelle", theme)
+
+        if not profile.experiences:
+            document.add_paragraph("Aucune expérience renseignée")
+            return
+
+        for exp in profile.experiences[:10]:
+            end_date = "Présent" if exp.current else _text(exp.end_date)
+
+            paragraph = document.add_paragraph()
+            paragraph.add_run(_text(exp.title)).bold = True
+            paragraph.add_run(f"\n{_text(exp.company)} - {_text(exp.location)}")
+            paragraph.add_run(f"\n{_text(exp.start_date)} - {end_date}").italic = True
+
+            if exp.description:
+                document.add_paragraph(_text(exp.description))
+
+            for achievement in exp.achievements[:10]:
+                document.add_paragraph(_text(achievement), style='List Bullet')
+
+    def _add_education(self, document, profile: CVProfile, theme):
+        self._add_section_title(document, "Formation", theme)
+
+        if not profile.education:
+            document.add_paragraph("Aucune formation renseignée")
+            return
+
+        for edu in profile.education[:5]:
+            paragraph = document.add_paragraph()
+            paragraph.add_run(_text(edu.degree)).bold = True
+            paragraph.add_run(f"\n{_text(edu.institution)} - {_text(edu.location)}")
+            if edu.graduation_year:
+                paragraph.add_run(f"\n{_text(edu.graduation_year)}").italic = True
+
+    def _add_skills(self, document, profile: CVProfile, theme):
+        self._add_section_title(document, "Compétences", theme)
+
+        if not profile.skills:
+            document.add_paragraph("Aucune compétence renseignée")
+            return
+
+        categories = {}
+        for skill in profile.skills[:30]:
+            categories.setdefault(skill.category or "Autres", []).append(skill)
+
+        for category, category_skills in categories.items():
+            paragraph = document.add_paragraph()
+            paragraph.add_run(f"{_text(category)} : ").bold = True
+            paragraph.add_run(", ".join(
+                f"{_text(skill.name)} ({_text(skill.level)})" if skill.level else _text(skill.name)
+                for skill in category_skills
+            ))
+
+    def _add_extras(self, document, profile: CVProfile, theme):
+        if profile.certifications:
+            self._add_section_title(document, "Certifications", theme)
+            for certification in profile.certifications[:20]:
+                document.add_paragraph(_text(str(certification)), style='List Bullet')
+
+        if profile.languages:
+            self._add_section_title(document, "Langues", theme)
+            for language in profile.languages[:10]:
+                if isinstance(language, dict):
+                    label = f"{_text(language.get('language', ''))} - {_text(language.get('level', ''))}"
+                else:
+                    label = _text(str(language))
+                document.add_paragraph(label, style='List Bullet')
+
+    @staticmethod
+    def _apply_accent(paragraph, theme):
+        for run in paragraph.runs:
+            run.font.color.rgb = docx_shared.RGBColor(*theme['accent'])
@@ -3,7 +3,6 @@
 Service IA enrichi aligné avec Phoenix Letters
 """
 
-import google.generativeai as genai
 import streamlit as st
 from typing import Dict, List, Optional, Any, Tuple
 import json
@@ -13,6 +12,13 @@ import time
 from models.cv_data import CVProfile, ATSAnalysis, CVTier
 from utils.secure_validator import SecureValidator
 from utils.secure_logging import SecureLogger
+from utils.lazy_imports import lazy_import
+from utils.metrics import metrics
+
+genai = lazy_import("google.generativeai")
+
+AI_GENERATIONS = metrics.counter('phoenix_ai_generations', "Générations IA enrichies par issue", ('status',))
+AI_GENERATION_LATENCY = metrics.histogram('phoenix_ai_generation_seconds', "Durée des générations IA enrichies")
 
 class EnhancedAIService:
     """Service IA enrichi pour Phoenix CV avec fonctionnalités avancées"""
@@ -21,14 +27,6 @@ class EnhancedAIService:
         self.logger = SecureLogger()
         self.validator = SecureValidator()
         self._initialize_gemini()
-        
-        # Compteurs pour analytics
-        self.generation_stats = {
-            'total_requests': 0,
-            'successful_generations': 0,
-            'failed_generations': 0,
-            'avg_response_time': 0
-        }
     
     def _initialize_gemini(self):
         """Initialise Gemini avec configuration sécurisée"""
@@ -55,7 +53,6 @@ class EnhancedAIService:
     def enhance_professional_summary(self, cv_profile: CVProfile, target_position: str = "") -> str:
         """Améliore le résumé professionnel avec IA"""
         start_time = time.time()
-        self.generation_stats['total_requests'] += 1
         
         try:
             # Construction du prompt sécurisé
@@ -157,16 +154,19 @@ class EnhancedAIService:
             return {'missing_skills': [], 'matching_skills': [], 'suggestions': []}
     
     def get_generation_stats(self) -> Dict[str, Any]:
-        """Retourne les statistiques de génération"""
+        """Retourne les statistiques de génération (registre de métriques du process)"""
+        total_requests = AI_GENERATIONS.total()
         success_rate = 0
-        if self.generation_stats['total_requests'] > 0:
-            success_rate = (self.generation_stats['successful_generations'] / 
-                          self.generation_stats['total_requests']) * 100
+        if total_requests > 0:
+            success_rate = AI_GENERATIONS.value(status='success') / total_requests * 100
+        
+        latency = AI_GENERATION_LATENCY.summary().get((), {})
         
         return {
-            'total_requests': self.generation_stats['total_requests'],
+            'total_requests': int(total_requests),
             'success_rate': round(success_rate, 2),
-            'avg_response_time': round(self.generation_stats['avg_response_time'], 2),
+            'avg_response_time': round(latency.get('mean', 0.0), 2),
+            'p95_response_time': round(latency.get('p95', 0.0), 2),
             'last_updated': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         }
     
@@ -383,16 +383,6 @@ class EnhancedAIService:
         return suggestions
     
     def _update_stats(self, success: bool, response_time: float):
-        """Met à jour les statistiques de génération"""
-        if success:
-            self.generation_stats['successful_generations'] += 1
-        else:
-            self.generation_stats['failed_generations'] += 1
-        
-        # Calcul de la moyenne mobile du temps de réponse
-        current_avg = self.generation_stats['avg_response_time']
-        total_requests = self.generation_stats['total_requests']
-        
-        self.generation_stats['avg_response_time'] = (
-            (current_avg * (total_requests - 1) + response_time) / total_requests
-        )
\ No newline at end of file
+        """Met à jour les statistiques de génération (compteurs thread-safe du registre)"""
+        AI_GENERATIONS.inc(status='success' if success else 'failure')
+        AI_GENERATION_LATENCY.observe(response_time)
\ No newline at end of file
@@ -0,0 +1,193 @@
+"""
+Ordonnanceur global du quota Gemini (requêtes et tokens par minute)
+Les appels sont mis en file par priorité de tier (ECOSYSTEM > PRO > FREE),
+servis à tour de rôle entre sessions d'un même tier, et libérés au rythme du quota.
+"""
+
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List
+
+from config.security_config import SecurityConfig
+from models.cv_data import CVTier
+from utils.metrics import metrics
+from utils.secure_logging import secure_logger
+from utils.exceptions import QuotaExceededException
+
+TIER_PRIORITY = (CVTier.ECOSYSTEM.value, CVTier.PRO.value, CVTier.FREE.value)
+
+QUOTA_WINDOW_SECONDS = 60.0
+
+QUOTA_REJECTIONS = metrics.counter(
+    'phoenix_gemini_quota_rejections', "Appels IA refusés par l'ordonnanceur de quota", ('tier', 'reason')
+)
+QUOTA_WAIT = metrics.histogram('phoenix_gemini_quota_wait_seconds', "Attente dans la file du quota Gemini", ('tier',))
+
+
+class QuotaGrant:
+    """Réservation accordée : requête et tokens estimés, ajustés après l'appel via settle()"""
+    __slots__ = ('tier', 'session_key', 'tokens', 'enqueued_at', 'granted_at', 'event')
+
+    def __init__(self, tier: str, session_key: str, tokens: int):
+        self.tier = tier
+        self.session_key = session_key
+        self.tokens = tokens
+        self.enqueued_at = time.monotonic()
+        self.granted_at = None
+        self.event = threading.Event()
+
+
+class GeminiQuotaScheduler:
+    """File d'attente prioritaire devant l'API Gemini, partagée par toutes les sessions du process"""
+
+    def __init__(
+        self,
+        requests_per_minute: int = SecurityConfig.GEMINI_REQUESTS_PER_MINUTE,
+        tokens_per_minute: int = SecurityConfig.GEMINI_TOKENS_PER_MINUTE,
+        max_queue_depth: int = SecurityConfig.GEMINI_MAX_QUEUE_DEPTH
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_queue_depth = max_queue_depth
+
+        self._condition = threading.Condition()
+        # Réservations de la dernière minute (au plus requests_per_minute entrées)
+        self._window: Deque[QuotaGrant] = deque()
+        self._window_tokens = 0
+        # Par tier : sessions en attente (ordre round-robin) → leurs réservations
+        self._queues: Dict[str, "OrderedDict[str, Deque[QuotaGrant]]"] = {
+            tier: OrderedDict() for tier in TIER_PRIORITY
+        }
+        self._depth = 0
+        self._waits: Dict[str, Deque[float]] = {tier: deque(maxlen=1000) for tier in TIER_PRIORITY}
+        self.rejected = 0
+
+        metrics.gauge('phoenix_gemini_queue_depth', "Appels IA en attente de quota").set_function(
+            lambda: self._depth
+        )
+
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name='gemini-quota', daemon=True)
+        self._dispatcher.start()
+
+    def acquire(self, tier: str, session_key: str, estimated_tokens: int, timeout: float) -> QuotaGrant:
+        """Attend une place dans le quota ; QuotaExceededException si la file est pleine ou trop lente"""
+        if tier not in self._queues:
+            tier = CVTier.FREE.value
+        grant = QuotaGrant(tier, session_key, estimated_tokens)
+
+        with self._condition:
+            if self._depth >= self.max_queue_depth:
+                self.rejected += 1
+                QUOTA_REJECTIONS.inc(tier=tier, reason='queue_full')
+                secure_logger.log_security_event("GEMINI_QUEUE_FULL", {"tier": tier}, "WARNING")
+                raise QuotaExceededException("Service IA saturé, veuillez réessayer")
+
+            self._queues[tier].setdefault(session_key, deque()).append(grant)
+            self._depth += 1
+            self._condition.notify()
+
+        if grant.event.wait(timeout):
+            return grant
+
+        with self._condition:
+            if grant.granted_at is None:
+                self._remove(grant)
+                self.rejected += 1
+                QUOTA_REJECTIONS.inc(tier=tier, reason='timeout')
+                secure_logger.log_security_event(
+                    "GEMINI_QUEUE_TIMEOUT", {"tier": tier, "timeout_s": timeout}, "WARNING"
+                )
+                raise QuotaExceededException("Délai d'attente du service IA dépassé")
+        return grant
+
+    def settle(self, grant: QuotaGrant, actual_tokens: int):
+        """Remplace l'estimation de tokens par la consommation réelle"""
+        with self._condition:
+            if grant.granted_at is not None and grant in self._window:
+                self._window_tokens += actual_tokens - grant.tokens
+            grant.tokens = actual_tokens
+            self._condition.notify()
+
+    def _remove(self, grant: QuotaGrant):
+        sessions = self._queues[grant.tier]
+        pending = sessions.get(grant.session_key)
+        if pending is not None and grant in pending:
+            pending.remove(grant)
+            self._depth -= 1
+            if not pending:
+                del sessions[grant.session_key]
+
+    def _expire(self, now: float):
+        while self._window and now - self._window[0].granted_at >= QUOTA_WINDOW_SECONDS:
+            self._window_tokens -= self._window.popleft().tokens
+
+    def _next_grant(self):
+        """Tier le plus prioritaire ; dans un tier, première session de la rotation"""
+        for tier in TIER_PRIORITY:
+            sessions = self._queues[tier]
+            if sessions:
+                session_key, pending = next(iter(sessions.items()))
+                return sessions, session_key, pending
+        return None
+
+    def _dispatch_loop(self):
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                self._expire(now)
+
+                while True:
+                    candidate = self._next_grant()
+                    if candidate is None:
+                        break
+                    sessions, session_key, pending = candidate
+                    grant = pending[0]
+
+                    if len(self._window) >= self.requests_per_minute or (
+                        self._window and self._window_tokens + grant.tokens > self.tokens_per_minute
+                    ):
+                        break
+
+                    pending.popleft()
+                    # Rotation : la session servie passe en fin de tour de son tier
+                    if pending:
+                        sessions.move_to_end(session_key)
+                    else:
+                        del sessions[session_key]
+                    self._depth -= 1
+
+                    grant.granted_at = now
+                    self._window.append(grant)
+                    self._window_tokens += grant.tokens
+                    self._waits[grant.tier].append(now - grant.enqueued_at)
+                    QUOTA_WAIT.observe(now - grant.enqueued_at, tier=grant.tier)
+                    grant.event.set()
+
+                # Réveil au plus tard à l'expiration de la plus ancienne réservation
+                timeout = None
+                if self._depth and self._window:
+                    timeout = max(0.0, QUOTA_WINDOW_SECONDS - (now - self._window[0].granted_at))
+                self._condition.wait(timeout)
+
+    def metrics(self) -> Dict[str, object]:
+        """Profondeur de file et temps d'attente (p50/p95, en ms) par tier, usage du quota"""
+        with self._condition:
+            self._expire(time.monotonic())
+            metrics = {
+                'requests_last_minute': len(self._window),
+                'tokens_last_minute': self._window_tokens,
+                'queue_depth': self._depth,
+                'rejected': self.rejected,
+                'tiers': {}
+            }
+            for tier in TIER_PRIORITY:
+                waits: List[float] = sorted(self._waits[tier])
+                metrics['tiers'][tier] = {
+                    'queue_depth': sum(len(pending) for pending in self._queues[tier].values()),
+                    'waiting_sessions': len(self._queues[tier]),
+                    'wait_p50_ms': round(waits[len(waits) // 2] * 1000, 1) if waits else 0.0,
+                    'wait_p95_ms': round(waits[int(len(waits) * 0.95)] * 1000, 1) if waits else 0.0,
+                    'wait_samples': len(waits)
+                }
+            return metrics
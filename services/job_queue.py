@@ -0,0 +1,337 @@
+"""
+File de jobs locale pour les générations IA longues
+Les jobs sont persistés dans une table SQLite (entrées et résultats chiffrés) et exécutés
+par des threads workers : un rerun ou un rafraîchissement Streamlit ne perd plus le travail,
+la page retrouve le résultat par l'identifiant du job. Chaque job non terminé porte son
+process propriétaire : s'il a disparu, le job est relancé au démarrage ou à la resoumission.
+"""
+
+import base64
+import contextvars
+import hashlib
+import os
+import pickle
+import secrets
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, Optional
+
+from config.security_config import SecurityConfig
+from utils.request_context import get_request_context, raise_rate_limited, set_request_context
+from utils.secure_logging import secure_logger
+from utils.exceptions import SecurityException, ValidationException
+
+JOB_PENDING = 'pending'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+
+INTERRUPTED_JOB_ERROR = "Job interrompu par l'arrêt du process"
+
+
+def _boot_id() -> str:
+    """Identifiant du démarrage de la machine (Linux), vide ailleurs"""
+    try:
+        with open('/proc/sys/kernel/random/boot_id', 'r', encoding='ascii') as f:
+            return f.read().strip()
+    except OSError:
+        return ''
+
+
+# Propriétaire des jobs soumis par ce process : pid + jeton (démarrage machine, instance du process).
+# Le jeton distingue ce process d'un précédent qui aurait eu le même pid (redémarrage de conteneur).
+OWNER_PID = os.getpid()
+OWNER_TOKEN = f"{_boot_id()}:{secrets.token_hex(8)}"
+
+
+def owner_alive(pid: int, token: str) -> bool:
+    """Le process propriétaire d'un job non terminé tourne-t-il encore ?"""
+    if pid == OWNER_PID:
+        return token == OWNER_TOKEN
+    if token.split(':', 1)[0] != OWNER_TOKEN.split(':', 1)[0]:
+        # Autre démarrage de la machine : le propriétaire a forcément disparu
+        return False
+    if os.name != 'posix':
+        # Pas de sonde de process sans effet de bord : le job est supposé vivant
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+@dataclass(frozen=True)
+class JobStatus:
+    """État d'un job tel que lu par les pages"""
+    id: str
+    kind: str
+    status: str
+    result: Any = None
+    error: str = ""
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JOB_DONE, JOB_FAILED)
+
+
+class JobQueue:
+    """File de jobs idempotente : un même (type, session, empreinte d'entrée) n'est exécuté qu'une fois"""
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            status TEXT NOT NULL,
+            payload BLOB NOT NULL,
+            result BLOB,
+            error TEXT NOT NULL DEFAULT '',
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL,
+            owner_pid INTEGER NOT NULL DEFAULT 0,
+            owner_token TEXT NOT NULL DEFAULT ''
+        )
+    """
+    _OWNER_COLUMNS = (
+        ('owner_pid', "INTEGER NOT NULL DEFAULT 0"),
+        ('owner_token', "TEXT NOT NULL DEFAULT ''"),
+    )
+
+    def __init__(
+        self,
+        db_path: str = SecurityConfig.JOB_QUEUE_DB_PATH,
+        max_workers: int = SecurityConfig.JOB_QUEUE_WORKERS,
+        result_ttl_seconds: int = SecurityConfig.JOB_RESULT_TTL_SECONDS
+    ):
+        self.db_path = db_path
+        self.result_ttl_seconds = result_ttl_seconds
+        self._handlers: Dict[str, Callable[[Any], Any]] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='phoenix-job')
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._done_events: Dict[str, threading.Event] = {}
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        connection = self._connection()
+        connection.execute(self._SCHEMA)
+        # Bases créées avant le suivi du propriétaire des jobs
+        columns = {row[1] for row in connection.execute("PRAGMA table_info(jobs)")}
+        for name, definition in self._OWNER_COLUMNS:
+            if name not in columns:
+                connection.execute(f"ALTER TABLE jobs ADD COLUMN {name} {definition}")
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, isolation_level=None, timeout=5)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def register(self, kind: str, handler: Callable[[Any], Any]):
+        """Déclare le traitement d'un type de job : handler(payload) -> résultat"""
+        self._handlers[kind] = handler
+
+    @staticmethod
+    def job_id(kind: str, input_fingerprint: str) -> str:
+        """
+        Identifiant déterministe : la session courante et l'empreinte de l'entrée. L'identifiant
+        de session Streamlit est dérivé du jeton client de l'URL (SecureSessionManager) : il est
+        le même après un rafraîchissement du navigateur, et la page retrouve le job terminé.
+        """
+        session_hash = get_request_context().session_hash
+        return hashlib.sha256(f"{kind}:{session_hash}:{input_fingerprint}".encode('utf-8')).hexdigest()
+
+    def submit(self, kind: str, payload: Any, input_fingerprint: str) -> str:
+        """Soumet un job ; une resoumission de la même entrée retourne le job existant"""
+        if kind not in self._handlers:
+            raise ValidationException(f"Type de job inconnu: {kind}")
+
+        job_id = self.job_id(kind, input_fingerprint)
+        now = time.time()
+        connection = self._connection()
+
+        with self._lock:
+            inserted = connection.execute(
+                "INSERT OR IGNORE INTO jobs "
+                "(id, kind, status, payload, created_at, updated_at, owner_pid, owner_token) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, JOB_PENDING, self._seal(payload), now, now, OWNER_PID, OWNER_TOKEN)
+            ).rowcount == 1
+
+            if not inserted:
+                # Un job en échec, ou dont le process propriétaire a disparu, est relancé ;
+                # en cours dans un process vivant ou terminé, il est simplement réutilisé
+                inserted = self._reclaim_failed(connection, job_id, now) or self._reclaim_orphaned(job_id)
+
+            if inserted:
+                self._done_events[job_id] = threading.Event()
+
+        if inserted:
+            # Le contexte de la requête (session, tier) suit le job dans le thread worker,
+            # avec une politique de rejet par exception : pas d'appel Streamlit hors du script
+            context = contextvars.copy_context()
+            context.run(self._use_headless_policy)
+            self._executor.submit(context.run, self._run, job_id, kind, payload)
+            secure_logger.log_security_event("JOB_SUBMITTED", {"kind": kind})
+        else:
+            secure_logger.log_security_event("JOB_DEDUPLICATED", {"kind": kind})
+
+        self._purge_expired(now)
+        return job_id
+
+    @staticmethod
+    def _use_headless_policy():
+        set_request_context(replace(get_request_context(), on_rate_limited=raise_rate_limited))
+
+    def _run(self, job_id: str, kind: str, payload: Any):
+        connection = self._connection()
+        connection.execute(
+            "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ?", (JOB_RUNNING, time.time(), job_id)
+        )
+        start = time.perf_counter()
+
+        try:
+            result = self._handlers[kind](payload)
+            connection.execute(
+                "UPDATE jobs SET status = ?, result = ?, updated_at = ? WHERE id = ?",
+                (JOB_DONE, self._seal(result), time.time(), job_id)
+            )
+            secure_logger.log_security_event(
+                "JOB_COMPLETED", {"kind": kind, "duration_ms": round((time.perf_counter() - start) * 1000)}
+            )
+        except Exception as e:
+            connection.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE id = ?",
+                (JOB_FAILED, str(e)[:200], time.time(), job_id)
+            )
+            secure_logger.log_security_event("JOB_FAILED", {"kind": kind, "error": str(e)[:100]}, "ERROR")
+        finally:
+            with self._lock:
+                event = self._done_events.pop(job_id, None)
+            if event is not None:
+                event.set()
+
+    @staticmethod
+    def _reclaim_failed(connection: sqlite3.Connection, job_id: str, now: float) -> bool:
+        return connection.execute(
+            "UPDATE jobs SET status = ?, error = '', updated_at = ?, owner_pid = ?, owner_token = ? "
+            "WHERE id = ? AND status = ?",
+            (JOB_PENDING, now, OWNER_PID, OWNER_TOKEN, job_id, JOB_FAILED)
+        ).rowcount == 1
+
+    def _reclaim_orphaned(self, job_id: str) -> bool:
+        """
+        Reprend un job non terminé dont le propriétaire a disparu. La mise à jour est
+        conditionnée au propriétaire lu : deux process ne peuvent pas reprendre le même job.
+        """
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT owner_pid, owner_token FROM jobs WHERE id = ? AND status IN (?, ?)",
+            (job_id, JOB_PENDING, JOB_RUNNING)
+        ).fetchone()
+        if row is None or owner_alive(*row):
+            return False
+
+        return connection.execute(
+            "UPDATE jobs SET status = ?, error = '', updated_at = ?, owner_pid = ?, owner_token = ? "
+            "WHERE id = ? AND status IN (?, ?) AND owner_pid = ? AND owner_token = ?",
+            (JOB_PENDING, time.time(), OWNER_PID, OWNER_TOKEN, job_id, JOB_PENDING, JOB_RUNNING, *row)
+        ).rowcount == 1
+
+    def get(self, job_id: str) -> Optional[JobStatus]:
+        """État courant du job (résultat déchiffré s'il est terminé)"""
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT kind, status, result, error, owner_pid, owner_token FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        kind, status, result, error, owner_pid, owner_token = row
+        if status in (JOB_PENDING, JOB_RUNNING) and not owner_alive(owner_pid, owner_token):
+            # Process propriétaire arrêté : le job ne finira jamais, la page cesse d'attendre
+            # et une nouvelle soumission le relance
+            connection.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? "
+                "WHERE id = ? AND owner_pid = ? AND owner_token = ?",
+                (JOB_FAILED, INTERRUPTED_JOB_ERROR, time.time(), job_id, owner_pid, owner_token)
+            )
+            return self.get(job_id)
+
+        return JobStatus(
+            id=job_id,
+            kind=kind,
+            status=status,
+            result=self._open(result) if result is not None else None,
+            error=error
+        )
+
+    def wait(self, job_id: str, timeout: float) -> Optional[JobStatus]:
+        """Attend la fin du job au plus `timeout` secondes, puis retourne son état"""
+        with self._lock:
+            event = self._done_events.get(job_id)
+        if event is not None:
+            event.wait(timeout)
+        return self.get(job_id)
+
+    def resume_pending(self) -> int:
+        """
+        Relance (sans contexte de session) les jobs non terminés dont le process propriétaire
+        a disparu, quel que soit leur âge ; ceux d'un process encore vivant ne sont pas touchés.
+        Retourne le nombre de jobs relancés.
+        """
+        rows = self._connection().execute(
+            "SELECT id, kind, payload FROM jobs WHERE status IN (?, ?)", (JOB_PENDING, JOB_RUNNING)
+        ).fetchall()
+
+        resumed = 0
+        for job_id, kind, payload in rows:
+            if kind not in self._handlers or not self._reclaim_orphaned(job_id):
+                continue
+            with self._lock:
+                self._done_events[job_id] = threading.Event()
+            self._executor.submit(self._run, job_id, kind, self._open(payload))
+            resumed += 1
+
+        if resumed:
+            secure_logger.log_security_event("JOBS_RESUMED", {"count": resumed})
+        return resumed
+
+    def _purge_expired(self, now: float):
+        self._connection().execute(
+            "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+            (JOB_DONE, JOB_FAILED, now - self.result_ttl_seconds)
+        )
+
+    @staticmethod
+    def _seal(value: Any) -> bytes:
+        """Sérialisation chiffrée (AES-GCM authentifié : une ligne altérée n'est jamais désérialisée)"""
+        from utils.secure_crypto import secure_crypto
+
+        return secure_crypto.encrypt_bytes(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+    @staticmethod
+    def _open(sealed: Any) -> Any:
+        from utils.secure_crypto import secure_crypto
+
+        try:
+            if isinstance(sealed, str):
+                # Lignes écrites avant le passage au format binaire (Fernet + base64)
+                return pickle.loads(base64.b64decode(secure_crypto.decrypt_data(sealed)))
+            return pickle.loads(secure_crypto.decrypt_bytes(sealed))
+        except SecurityException:
+            raise
+        except Exception:
+            raise SecurityException("Résultat de job illisible")
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
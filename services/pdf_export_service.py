@@ -0,0 +1,216 @@
+import hashlib
+import multiprocessing
+import os
+import shutil
+import signal
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from typing import BinaryIO, Optional
+
+from config.security_config import SecurityConfig
+from utils.secure_logging import secure_logger
+from utils.exceptions import SecurityException
+
+# Marge laissée au délai appliqué dans le worker avant que le process ne soit tué
+WORKER_KILL_GRACE_SECONDS = 5
+# Pas de sondage du démarrage d'un job en file
+QUEUE_POLL_SECONDS = 0.05
+
+
+class RenderTimeout(BaseException):
+    """
+    Délai de rendu dépassé dans le worker. Dérive de BaseException pour ne pas être
+    absorbée par les `except Exception` internes de xhtml2pdf.
+    """
+
+
+def _raise_render_timeout(signum, frame):
+    raise RenderTimeout()
+
+
+def _render_pdf_file(
+    html_content: str,
+    output_path: str,
+    encrypt: bool = False,
+    timeout_seconds: Optional[float] = None
+) -> int:
+    """
+    Conversion HTML → PDF exécutée dans un process worker (xhtml2pdf, pur Python).
+    Le PDF est produit dans un buffer spoolé (bascule dans un fichier temporaire anonyme
+    au-delà de EXPORT_SPOOL_MAX_MEMORY), puis recopié en flux vers le fichier du cache ;
+    avec encrypt=True il est chiffré (AES-GCM par blocs) pendant cette copie : le cache
+    ne contient jamais de version en clair.
+    """
+    from xhtml2pdf import pisa
+
+    # Délai appliqué dans le worker, à partir du démarrage effectif du rendu (hors attente en file)
+    use_timer = timeout_seconds is not None and hasattr(signal, 'setitimer')
+    if use_timer:
+        signal.signal(signal.SIGALRM, _raise_render_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout_seconds)
+
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    try:
+        with tempfile.SpooledTemporaryFile(max_size=SecurityConfig.EXPORT_SPOOL_MAX_MEMORY) as pdf_buffer:
+            result = pisa.CreatePDF(html_content, dest=pdf_buffer, encoding='utf-8')
+            if result.err:
+                raise RuntimeError(f"xhtml2pdf: {result.err} erreur(s) de conversion")
+
+            pdf_buffer.seek(0)
+            with open(tmp_path, 'wb') as pdf_file:
+                if encrypt:
+                    from utils.secure_crypto import secure_crypto
+                    secure_crypto.encrypt_stream_aead(pdf_buffer, pdf_file)
+                else:
+                    shutil.copyfileobj(pdf_buffer, pdf_file)
+
+        # Écriture atomique : un PDF partiel n'est jamais visible dans le cache
+        os.replace(tmp_path, output_path)
+        return os.path.getsize(output_path)
+    finally:
+        if use_timer:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+class PDFExportService:
+    """Export PDF côté serveur : pool de process borné, timeout par job, cache par hash de rendu"""
+
+    def __init__(
+        self,
+        max_workers: int = SecurityConfig.PDF_EXPORT_WORKERS,
+        max_pending: int = SecurityConfig.PDF_EXPORT_MAX_PENDING,
+        job_timeout_seconds: int = SecurityConfig.PDF_EXPORT_TIMEOUT_SECONDS,
+        cache_dir: str = SecurityConfig.EXPORT_CACHE_DIR,
+        max_cached_files: int = SecurityConfig.EXPORT_CACHE_MAX_FILES
+    ):
+        self.job_timeout_seconds = job_timeout_seconds
+        self.cache_dir = cache_dir
+        self.max_cached_files = max_cached_files
+        os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+
+        self.max_workers = max_workers
+        self._executor = self._new_executor()
+        # File d'attente bornée : au-delà, les exports sont refusés plutôt qu'empilés
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+        # Un même rendu demandé deux fois en parallèle n'est converti qu'une fois
+        self._inflight = {}
+        self._lock = threading.RLock()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # spawn : pas de fork d'un serveur Streamlit multi-threadé
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers, mp_context=multiprocessing.get_context('spawn')
+        )
+
+    @staticmethod
+    def render_hash(html_content: str) -> str:
+        return hashlib.sha256(html_content.encode('utf-8')).hexdigest()
+
+    def export_pdf(self, html_content: str, encrypt: bool = True) -> str:
+        """Convertit le HTML d'export en PDF et retourne le chemin du fichier en cache"""
+        render_hash = self.render_hash(html_content)
+        pdf_path = self._cache_path(render_hash, encrypt)
+
+        if os.path.exists(pdf_path):
+            os.utime(pdf_path)
+            secure_logger.log_security_event("PDF_EXPORT_CACHE_HIT", {"encrypted": encrypt})
+            return pdf_path
+
+        job_key = (render_hash, encrypt)
+        with self._lock:
+            future = self._inflight.get(job_key)
+            if future is None:
+                if not self._slots.acquire(blocking=False):
+                    secure_logger.log_security_event("PDF_EXPORT_QUEUE_FULL", {}, "WARNING")
+                    raise SecurityException("File d'export PDF saturée, veuillez réessayer")
+
+                future = self._executor.submit(
+                    _render_pdf_file, html_content, pdf_path, encrypt, self.job_timeout_seconds
+                )
+                future.add_done_callback(lambda _: self._release(job_key))
+                self._inflight[job_key] = future
+
+        try:
+            size = self._wait_for_job(future)
+        except (RenderTimeout, TimeoutError) as e:
+            if isinstance(e, TimeoutError):
+                # Le délai du worker n'a pas pu l'interrompre (code natif bloqué) : pool recyclé
+                self._recycle_executor()
+            secure_logger.log_security_event("PDF_EXPORT_TIMEOUT", {"timeout_s": self.job_timeout_seconds}, "ERROR")
+            raise SecurityException("Délai d'export PDF dépassé")
+        except Exception as e:
+            secure_logger.log_security_event("PDF_EXPORT_ERROR", {"error": str(e)[:100]}, "ERROR")
+            raise SecurityException("Erreur lors de l'export PDF")
+
+        secure_logger.log_security_event("PDF_EXPORTED", {"size": size, "encrypted": encrypt})
+        self._evict_old_files()
+        return pdf_path
+
+    def _wait_for_job(self, future) -> int:
+        """
+        Attend le résultat d'un job : l'attente en file n'est pas décomptée, le délai court
+        à partir du démarrage du job (le worker l'applique lui-même, ceci n'est qu'un filet)
+        """
+        while not future.running():
+            try:
+                return future.result(timeout=QUEUE_POLL_SECONDS)
+            except TimeoutError:
+                continue
+        return future.result(timeout=self.job_timeout_seconds + WORKER_KILL_GRACE_SECONDS)
+
+    def _recycle_executor(self):
+        """Remplace le pool et tue ses workers : seul moyen d'arrêter un rendu bloqué hors Python"""
+        with self._lock:
+            executor = self._executor
+            self._executor = self._new_executor()
+
+        # Les jobs encore attachés à l'ancien pool échouent (BrokenProcessPool) et libèrent leur place
+        processes = list((getattr(executor, '_processes', None) or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+        secure_logger.log_security_event("PDF_EXPORT_POOL_RECYCLED", {"workers": len(processes)}, "WARNING")
+
+    def open_pdf(self, pdf_path: str) -> BinaryIO:
+        """Ouvre un PDF du cache ; les PDF chiffrés sont déchiffrés en flux dans un buffer spoolé"""
+        if not pdf_path.endswith('.aead'):
+            return open(pdf_path, 'rb')
+
+        from utils.secure_crypto import secure_crypto
+
+        buffer = tempfile.SpooledTemporaryFile(max_size=SecurityConfig.EXPORT_SPOOL_MAX_MEMORY)
+        with open(pdf_path, 'rb') as encrypted_file:
+            secure_crypto.decrypt_stream_aead(encrypted_file, buffer)
+        buffer.seek(0)
+        return buffer
+
+    def _cache_path(self, render_hash: str, encrypted: bool) -> str:
+        suffix = '.pdf.aead' if encrypted else '.pdf'
+        return os.path.join(self.cache_dir, f"{render_hash}{suffix}")
+
+    def _release(self, job_key):
+        with self._lock:
+            self._inflight.pop(job_key, None)
+        self._slots.release()
+
+    def _evict_old_files(self):
+        """Borne le cache disque en supprimant les exports les moins récemment servis"""
+        try:
+            entries = [
+                entry for entry in os.scandir(self.cache_dir)
+                if entry.is_file() and entry.name.endswith(('.pdf', '.pdf.aead'))
+            ]
+            if len(entries) <= self.max_cached_files:
+                return
+
+            entries.sort(key=lambda entry: entry.stat().st_mtime)
+            for entry in entries[:len(entries) - self.max_cached_files]:
+                os.remove(entry.path)
+        except OSError:
+            pass
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
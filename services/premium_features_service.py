@@ -15,8 +15,9 @@ from utils.secure_logging import SecureLogger
 class PremiumFeaturesService:
     """Services premium avancés pour Phoenix CV"""
     
-    def __init__(self):
-        self.ai_service = EnhancedAIService()
+    def __init__(self, ai_service: EnhancedAIService):
+        # Service IA partagé du process (core.service_container), jamais recréé ici
+        self.ai_service = ai_service
         self.logger = SecureLogger()
         
     def mirror_match_cv_analyzer(self, cv_profile: CVProfile, job_description: str, user_tier: CVTier) -> Dict[str, Any]:
@@ -0,0 +1,206 @@
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import fields, is_dataclass
+from enum import Enum
+from operator import attrgetter
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+
+from models.cv_data import CVProfile
+from utils.metrics import metrics
+
+RENDER_CACHE_LOOKUPS = metrics.counter(
+    'phoenix_render_cache_lookups', "Consultations du cache de rendus HTML des sessions", ('result',)
+)
+
+# Champs à faible cardinalité (niveaux, catégories, lieux, dates) : une seule copie
+# de chaque valeur dans le process, partagée par tous les instantanés
+INTERNED_FIELDS = frozenset({'level', 'category', 'location', 'start_date', 'end_date', 'graduation_year'})
+
+# Par type de dataclass : lecture de tous les champs en un appel, index des champs à interner
+_SNAPSHOT_PLANS: Dict[type, Tuple[Callable[[Any], Tuple], Tuple[int, ...]]] = {}
+
+
+def _snapshot_plan(cls: type) -> Tuple[Callable[[Any], Tuple], Tuple[int, ...]]:
+    names = [field.name for field in fields(cls)]
+    getter = attrgetter(*names) if len(names) > 1 else (lambda value: (getattr(value, names[0]),))
+    interned = tuple(index for index, name in enumerate(names) if name in INTERNED_FIELDS)
+    plan = _SNAPSHOT_PLANS[cls] = (getter, interned)
+    return plan
+
+
+def profile_snapshot(value: Any) -> Any:
+    """
+    Instantané immuable d'un profil (ou d'une de ses parties) en tuples imbriqués :
+    hashable et comparable, utilisable directement comme clé de cache
+    """
+    value_type = type(value)
+    if value_type is str:
+        return value
+
+    plan = _SNAPSHOT_PLANS.get(value_type)
+    if plan is None:
+        if value_type is list or value_type is tuple:
+            return tuple(map(profile_snapshot, value))
+        if value is None or value_type in (int, float, bool):
+            return value
+        if isinstance(value, Enum):
+            return value.value
+        if isinstance(value, dict):
+            return tuple(sorted((str(key), profile_snapshot(item)) for key, item in value.items()))
+        if not is_dataclass(value):
+            return str(value)
+        plan = _snapshot_plan(value_type)
+
+    getter, interned = plan
+    snapshot = tuple(map(profile_snapshot, getter(value)))
+    if interned:
+        snapshot = list(snapshot)
+        for index in interned:
+            if type(snapshot[index]) is str:
+                snapshot[index] = sys.intern(snapshot[index])
+        snapshot = tuple(snapshot)
+    return snapshot
+
+
+def profile_fingerprint(profile: CVProfile) -> str:
+    """Empreinte stable du contenu d'un profil CV (sha256 du repr de son instantané)"""
+    return hashlib.sha256(repr(profile_snapshot(profile)).encode('utf-8')).hexdigest()
+
+
+class RenderCache:
+    """
+    Rendus HTML d'une session, indexés par (empreinte profil, template, export) et conservés
+    dans le SessionStore : ils comptent dans son budget mémoire et passent sur le tier disque
+    chiffré avec le reste de la session. Au plus `max_entries` rendus par session (LRU).
+    """
+
+    INDEX_KEY = 'render_index'
+
+    def __init__(self, store, session_id: str, max_entries: int = 16, max_entry_bytes: int = 1024 * 1024):
+        self.store = store
+        self.session_id = session_id
+        self.max_entries = max_entries
+        self.max_entry_bytes = max_entry_bytes
+
+    def get_or_render(
+        self,
+        profile: CVProfile,
+        template_id: str,
+        for_export: bool,
+        render_func: Callable[[CVProfile, str, bool], str]
+    ) -> str:
+        """Retourne le rendu en cache, ou rend et mémorise si le contenu a changé"""
+        key = f"render:{profile_fingerprint(profile)}:{template_id}:{int(for_export)}"
+
+        cached = self.store.get(self.session_id, key)
+        if cached is not None:
+            RENDER_CACHE_LOOKUPS.inc(result='hit')
+            self._touch(key)
+            return cached
+
+        RENDER_CACHE_LOOKUPS.inc(result='miss')
+        html_content = render_func(profile, template_id, for_export=for_export)
+
+        if len(html_content) <= self.max_entry_bytes:
+            self.store.set(self.session_id, key, html_content)
+            self._touch(key)
+
+        return html_content
+
+    def _keys(self) -> List[str]:
+        return (self.store.get(self.session_id, self.INDEX_KEY) or '').split()
+
+    def _touch(self, key: str):
+        """Place `key` en fin d'index et supprime les rendus au-delà de max_entries"""
+        keys = [existing for existing in self._keys() if existing != key]
+        keys.append(key)
+
+        for evicted in keys[:-self.max_entries]:
+            self.store.set(self.session_id, evicted, None)
+        self.store.set(self.session_id, self.INDEX_KEY, ' '.join(keys[-self.max_entries:]))
+
+    def clear(self):
+        for key in self._keys():
+            self.store.set(self.session_id, key, None)
+        self.store.set(self.session_id, self.INDEX_KEY, None)
+
+    def __len__(self) -> int:
+        return len(self._keys())
+
+
+def _size_in_bytes(value: Any) -> int:
+    """Taille mémorisée d'une valeur : octets bruts, ou encodage UTF-8 d'une chaîne"""
+    return len(value.encode('utf-8')) if isinstance(value, str) else len(value)
+
+
+class BoundedLRUCache:
+    """Cache LRU thread-safe de valeurs str ou bytes, borné en nombre d'entrées et en octets"""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # Clé -> (valeur, taille en octets) : la taille n'est calculée qu'à l'insertion
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._size_bytes = 0
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key: Hashable, build_func: Callable[[], Any]) -> Any:
+        """Retourne la valeur en cache, ou la construit et la mémorise"""
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                return cached[0]
+
+        value = build_func()
+
+        with self._lock:
+            self._store(key, value)
+
+        return value
+
+    def _store(self, key: Hashable, value: Any):
+        size = _size_in_bytes(value)
+        if size > self.max_bytes:
+            return
+
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size_bytes -= previous[1]
+
+        self._entries[key] = (value, size)
+        self._size_bytes += size
+
+        while self._entries and (len(self._entries) > self.max_entries or self._size_bytes > self.max_bytes):
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._size_bytes -= evicted_size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size_bytes = 0
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class FragmentCache(BoundedLRUCache):
+    """
+    Cache LRU de fragments HTML partagé par toutes les sessions. La clé est le hash Python
+    (SipHash à graine aléatoire par process, 64 bits) de l'instantané des champs rendus :
+    calculé en une passe sur des chaînes dont le hash est mis en cache par l'interpréteur,
+    sans garder les données personnelles en clé. Une collision accidentelle est improbable
+    (~2^-64 par paire) et non provocable sans connaître la graine du process.
+    """
+
+    def __init__(self, max_entries: int = 4096, max_bytes: int = 4 * 1024 * 1024):
+        super().__init__(max_entries, max_bytes)
+
+    def get_or_build(self, snapshot: Tuple, build_func: Callable[[], str]) -> str:
+        return super().get_or_build(hash(snapshot), build_func)
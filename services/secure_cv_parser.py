@@ -1,17 +1,25 @@
 import io
 import re
+import json
 from typing import Dict
 
-import PyPDF2
-
-import docx
-
 from models.cv_data import CVProfile, PersonalInfo, Experience, Education, Skill
 from services.secure_gemini_client import SecureGeminiClient
 from utils.secure_validator import SecureValidator
 from utils.secure_logging import secure_logger
 from utils.exceptions import SecurityException, ValidationException
+from utils.metrics import metrics
+from utils.tracing import trace_span
 from utils.rate_limiter import rate_limit
+from utils.lazy_imports import lazy_import
+
+# Bibliothèques de lecture de documents : chargées au premier upload seulement
+PyPDF2 = lazy_import("PyPDF2")
+docx = lazy_import("docx")
+
+EXTRACTION_LATENCY = metrics.histogram(
+    'phoenix_extraction_seconds', "Durée d'extraction du texte des documents importés", ('format',)
+)
 
 class SecureCVParser:
     """Parser de CV sécurisé"""
@@ -20,6 +28,8 @@ class SecureCVParser:
         self.gemini = gemini_client
     
     @rate_limit(max_requests=5, window_seconds=300)
+    @trace_span('document.extract', format='pdf')
+    @EXTRACTION_LATENCY.time(format='pdf')
     def extract_text_from_pdf_secure(self, file_content: bytes) -> str:
         """Extraction sécurisée de texte PDF"""
         try:
@@ -55,6 +65,8 @@ class SecureCVParser:
             )
             raise SecurityException("Erreur lors de l'extraction du PDF")
     
+    @trace_span('document.extract', format='docx')
+    @EXTRACTION_LATENCY.time(format='docx')
     def extract_text_from_docx_secure(self, file_content: bytes) -> str:
         """Extraction sécurisée de texte DOCX"""
         try:
@@ -84,12 +96,15 @@ class SecureCVParser:
             )
             raise SecurityException("Erreur lors de l'extraction du DOCX")
     
+    @trace_span('cv.parse')
     def parse_cv_with_ai_secure(self, cv_text: str) -> CVProfile:
         """Parsing sécurisé de CV avec IA"""
         try:
-            clean_cv_text = SecureValidator.validate_text_input(cv_text, 50000, "texte CV")
+            with trace_span('cv.validate_text', text_length=len(cv_text)):
+                clean_cv_text = SecureValidator.validate_text_input(cv_text, 50000, "texte CV")
             
-            anonymized_text = self._anonymize_text_for_ai(clean_cv_text)
+            with trace_span('cv.anonymize'):
+                anonymized_text = self._anonymize_text_for_ai(clean_cv_text)
             
             prompt_data = {
                 'cv_content': anonymized_text
@@ -100,9 +115,11 @@ class SecureCVParser:
                 prompt_data
             )
             
-            parsed_data = self._parse_json_response_secure(response)
+            with trace_span('cv.parse_json', response_length=len(response)):
+                parsed_data = self._parse_json_response_secure(response)
             
-            profile = self._build_cv_profile_secure(parsed_data)
+            with trace_span('cv.build_profile'):
+                profile = self._build_cv_profile_secure(parsed_data)
             
             secure_logger.log_security_event(
                 "CV_PARSED_SUCCESSFULLY",
@@ -2,13 +2,18 @@ from pathlib import Path
 import io
 from typing import Tuple
 
-import PyPDF2
-import docx
-
+from utils.lazy_imports import lazy_import
 from utils.secure_validator import SecureValidator
 from utils.secure_logging import secure_logger
+from utils.metrics import metrics
+from utils.tracing import trace_span
 from config.security_config import SecurityConfig
 
+PyPDF2 = lazy_import("PyPDF2")
+docx = lazy_import("docx")
+
+VALIDATION_LATENCY = metrics.histogram('phoenix_validation_seconds', "Durée de validation des entrées", ('target',))
+
 class SecureFileHandler:
     """Gestionnaire de fichiers ultra-sécurisé"""
     
@@ -19,6 +24,8 @@ class SecureFileHandler:
     }
     
     @staticmethod
+    @trace_span('file.validate')
+    @VALIDATION_LATENCY.time(target='file')
     def validate_file_secure(file_content: bytes, filename: str) -> Tuple[bool, str]:
         """Validation sécurisée complète du fichier"""
         try:
@@ -1,3 +1,4 @@
+import contextvars
 import os
 import re
 import time
@@ -6,20 +7,36 @@ from typing import Dict, Any
 from concurrent.futures import ThreadPoolExecutor, TimeoutError
 from functools import wraps
 import html
+from datetime import datetime
 
-import google.generativeai as genai
-
+from utils.lazy_imports import lazy_import
 from utils.secure_logging import secure_logger
-from utils.exceptions import SecurityException
+from utils.exceptions import QuotaExceededException, SecurityException
+from utils.metrics import metrics
 from utils.rate_limiter import rate_limit
+from utils.request_context import get_request_context
 from utils.secure_validator import SecureValidator
+from utils.tracing import current_span, trace_span
+from config.security_config import SecurityConfig
+from services.gemini_quota_scheduler import GeminiQuotaScheduler
+
+genai = lazy_import("google.generativeai")
+
+GEMINI_LATENCY = metrics.histogram(
+    'phoenix_gemini_request_seconds', "Durée des appels Gemini (hors attente du quota)", ('template',)
+)
+GEMINI_REQUESTS = metrics.counter('phoenix_gemini_requests', "Appels Gemini par issue", ('template', 'status'))
 
 class SecureGeminiClient:
     """Client Gemini sécurisé avec protection injection"""
     
-    def __init__(self):
+    # Réserve de tokens de réponse comptée à la réservation, ajustée après l'appel
+    RESPONSE_TOKENS_ESTIMATE = 512
+    
+    def __init__(self, scheduler: GeminiQuotaScheduler = None):
         self._setup_secure_client()
         self.executor = ThreadPoolExecutor(max_workers=2)
+        self.scheduler = scheduler or GeminiQuotaScheduler()
         self._request_history = []
         self._lock = threading.Lock()
     
@@ -47,8 +64,10 @@ class SecureGeminiClient:
         secure_logger.log_security_event("GEMINI_CLIENT_INITIALIZED", {})
     
     @rate_limit(max_requests=10, window_seconds=60)
+    @trace_span('gemini.generate')
     def generate_content_secure(self, prompt_template: str, user_data: Dict[str, str], max_retries: int = 2) -> str:
         """Génération sécurisée avec template et validation"""
+        current_span().set_attribute('prompt.template', prompt_template)
         try:
             clean_data = self._sanitize_user_data(user_data)
             
@@ -57,10 +76,27 @@ class SecureGeminiClient:
             if not self._validate_prompt(secure_prompt):
                 raise SecurityException("Prompt non autorisé")
             
+            context = get_request_context()
+            prompt_tokens = self._estimate_tokens(secure_prompt)
+            
             for attempt in range(max_retries):
                 try:
-                    future = self.executor.submit(self._call_gemini_api, secure_prompt)
-                    response = future.result(timeout=30)
+                    # Chaque tentative consomme une requête du quota global
+                    with trace_span('gemini.quota_wait', tier=context.tier, attempt=attempt + 1):
+                        grant = self.scheduler.acquire(
+                            context.tier,
+                            context.session_hash,
+                            prompt_tokens + self.RESPONSE_TOKENS_ESTIMATE,
+                            SecurityConfig.GEMINI_QUEUE_TIMEOUT_SECONDS
+                        )
+                    # Contexte copié : le span de l'appel API est rattaché à la trace courante
+                    future = self.executor.submit(
+                        contextvars.copy_context().run, self._call_gemini_api, secure_prompt
+                    )
+                    with GEMINI_LATENCY.time(template=prompt_template):
+                        response = future.result(timeout=30)
+                    GEMINI_REQUESTS.inc(template=prompt_template, status='ok')
+                    self.scheduler.settle(grant, prompt_tokens + self._estimate_tokens(response or ""))
                     
                     clean_response = self._sanitize_ai_response(response)
                     
@@ -69,12 +105,18 @@ class SecureGeminiClient:
                     return clean_response
                     
                 except TimeoutError:
+                    GEMINI_REQUESTS.inc(template=prompt_template, status='timeout')
                     secure_logger.log_security_event("GEMINI_TIMEOUT", {"attempt": attempt + 1})
                     if attempt == max_retries - 1:
                         raise SecurityException("Timeout de génération IA")
                     time.sleep(1 * (attempt + 1))
                 
+                except QuotaExceededException:
+                    # Quota global saturé : une nouvelle tentative ne ferait qu'allonger la file
+                    raise
+                
                 except Exception as e:
+                    GEMINI_REQUESTS.inc(template=prompt_template, status='error')
                     secure_logger.log_security_event(
                         "GEMINI_API_ERROR", 
                         {"attempt": attempt + 1, "error": str(e)[:100]}
@@ -213,6 +255,12 @@ RÉPONSE ATTENDUE: JSON avec score, recommandations et mots-clés manquants uniq
         
         return True
     
+    @staticmethod
+    def _estimate_tokens(text: str) -> int:
+        """Estimation grossière (~4 caractères par token) pour le budget TPM"""
+        return len(text) // 4 + 1
+    
+    @trace_span('gemini.api_call')
     def _call_gemini_api(self, prompt: str) -> str:
         """Appel API Gemini avec gestion d'erreurs"""
         response = self.model.generate_content(prompt)
@@ -3,24 +3,40 @@ import threading
 from datetime import datetime, timedelta
 import hashlib
 import hmac # Added import
-from typing import Tuple, Any
+import re
+from typing import Tuple, Any, Optional
 
-from models.cv_data import CVTier
+from models.cv_data import CVTier, CVProfile
+from services.render_cache import RenderCache
+from services.session_store import SessionStore
+from utils.compact_codec import CompactCodec
+from utils.metrics import metrics
 from utils.secure_crypto import secure_crypto
 from utils.secure_logging import secure_logger
 from config.security_config import SecurityConfig
 
+# Jeton client conservé dans l'URL : st.session_state est perdu à chaque rafraîchissement
+CLIENT_TOKEN_PARAM = 'client'
+CLIENT_TOKEN_PATTERN = re.compile(r'^[A-Za-z0-9_-]{22,64}$')
+
 class SecureSessionManager:
     """Gestionnaire de sessions sécurisé"""
     
     def __init__(self):
-        self._active_sessions = {}
+        # État volumineux (profil courant) conservé côté serveur, hors st.session_state
+        self.store = SessionStore(CompactCodec((CVProfile, CVTier)))
+        metrics.gauge('phoenix_sessions_in_memory', "Sessions dont l'état est en mémoire").set_function(
+            lambda: self.store.memory_usage()[0]
+        )
+        metrics.gauge('phoenix_session_store_bytes', "Mémoire occupée par l'état des sessions").set_function(
+            lambda: self.store.memory_usage()[1]
+        )
         self._lock = threading.Lock()
     
     def init_secure_session(self):
         """Initialise une session sécurisée"""
         if 'secure_session_id' not in st.session_state:
-            st.session_state.secure_session_id = secure_crypto.generate_secure_token()
+            st.session_state.secure_session_id = self._session_id_from_client_token()
             st.session_state.session_created = datetime.utcnow()
             st.session_state.last_activity = datetime.utcnow()
         
@@ -32,14 +48,24 @@ class SecureSessionManager:
         if 'cv_count_monthly' not in st.session_state:
             st.session_state.cv_count_monthly = 0
         
-        if 'current_cv_profile' not in st.session_state:
-            st.session_state.current_cv_profile = None
-        
         if 'csrf_token' not in st.session_state:
             st.session_state.csrf_token = secure_crypto.generate_secure_token(16)
         
         st.session_state.last_activity = datetime.utcnow()
     
+    def _session_id_from_client_token(self) -> str:
+        """
+        Identifiant de session dérivé du jeton client de l'URL : stable entre rafraîchissements,
+        il permet de retrouver l'état serveur (profil, jobs IA). Le jeton n'apparaît ni dans
+        les clés du stockage ni dans les logs ; l'invalidation de session en émet un nouveau.
+        """
+        token = st.query_params.get(CLIENT_TOKEN_PARAM, '')
+        if not CLIENT_TOKEN_PATTERN.match(token):
+            token = secure_crypto.generate_secure_token(16)
+            st.query_params[CLIENT_TOKEN_PARAM] = token
+        
+        return hashlib.sha256(f"phoenix-cv/session:{token}".encode('utf-8')).hexdigest()
+    
     def _check_session_timeout(self):
         """Vérifie et gère le timeout de session"""
         if 'last_activity' in st.session_state:
@@ -57,10 +83,35 @@ class SecureSessionManager:
         """Invalide la session courante"""
         secure_logger.log_security_event("SESSION_INVALIDATED", {})
         
+        if 'secure_session_id' in st.session_state:
+            self.store.drop(st.session_state.secure_session_id)
+        # Nouveau jeton client (et donc nouvelle session) au prochain rerun
+        st.query_params.pop(CLIENT_TOKEN_PARAM, None)
+        
         for key in list(st.session_state.keys()):
             if key not in ['page_config']:
                 del st.session_state[key]
     
+    def get_current_profile(self) -> Optional[CVProfile]:
+        """Profil CV courant de la session, relu depuis le stockage serveur"""
+        return self.store.get(st.session_state.secure_session_id, 'current_cv_profile')
+    
+    def set_current_profile(self, profile: Optional[CVProfile]):
+        """Mémorise le profil CV courant de la session (None l'efface)"""
+        self.store.set(st.session_state.secure_session_id, 'current_cv_profile', profile)
+    
+    def get_render_cache(self) -> RenderCache:
+        """Cache des rendus HTML de la session, conservé dans le stockage serveur budgété"""
+        return RenderCache(self.store, st.session_state.secure_session_id)
+    
+    def get_pending_job(self, kind: str) -> Optional[str]:
+        """Identifiant du job de fond `kind` en attente de résultat pour la session"""
+        return self.store.get(st.session_state.secure_session_id, f'pending_job:{kind}')
+    
+    def set_pending_job(self, kind: str, job_id: Optional[str]):
+        """Mémorise (ou efface avec None) le job de fond `kind` suivi par la session"""
+        self.store.set(st.session_state.secure_session_id, f'pending_job:{kind}', job_id)
+    
     def validate_csrf_token(self, provided_token: str) -> bool:
         """Valide le token CSRF"""
         expected_token = st.session_state.get('csrf_token')
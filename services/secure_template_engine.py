@@ -1,11 +1,91 @@
-from dataclasses import dataclass
-from typing import Dict, List
+from dataclasses import dataclass, field
+from operator import attrgetter
+from typing import Dict, List, FrozenSet, Tuple
 import html
+import re
 
-from models.cv_data import CVProfile, CVTier
+from models.cv_data import CVProfile, CVTier, Experience, Education, Skill
+from services.render_cache import FragmentCache
+from services.template_registry import TemplateRegistry, TemplateInfo, DEFAULT_TEMPLATES_DIR
 from utils.secure_validator import SecureValidator
 from utils.secure_logging import secure_logger
 from utils.exceptions import SecurityException, ValidationException
+from utils.metrics import metrics
+from utils.tracing import trace_span
+
+RENDER_LATENCY = metrics.histogram('phoenix_render_seconds', "Durée du rendu HTML des CV", ('template',))
+
+PLACEHOLDER_PATTERN = re.compile(r'\{\{([A-Z_]+)\}\}')
+
+SCALAR_PLACEHOLDERS = frozenset({
+    'FULL_NAME', 'EMAIL', 'PHONE', 'ADDRESS', 'LINKEDIN', 'PROFESSIONAL_SUMMARY', 'TARGET_POSITION'
+})
+SECTION_PLACEHOLDERS = frozenset({'EXPERIENCES', 'EDUCATION', 'SKILLS'})
+KNOWN_PLACEHOLDERS = SCALAR_PLACEHOLDERS | SECTION_PLACEHOLDERS
+
+# À incrémenter à chaque changement du HTML produit (document, fragments, minification ou
+# nettoyage des templates) : les caches de rendus persistants l'incluent dans leurs clés
+RENDERER_VERSION = "1"
+
+# Champs rendus par élément de section : instantané lu en un appel, clé du cache de fragments
+EXPERIENCE_FIELDS = attrgetter('title', 'company', 'location', 'start_date', 'end_date', 'current', 'description')
+EDUCATION_FIELDS = attrgetter('degree', 'institution', 'location', 'graduation_year')
+SKILL_FIELDS = attrgetter('category', 'name', 'level')
+
+DOCUMENT_SHELL = """
+        <!DOCTYPE html>
+        <html lang="fr">
+        <head>
+            <meta charset="UTF-8">
+            <meta name="viewport" content="width=device-width, initial-scale=1.0">
+            <meta http-equiv="Content-Security-Policy" content="default-src 'self'; style-src 'unsafe-inline'; img-src 'self' data:;">
+            <meta http-equiv="X-Frame-Options" content="DENY">
+            <meta http-equiv="X-Content-Type-Options" content="nosniff">
+            <title>CV Phoenix - {{FULL_NAME}}</title>
+            <style>
+                %(css_styles)s
+            </style>
+        </head>
+        <body>
+            %(html_template)s
+        </body>
+        </html>
+        """
+
+
+class CompiledTemplate:
+    """Document compilé en segments littéraux / placeholders, rendu en un seul join"""
+    
+    __slots__ = ('_parts', '_slots', 'placeholders')
+    
+    def __init__(self, source: str):
+        parts: List[str] = []
+        slots = []
+        position = 0
+        
+        for match in PLACEHOLDER_PATTERN.finditer(source):
+            name = match.group(1)
+            if name not in KNOWN_PLACEHOLDERS:
+                # Placeholder inconnu : conservé tel quel dans le littéral
+                continue
+            parts.append(source[position:match.start()])
+            slots.append((len(parts), name))
+            parts.append('')
+            position = match.end()
+        
+        parts.append(source[position:])
+        
+        self._parts = tuple(parts)
+        self._slots = tuple(slots)
+        self.placeholders: FrozenSet[str] = frozenset(name for _, name in slots)
+    
+    def render(self, values: Dict[str, str]) -> str:
+        """Assemble le document ; les valeurs doivent être déjà échappées"""
+        parts = list(self._parts)
+        for index, name in self._slots:
+            parts[index] = values[name]
+        return "".join(parts)
+
 
 @dataclass
 class CVTemplate:
@@ -18,54 +98,46 @@ class CVTemplate:
     preview_image: str
     html_template: str
     css_styles: str
+    compiled: CompiledTemplate = field(init=False, repr=False, compare=False)
     
     def __post_init__(self):
-        self.html_template = SecureValidator.sanitize_html_output(self.html_template)
+        # Sanitisation unique du template statique au chargement, avec la liste blanche des
+        # templates (et non celle du contenu utilisateur, qui retirerait header/section/class) :
+        # au rendu, seules des valeurs html.escape() sont injectées, aucun bleach par rendu n'est requis
+        self.html_template = SecureValidator.sanitize_template_html(self.html_template)
+        self.compiled = CompiledTemplate(DOCUMENT_SHELL % {
+            'css_styles': self.css_styles,
+            'html_template': self.html_template
+        })
 
 class SecureTemplateEngine:
     """Moteur de templates sécurisé"""
     
-    def __init__(self):
-        self.templates = self._load_secure_templates()
+    def __init__(self, templates_dir=DEFAULT_TEMPLATES_DIR):
+        # Templates découverts dans templates/, chargés et compilés au premier usage
+        self.registry = TemplateRegistry(CVTemplate, templates_dir)
+        # Fragments de sections (expérience, formation, catégorie de compétences)
+        # réutilisés tant que leur contenu ne change pas
+        self._fragment_cache = FragmentCache()
     
-    def _load_secure_templates(self) -> Dict[str, CVTemplate]:
-        """Charge les templates sécurisés"""
-        templates = {}
-        
-        templates['modern_free'] = CVTemplate(
-            id='modern_free',
-            name='Modern Épuré',
-            category='Moderne',
-            description='Template moderne et épuré, sécurisé pour tous secteurs',
-            is_premium=False,
-            preview_image='modern_preview.jpg',
-            html_template=self._get_secure_modern_template(),
-            css_styles=self._get_secure_modern_styles()
-        )
-        
-        return templates
+    def get_available_templates_secure(self, user_tier: CVTier) -> List[TemplateInfo]:
+        """Retourne les templates autorisés selon le tier (index précalculé)"""
+        return self.registry.available_for(user_tier)
     
-    def get_available_templates_secure(self, user_tier: CVTier) -> List[CVTemplate]:
-        """Retourne les templates autorisés selon le tier"""
-        available = []
-        
-        for template in self.templates.values():
-            if not template.is_premium or user_tier in [CVTier.PRO, CVTier.ECOSYSTEM]:
-                available.append(template)
-        
-        return available
+    def get_template(self, template_id: str) -> CVTemplate:
+        """Template compilé (chargement paresseux)"""
+        return self.registry.get(template_id)
     
     def render_cv_secure(self, profile: CVProfile, template_id: str, for_export: bool = False) -> str:
         """Rendu sécurisé de CV"""
         try:
-            if template_id not in self.templates:
+            if template_id not in self.registry:
                 raise ValidationException(f"Template non autorisé: {template_id}")
             
-            template = self.templates[template_id]
+            template = self.registry.get(template_id)
             
-            html_content = self._render_template_secure(template, profile, for_export)
-            
-            safe_html = SecureValidator.sanitize_html_output(html_content)
+            with RENDER_LATENCY.time(template=template_id), trace_span('cv.render', template=template_id):
+                safe_html = self._render_template_secure(template, profile, for_export)
             
             secure_logger.log_security_event(
                 "CV_RENDERED_SUCCESSFULLY",
@@ -83,63 +155,56 @@ class SecureTemplateEngine:
             raise SecurityException("Erreur lors du rendu du CV")
     
     def _render_template_secure(self, template: CVTemplate, profile: CVProfile, for_export: bool) -> str:
-        """Rendu sécurisé avec échappement HTML"""
-        html_content = template.html_template
-        
-        safe_replacements = {
-            '{{FULL_NAME}}': html.escape(profile.personal_info.full_name),
-            '{{EMAIL}}': html.escape(profile.personal_info.email),
-            '{{PHONE}}': html.escape(profile.personal_info.phone),
-            '{{ADDRESS}}': html.escape(profile.personal_info.address),
-            '{{LINKEDIN}}': html.escape(profile.personal_info.linkedin),
-            '{{PROFESSIONAL_SUMMARY}}': html.escape(profile.professional_summary),
-            '{{TARGET_POSITION}}': html.escape(profile.target_position)
+        """Rendu sécurisé avec échappement HTML, en une passe sur le template compilé"""
+        compiled = template.compiled
+        
+        values = {
+            'FULL_NAME': html.escape(profile.personal_info.full_name),
+            'EMAIL': html.escape(profile.personal_info.email),
+            'PHONE': html.escape(profile.personal_info.phone),
+            'ADDRESS': html.escape(profile.personal_info.address),
+            'LINKEDIN': html.escape(profile.personal_info.linkedin),
+            'PROFESSIONAL_SUMMARY': html.escape(profile.professional_summary),
+            'TARGET_POSITION': html.escape(profile.target_position)
         }
         
-        for placeholder, safe_value in safe_replacements.items():
-            html_content = html_content.replace(placeholder, safe_value)
-        
-        experiences_html = self._render_experiences_secure(profile.experiences)
-        html_content = html_content.replace('{{EXPERIENCES}}', experiences_html)
-        
-        education_html = self._render_education_secure(profile.education)
-        html_content = html_content.replace('{{EDUCATION}}', education_html)
+        # Sections rendues uniquement si le template les utilise
+        if 'EXPERIENCES' in compiled.placeholders:
+            values['EXPERIENCES'] = self._render_experiences_secure(profile.experiences)
+        if 'EDUCATION' in compiled.placeholders:
+            values['EDUCATION'] = self._render_education_secure(profile.education)
+        if 'SKILLS' in compiled.placeholders:
+            values['SKILLS'] = self._render_skills_secure(profile.skills)
         
-        skills_html = self._render_skills_secure(profile.skills)
-        html_content = html_content.replace('{{SKILLS}}', skills_html)
-        
-        full_html = f"""
-        <!DOCTYPE html>
-        <html lang="fr">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <meta http-equiv="Content-Security-Policy" content="default-src 'self'; style-src 'unsafe-inline'; img-src 'self' data:;">
-            <meta http-equiv="X-Frame-Options" content="DENY">
-            <meta http-equiv="X-Content-Type-Options" content="nosniff">
-            <title>CV Phoenix - {html.escape(profile.personal_info.full_name)}</title>
-            <style>
-                {template.css_styles}
-            </style>
-        </head>
-        <body>
-            {html_content}
-        </body>
-        </html>
+        return compiled.render(values)
+    
+    def _render_section_cached(self, section: str, items: list, snapshots: Tuple, render_item) -> str:
         """
-        
-        return full_html
+        Section inchangée : un seul accès au cache. Sinon, seuls les éléments dont
+        l'instantané a changé sont rendus, les autres fragments sont réutilisés.
+        """
+        return self._fragment_cache.get_or_build(
+            (section, snapshots),
+            lambda: "".join(
+                self._fragment_cache.get_or_build((section, snapshot), lambda item=item: render_item(item))
+                for item, snapshot in zip(items, snapshots)
+            )
+        )
     
     def _render_experiences_secure(self, experiences: List[Experience]) -> str:
-        """Rendu sécurisé des expériences"""
+        """Rendu sécurisé des expériences (fragment par expérience, mis en cache)"""
         if not experiences:
             return "<p>Aucune expérience renseignée</p>"
         
-        html_parts = []
-        for exp in experiences[:10]:
-            end_date = "Présent" if exp.current else html.escape(exp.end_date)
-            
-            exp_html = f"""
+        items = experiences[:10]
+        snapshots = tuple(map(EXPERIENCE_FIELDS, items))
+        return self._render_section_cached('experience', items, snapshots, self._render_experience_item_secure)
+    
+    def _render_experience_item_secure(self, exp: Experience) -> str:
+        """Rendu sécurisé d'une expérience"""
+        end_date = "Présent" if exp.current else html.escape(exp.end_date)
+        
+        return f"""
             <div class="experience-item">
                 <div class="experience-header">
                     <h3>{html.escape(exp.title)}</h3>
@@ -151,236 +216,68 @@ class SecureTemplateEngine:
                 </div>
             </div>
             """
-            html_parts.append(exp_html)
-        
-        return "".join(html_parts)
     
     def _render_education_secure(self, education: List[Education]) -> str:
-        """Rendu sécurisé de la formation"""
+        """Rendu sécurisé de la formation (fragment par diplôme, mis en cache)"""
         if not education:
             return "<p>Aucune formation renseignée</p>"
         
-        html_parts = []
-        for edu in education[:5]:
-            edu_html = f"""
+        items = education[:5]
+        snapshots = tuple(map(EDUCATION_FIELDS, items))
+        return self._render_section_cached('education', items, snapshots, self._render_education_item_secure)
+    
+    def _render_education_item_secure(self, edu: Education) -> str:
+        """Rendu sécurisé d'une formation"""
+        return f"""
             <div class="education-item">
                 <h3>{html.escape(edu.degree)}</h3>
                 <span class="institution">{html.escape(edu.institution)} - {html.escape(edu.location)}</span>
                 <span class="year">{html.escape(edu.graduation_year)}</span>
             </div>
             """
-            html_parts.append(edu_html)
-        
-        return "".join(html_parts)
     
     def _render_skills_secure(self, skills: List[Skill]) -> str:
-        """Rendu sécurisé des compétences"""
+        """Rendu sécurisé des compétences (fragment par catégorie, mis en cache)"""
         if not skills:
             return "<p>Aucune compétence renseignée</p>"
         
+        snapshots = tuple(map(SKILL_FIELDS, skills[:30]))
+        return self._fragment_cache.get_or_build(('skills', snapshots), lambda: self._render_skill_categories(snapshots))
+    
+    def _render_skill_categories(self, snapshots: Tuple) -> str:
         categories = {}
-        for skill in skills[:30]:
-            category = html.escape(skill.category or "Autres")
-            if category not in categories:
-                categories[category] = []
-            categories[category].append(skill)
+        for category, name, level in snapshots:
+            categories.setdefault(category or "Autres", []).append((name, level))
         
         html_parts = []
         for category, category_skills in categories.items():
-            skills_html_parts = []
-            for skill in category_skills:
-                skill_html = f"""
+            html_parts.append(
+                self._fragment_cache.get_or_build(
+                    ('skill_category', category, tuple(category_skills)),
+                    lambda category=category, category_skills=category_skills:
+                        self._render_skill_category_secure(category, category_skills)
+                )
+            )
+        
+        return "".join(html_parts)
+    
+    def _render_skill_category_secure(self, category: str, category_skills: List[Tuple[str, str]]) -> str:
+        """Rendu sécurisé d'une catégorie de compétences"""
+        skills_html_parts = []
+        for name, level in category_skills:
+            skill_html = f"""
                 <div class="skill-item">
-                    <span class="skill-name">{html.escape(skill.name)}</span>
-                    <span class="skill-level">{html.escape(skill.level)}</span>
+                    <span class="skill-name">{html.escape(name)}</span>
+                    <span class="skill-level">{html.escape(level)}</span>
                 </div>
                 """
-                skills_html_parts.append(skill_html)
-            
-            category_html = f"""
+            skills_html_parts.append(skill_html)
+        
+        return f"""
             <div class="skill-category">
-                <h4>{category}</h4>
+                <h4>{html.escape(category)}</h4>
                 <div class="skills-list">
                     {" ".join(skills_html_parts)}
                 </div>
             </div>
             """
-            html_parts.append(category_html)
-        
-        return "".join(html_parts)
-    
-    def _get_secure_modern_template(self) -> str:
-        """Template moderne sécurisé"""
-        return """
-        <div class="cv-container">
-            <header class="cv-header">
-                <h1>{{FULL_NAME}}</h1>
-                <h2>{{TARGET_POSITION}}</h2>
-                <div class="contact-info">
-                    <span>{{EMAIL}}</span>
-                    <span>{{PHONE}}</span>
-                    <span>{{ADDRESS}}</span>
-                </div>
-            </header>
-            
-            <section class="summary-section">
-                <h2>Profil Professionnel</h2>
-                <p>{{PROFESSIONAL_SUMMARY}}</p>
-            </section>
-            
-            <section class="experience-section">
-                <h2>Expérience Professionnelle</h2>
-                {{EXPERIENCES}}
-            </section>
-            
-            <section class="education-section">
-                <h2>Formation</h2>
-                {{EDUCATION}}
-            </section>
-            
-            <section class="skills-section">
-                <h2>Compétences</h2>
-                {{SKILLS}}
-            </section>
-        </div>
-        """
-    
-    def _get_secure_modern_styles(self) -> str:
-        """Styles CSS sécurisés"""
-        return """
-        * {
-            box-sizing: border-box;
-            margin: 0;
-            padding: 0;
-        }
-        
-        body {
-            font-family: 'Arial', 'Helvetica', sans-serif;
-            line-height: 1.6;
-            color: #333;
-            max-width: 800px;
-            margin: 0 auto;
-            padding: 20px;
-            background: white;
-        }
-        
-        .cv-container {
-            background: white;
-            box-shadow: 0 0 10px rgba(0,0,0,0.1);
-            padding: 40px;
-            border-radius: 8px;
-        }
-        
-        .cv-header {
-            text-align: center;
-            border-bottom: 2px solid #007bff;
-            padding-bottom: 20px;
-            margin-bottom: 30px;
-        }
-        
-        .cv-header h1 {
-            font-size: 2.5em;
-            margin: 0;
-            color: #007bff;
-            word-break: break-word;
-        }
-        
-        .cv-header h2 {
-            font-size: 1.3em;
-            margin: 10px 0;
-            color: #666;
-            font-weight: normal;
-            word-break: break-word;
-        }
-        
-        .contact-info {
-            display: flex;
-            justify-content: center;
-            gap: 20px;
-            flex-wrap: wrap;
-            margin-top: 15px;
-        }
-        
-        .contact-info span {
-            color: #666;
-            font-size: 0.9em;
-            word-break: break-all;
-        }
-        
-        section {
-            margin: 30px 0;
-        }
-        
-        section h2 {
-            color: #007bff;
-            font-size: 1.4em;
-            border-bottom: 1px solid #eee;
-            padding-bottom: 5px;
-            margin-bottom: 20px;
-        }
-        
-        .experience-item, .education-item {
-            margin-bottom: 25px;
-            padding: 15px;
-            border-left: 3px solid #007bff;
-            background: #f8f9fa;
-            border-radius: 5px;
-        }
-        
-        .experience-header h3 {
-            margin: 0 0 5px 0;
-            color: #333;
-            word-break: break-word;
-        }
-        
-        .company, .institution {
-            font-weight: bold;
-            color: #666;
-            word-break: break-word;
-        }
-        
-        .period, .year {
-            float: right;
-            color: #007bff;
-            font-size: 0.9em;
-        }
-        
-        .skills-list {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 10px;
-        }
-        
-        .skill-item {
-            display: flex;
-            justify-content: space-between;
-            padding: 8px 12px;
-            background: #e9ecef;
-            border-radius: 4px;
-        }
-        
-        .skill-level {
-            color: #007bff;
-            font-weight: bold;
-        }
-        
-        /* Sécurité CSS */
-        * {
-            max-width: 100%;
-        }
-        
-        img {
-            max-width: 100%;
-            height: auto;
-        }
-        
-        @media print {
-            body { max-width: none; margin: 0; padding: 0; }
-            .cv-container { box-shadow: none; padding: 20px; }
-        }
-        
-        @media (max-width: 768px) {
-            .contact-info { flex-direction: column; text-align: center; }
-            .period, .year { float: none; display: block; }
-        }
-        """
@@ -0,0 +1,250 @@
+"""
+Stockage serveur de l'état volumineux des sessions (profil CV courant...)
+st.session_state ne garde que l'identifiant de session et quelques scalaires ; les valeurs
+lourdes vivent ici, sérialisées de façon compacte, sous un budget mémoire global.
+Au-delà du budget, les sessions les moins récemment utilisées passent sur un tier disque
+chiffré ; un thread de nettoyage supprime les sessions expirées des deux tiers.
+"""
+
+import hashlib
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from config.security_config import SecurityConfig
+from utils.compact_codec import CompactCodec
+from utils.secure_logging import secure_logger
+from utils.exceptions import SecurityException
+
+SESSION_FILE_SUFFIX = '.session'
+
+
+class _SessionEntry:
+    """Valeurs sérialisées d'une session (clé -> octets) et leur taille cumulée"""
+    __slots__ = ('values', 'size', 'last_access')
+
+    def __init__(self, values: Dict[str, bytes], last_access: float):
+        self.values = values
+        self.size = sum(len(key) + len(value) for key, value in values.items())
+        self.last_access = last_access
+
+
+class SessionStore:
+    """Magasin de sessions LRU à deux tiers : mémoire bornée, puis disque chiffré"""
+
+    def __init__(
+        self,
+        codec: CompactCodec,
+        memory_budget_bytes: int = SecurityConfig.SESSION_STORE_MEMORY_BUDGET,
+        disk_dir: str = SecurityConfig.SESSION_STORE_DIR,
+        idle_timeout_seconds: int = SecurityConfig.SESSION_TIMEOUT_MINUTES * 60,
+        reap_interval_seconds: int = SecurityConfig.SESSION_STORE_REAP_INTERVAL_SECONDS
+    ):
+        self.codec = codec
+        self.memory_budget_bytes = memory_budget_bytes
+        self.disk_dir = disk_dir
+        self.idle_timeout_seconds = idle_timeout_seconds
+
+        # Ordre LRU : la session la moins récemment utilisée est en tête
+        self._sessions: "OrderedDict[str, _SessionEntry]" = OrderedDict()
+        self._size_bytes = 0
+        # Les E/S disque se font sous le verrou : rares (dépassement du budget) et de quelques Ko
+        self._lock = threading.Lock()
+        self.spilled = 0
+        self.restored = 0
+        self.reaped = 0
+
+        os.makedirs(disk_dir, mode=0o700, exist_ok=True)
+
+        self._stop = threading.Event()
+        self._reaper = threading.Thread(
+            target=self._reap_loop, args=(reap_interval_seconds,), name='session-reaper', daemon=True
+        )
+        self._reaper.start()
+
+    def get(self, session_id: str, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._touch(session_id, create=False)
+            packed = entry.values.get(key) if entry is not None else None
+            self._enforce_budget(keep=session_id)
+
+        if packed is None:
+            return default
+        return self.codec.loads(packed)
+
+    def set(self, session_id: str, key: str, value: Any):
+        """Mémorise `value` pour la session ; None supprime la clé"""
+        packed = self.codec.dumps(value) if value is not None else None
+
+        with self._lock:
+            entry = self._touch(session_id, create=True)
+            previous = entry.values.pop(key, None)
+            delta = -(len(key) + len(previous)) if previous is not None else 0
+            if packed is not None:
+                entry.values[key] = packed
+                delta += len(key) + len(packed)
+
+            entry.size += delta
+            self._size_bytes += delta
+            self._enforce_budget(keep=session_id)
+
+    def drop(self, session_id: str):
+        """Supprime la session des deux tiers (invalidation, déconnexion)"""
+        with self._lock:
+            entry = self._sessions.pop(session_id, None)
+            if entry is not None:
+                self._size_bytes -= entry.size
+            self._remove_file(self._disk_path(session_id))
+
+    def _touch(self, session_id: str, create: bool) -> Optional[_SessionEntry]:
+        now = time.time()
+        entry = self._sessions.get(session_id)
+
+        if entry is not None:
+            self._sessions.move_to_end(session_id)
+        else:
+            entry = self._restore(session_id)
+            if entry is None:
+                if not create:
+                    return None
+                entry = _SessionEntry({}, now)
+            self._sessions[session_id] = entry
+            self._size_bytes += entry.size
+
+        entry.last_access = now
+        return entry
+
+    def _enforce_budget(self, keep: str):
+        """
+        Déplace sur disque les sessions les plus anciennes jusqu'à repasser sous le budget.
+        Une session n'est retirée de la mémoire qu'une fois écrite : si l'écriture échoue,
+        le budget est dépassé plutôt que de perdre la session, et le passage s'arrête.
+        """
+        candidates = [session_id for session_id in self._sessions if session_id != keep]
+        for session_id in candidates:
+            if self._size_bytes <= self.memory_budget_bytes:
+                break
+
+            entry = self._sessions[session_id]
+            if entry.values and not self._spill(session_id, entry):
+                # Tier disque indisponible : inutile de chiffrer les autres sessions pour rien
+                break
+
+            del self._sessions[session_id]
+            self._size_bytes -= entry.size
+
+    def _spill(self, session_id: str, entry: _SessionEntry) -> bool:
+        """Écrit la session sur le tier disque ; retourne False si l'écriture a échoué"""
+        from utils.secure_crypto import secure_crypto
+
+        path = self._disk_path(session_id)
+        tmp_path = f"{path}.tmp"
+        try:
+            sealed = secure_crypto.encrypt_bytes(
+                pickle.dumps((self.codec.schema_id, entry.values), protocol=pickle.HIGHEST_PROTOCOL)
+            )
+            with open(tmp_path, 'wb') as f:
+                f.write(sealed)
+            os.replace(tmp_path, path)
+            os.utime(path, (entry.last_access, entry.last_access))
+            self.spilled += 1
+            return True
+        except (OSError, SecurityException) as e:
+            self._remove_file(tmp_path)
+            secure_logger.log_security_event("SESSION_SPILL_FAILED", {"error": str(e)[:100]}, "ERROR")
+            return False
+
+    def _restore(self, session_id: str) -> Optional[_SessionEntry]:
+        from utils.secure_crypto import secure_crypto
+
+        path = self._disk_path(session_id)
+        try:
+            with open(path, 'rb') as f:
+                sealed = f.read()
+        except OSError:
+            return None
+
+        self._remove_file(path)
+        try:
+            schema_id, values = pickle.loads(secure_crypto.decrypt_bytes(sealed))
+        except SecurityException:
+            secure_logger.log_security_event("SESSION_RESTORE_FAILED", {}, "WARNING")
+            return None
+
+        if schema_id != self.codec.schema_id:
+            # Session écrite par une autre version du modèle : abandonnée plutôt que mal relue
+            return None
+
+        self.restored += 1
+        return _SessionEntry(values, time.time())
+
+    def _disk_path(self, session_id: str) -> str:
+        name = hashlib.sha256(session_id.encode('utf-8')).hexdigest()
+        return os.path.join(self.disk_dir, f"{name}{SESSION_FILE_SUFFIX}")
+
+    @staticmethod
+    def _remove_file(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def reap(self) -> int:
+        """Supprime les sessions inactives depuis plus que le timeout (mémoire et disque)"""
+        cutoff = time.time() - self.idle_timeout_seconds
+        reaped = 0
+
+        with self._lock:
+            while self._sessions:
+                session_id, entry = next(iter(self._sessions.items()))
+                if entry.last_access >= cutoff:
+                    break
+                del self._sessions[session_id]
+                self._size_bytes -= entry.size
+                reaped += 1
+
+        try:
+            for file_entry in os.scandir(self.disk_dir):
+                if file_entry.name.endswith(SESSION_FILE_SUFFIX) and file_entry.stat().st_mtime < cutoff:
+                    self._remove_file(file_entry.path)
+                    reaped += 1
+        except OSError:
+            pass
+
+        if reaped:
+            self.reaped += reaped
+            secure_logger.log_security_event("SESSION_STORE_REAPED", {"count": reaped})
+        return reaped
+
+    def _reap_loop(self, interval_seconds: float):
+        while not self._stop.wait(interval_seconds):
+            self.reap()
+
+    def memory_usage(self) -> Tuple[int, int]:
+        """(sessions en mémoire, octets occupés), sans parcourir le tier disque"""
+        with self._lock:
+            return len(self._sessions), self._size_bytes
+
+    def stats(self) -> Dict[str, int]:
+        memory_sessions, memory_bytes = self.memory_usage()
+
+        try:
+            disk_sessions = sum(1 for entry in os.scandir(self.disk_dir) if entry.name.endswith(SESSION_FILE_SUFFIX))
+        except OSError:
+            disk_sessions = 0
+
+        return {
+            'memory_sessions': memory_sessions,
+            'memory_bytes': memory_bytes,
+            'memory_budget_bytes': self.memory_budget_bytes,
+            'disk_sessions': disk_sessions,
+            'spilled': self.spilled,
+            'restored': self.restored,
+            'reaped': self.reaped
+        }
+
+    def shutdown(self):
+        self._stop.set()
@@ -0,0 +1,148 @@
+"""
+Aperçus pré-rendus de la galerie de templates
+Cache adressé par contenu : la clé combine l'empreinte des sources du template, la version
+du moteur de rendu (RENDERER_VERSION) et l'empreinte du profil démo ; toute modification
+d'un template ou du HTML produit par le moteur invalide l'aperçu.
+
+Pré-rendu hors ligne :  python -m services.template_gallery
+"""
+
+import hashlib
+import os
+import threading
+from typing import Callable, Dict, List
+
+from config.security_config import SecurityConfig
+from models.cv_data import CVProfile
+from services.render_cache import profile_fingerprint
+from services.secure_template_engine import RENDERER_VERSION
+from utils.secure_logging import secure_logger
+from utils.exceptions import ValidationException
+
+# À incrémenter si le format des aperçus change sans que les templates ni le moteur changent
+GALLERY_FORMAT_VERSION = "1"
+
+
+class TemplateGallery:
+    """Aperçus HTML des templates, rendus une fois puis servis depuis le cache disque"""
+
+    def __init__(
+        self,
+        template_engine,
+        demo_profile_factory: Callable[[], CVProfile],
+        cache_dir: str = SecurityConfig.GALLERY_CACHE_DIR
+    ):
+        self.template_engine = template_engine
+        self.demo_profile_factory = demo_profile_factory
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+
+        self._demo_fingerprint = None
+        self._keys: Dict[str, str] = {}
+        self._previews: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def preview_key(self, template_id: str) -> str:
+        """Clé de cache de l'aperçu : sources du template + version du moteur + profil démo + format"""
+        key = self._keys.get(template_id)
+        if key is None:
+            if self._demo_fingerprint is None:
+                self._demo_fingerprint = profile_fingerprint(self.demo_profile_factory())
+
+            source = self.template_engine.registry.source_fingerprint(template_id)
+            key = hashlib.sha256(
+                f"{GALLERY_FORMAT_VERSION}:{RENDERER_VERSION}:{source}:{self._demo_fingerprint}".encode('utf-8')
+            ).hexdigest()
+            self._keys[template_id] = key
+        return key
+
+    def get_preview(self, template_id: str) -> str:
+        """Aperçu du template : mémoire, puis disque, puis rendu (et mise en cache)"""
+        if template_id not in self.template_engine.registry:
+            raise ValidationException(f"Template non autorisé: {template_id}")
+
+        key = self.preview_key(template_id)
+        preview = self._previews.get(key)
+        if preview is not None:
+            return preview
+
+        with self._lock:
+            preview = self._previews.get(key)
+            if preview is None:
+                preview = self._read_cached(key)
+                if preview is None:
+                    preview = self._render_preview(template_id, key)
+                self._previews[key] = preview
+
+        return preview
+
+    def prerender_all(self) -> List[str]:
+        """Pré-rend les aperçus manquants de tous les templates ; retourne les ids rendus"""
+        rendered = []
+        for info in self.template_engine.registry.all_infos():
+            key = self.preview_key(info.id)
+            if not os.path.exists(self._cache_path(key)):
+                rendered.append(info.id)
+            self.get_preview(info.id)
+
+        self._prune_stale_files()
+        secure_logger.log_security_event(
+            "GALLERY_PRERENDERED",
+            {"rendered": len(rendered), "templates": len(self._keys)}
+        )
+        return rendered
+
+    def _render_preview(self, template_id: str, key: str) -> str:
+        preview = self.template_engine.render_cv_secure(
+            self.demo_profile_factory(), template_id, for_export=False
+        )
+
+        # Écriture atomique : un aperçu partiel n'est jamais servi
+        path = self._cache_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(preview)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            secure_logger.log_security_event(
+                "GALLERY_CACHE_WRITE_FAILED", {"template_id": template_id, "error": str(e)[:100]}, "WARNING"
+            )
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        return preview
+
+    def _read_cached(self, key: str):
+        try:
+            with open(self._cache_path(key), 'r', encoding='utf-8') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _prune_stale_files(self):
+        """Supprime les aperçus dont le template a changé depuis leur rendu"""
+        current = {f"{key}.html" for key in self._keys.values()}
+        try:
+            for entry in os.scandir(self.cache_dir):
+                if entry.is_file() and entry.name.endswith('.html') and entry.name not in current:
+                    os.remove(entry.path)
+        except OSError:
+            pass
+
+    def _cache_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.html")
+
+
+def main() -> int:
+    from services.secure_template_engine import SecureTemplateEngine
+    from ui.display_components import create_demo_profile_secure
+
+    gallery = TemplateGallery(SecureTemplateEngine(), create_demo_profile_secure)
+    rendered = gallery.prerender_all()
+    print(f"{len(rendered)} aperçu(s) rendu(s) dans {gallery.cache_dir}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,210 @@
+import hashlib
+import json
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from models.cv_data import CVTier
+from utils.secure_logging import secure_logger
+from utils.exceptions import SecurityException, ValidationException
+
+DEFAULT_TEMPLATES_DIR = Path(__file__).resolve().parent.parent / 'templates'
+
+SAFE_TEMPLATE_ID_PATTERN = re.compile(r'^[a-z0-9_]{1,64}$')
+
+# Déclinaison DOCX d'un template (section "docx" du manifest), valeurs par défaut sinon
+DEFAULT_DOCX_ACCENT = '#007BFF'
+DEFAULT_DOCX_FONT = 'Arial'
+HEX_COLOR_PATTERN = re.compile(r'^#[0-9A-Fa-f]{6}$')
+SAFE_FONT_PATTERN = re.compile(r'^[A-Za-z0-9 \-]{1,64}$')
+
+PREMIUM_TIERS = (CVTier.PRO, CVTier.ECOSYSTEM)
+
+_CSS_COMMENTS = re.compile(r'/\*.*?\*/', re.DOTALL)
+_CSS_WHITESPACE = re.compile(r'\s+')
+_CSS_PUNCTUATION_SPACES = re.compile(r'\s*([{};,>])\s*')
+# ':' n'est resserré que dans les blocs de déclarations : dans un sélecteur,
+# l'espace avant ':' est un combinateur descendant (`a :hover` n'est pas `a:hover`)
+_CSS_DECLARATION_BLOCK = re.compile(r'\{[^{}]*\}')
+_CSS_COLON_SPACES = re.compile(r'\s*:\s*')
+
+
+def minify_css(css: str) -> str:
+    """Minification CSS simple : commentaires, espaces superflus et ';' finaux"""
+    css = _CSS_COMMENTS.sub('', css)
+    css = _CSS_WHITESPACE.sub(' ', css)
+    css = _CSS_PUNCTUATION_SPACES.sub(r'\1', css)
+    css = _CSS_DECLARATION_BLOCK.sub(lambda block: _CSS_COLON_SPACES.sub(':', block.group(0)), css)
+    return css.replace(';}', '}').strip()
+
+
+@dataclass(frozen=True)
+class TemplateInfo:
+    """Métadonnées d'un template (manifest), disponibles sans charger le template"""
+    id: str
+    name: str
+    category: str
+    description: str
+    is_premium: bool
+    preview_image: str
+    docx_accent: str = DEFAULT_DOCX_ACCENT
+    docx_font: str = DEFAULT_DOCX_FONT
+
+
+def _manifest_docx_theme(manifest: Dict) -> Tuple[str, str]:
+    """Couleur d'accent et police DOCX du manifest ; une valeur absente ou invalide prend le défaut"""
+    theme = manifest.get('docx')
+    if not isinstance(theme, dict):
+        theme = {}
+
+    accent = str(theme.get('accent', ''))
+    font = str(theme.get('font', ''))
+    return (
+        accent if HEX_COLOR_PATTERN.match(accent) else DEFAULT_DOCX_ACCENT,
+        font if SAFE_FONT_PATTERN.match(font) else DEFAULT_DOCX_FONT
+    )
+
+
+class TemplateRegistry:
+    """
+    Registre des templates découverts dans un répertoire :
+    <templates_dir>/<template_id>/{manifest.json, template.html, styles.css}.
+    Seuls les manifests sont lus au démarrage ; HTML et CSS sont chargés,
+    nettoyés et compilés au premier usage du template.
+    """
+
+    def __init__(self, template_factory: Callable[..., object], templates_dir: Path = DEFAULT_TEMPLATES_DIR):
+        self._template_factory = template_factory
+        self.templates_dir = Path(templates_dir)
+        self._infos: Dict[str, TemplateInfo] = {}
+        self._loaded: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+        self._discover()
+        self._tier_index = self._build_tier_index()
+
+    def _discover(self):
+        """Lecture des manifests uniquement"""
+        if not self.templates_dir.is_dir():
+            raise SecurityException("Répertoire de templates introuvable")
+
+        for template_dir in sorted(self.templates_dir.iterdir()):
+            manifest_path = template_dir / 'manifest.json'
+            if not template_dir.is_dir() or not manifest_path.is_file():
+                continue
+
+            template_id = template_dir.name
+            if not SAFE_TEMPLATE_ID_PATTERN.match(template_id):
+                secure_logger.log_security_event(
+                    "TEMPLATE_ID_REJECTED", {"template_id": template_id}, "WARNING"
+                )
+                continue
+
+            try:
+                with open(manifest_path, 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+
+                docx_accent, docx_font = _manifest_docx_theme(manifest)
+                self._infos[template_id] = TemplateInfo(
+                    id=template_id,
+                    name=str(manifest['name']),
+                    category=str(manifest.get('category', '')),
+                    description=str(manifest.get('description', '')),
+                    is_premium=bool(manifest.get('is_premium', False)),
+                    preview_image=str(manifest.get('preview_image', '')),
+                    docx_accent=docx_accent,
+                    docx_font=docx_font
+                )
+            except (OSError, ValueError, KeyError) as e:
+                secure_logger.log_security_event(
+                    "TEMPLATE_MANIFEST_INVALID",
+                    {"template_id": template_id, "error": str(e)[:100]},
+                    "ERROR"
+                )
+
+    def _build_tier_index(self) -> Dict[CVTier, Tuple[TemplateInfo, ...]]:
+        """Index précalculé des templates accessibles par tier"""
+        index = {}
+        for tier in CVTier:
+            index[tier] = tuple(
+                info for info in self._infos.values()
+                if not info.is_premium or tier in PREMIUM_TIERS
+            )
+        return index
+
+    def available_for(self, user_tier: CVTier) -> List[TemplateInfo]:
+        return list(self._tier_index.get(user_tier, self._tier_index[CVTier.FREE]))
+
+    def all_infos(self) -> List[TemplateInfo]:
+        return list(self._infos.values())
+
+    def info(self, template_id: str) -> TemplateInfo:
+        """Métadonnées du template, sans le charger"""
+        info = self._infos.get(template_id)
+        if info is None:
+            raise ValidationException(f"Template non autorisé: {template_id}")
+        return info
+
+    def __contains__(self, template_id: str) -> bool:
+        return template_id in self._infos
+
+    def get(self, template_id: str):
+        """Retourne le template compilé, chargé au premier usage"""
+        template = self._loaded.get(template_id)
+        if template is not None:
+            return template
+
+        info = self._infos.get(template_id)
+        if info is None:
+            raise ValidationException(f"Template non autorisé: {template_id}")
+
+        with self._lock:
+            template = self._loaded.get(template_id)
+            if template is None:
+                template = self._load(info)
+                self._loaded[template_id] = template
+
+        return template
+
+    def _load(self, info: TemplateInfo):
+        template_dir = self.templates_dir / info.id
+
+        with open(template_dir / 'template.html', 'r', encoding='utf-8') as f:
+            html_template = f.read()
+
+        css_path = template_dir / 'styles.css'
+        css_styles = ""
+        if css_path.is_file():
+            with open(css_path, 'r', encoding='utf-8') as f:
+                css_styles = minify_css(f.read())
+
+        template = self._template_factory(
+            id=info.id,
+            name=info.name,
+            category=info.category,
+            description=info.description,
+            is_premium=info.is_premium,
+            preview_image=info.preview_image,
+            html_template=html_template,
+            css_styles=css_styles
+        )
+
+        secure_logger.log_security_event(
+            "TEMPLATE_LOADED", {"template_id": info.id, "css_length": len(css_styles)}
+        )
+        return template
+
+    def source_fingerprint(self, template_id: str) -> str:
+        """Empreinte des fichiers sources d'un template (invalidation des caches dérivés)"""
+        if template_id not in self._infos:
+            raise ValidationException(f"Template non autorisé: {template_id}")
+
+        digest = hashlib.sha256()
+        for filename in ('manifest.json', 'template.html', 'styles.css'):
+            path = self.templates_dir / template_id / filename
+            if path.is_file():
+                digest.update(filename.encode('utf-8'))
+                digest.update(path.read_bytes())
+        return digest.hexdigest()
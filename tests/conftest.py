@@ -0,0 +1,11 @@
+"""
+Configuration pytest : racine du dépôt dans le sys.path et clé de chiffrement de test
+(clé Fernet pré-dérivée, sans la dérivation PBKDF2 de la clé maître)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+os.environ.setdefault('PHOENIX_ENCRYPTION_KEY', 'dGVzdC1rZXktcGhvZW5peC1jdi0zMi1ieXRlcy0hISE=')
@@ -0,0 +1,46 @@
+import json
+
+import pytest
+
+pytest.importorskip('models.cv_data')
+
+from phoenix_cv.render import _read_jobs
+
+
+def write_jsonl(path, lines):
+    path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+    return str(path)
+
+
+def test_read_jobs_reports_invalid_lines_and_keeps_reading(tmp_path):
+    input_path = write_jsonl(tmp_path / 'profils.jsonl', [
+        json.dumps({"id": "alice", "profile": {}}),
+        '{"id": "tronque", ',
+        '[1, 2]',
+        '',
+        json.dumps({"personal_info": {"full_name": "Bob"}}),
+    ])
+
+    jobs, errors = _read_jobs(input_path, 'modern_free', 'out', 'html')
+
+    assert [job[0] for job in jobs] == ['alice', 'cv_000005']
+    assert [label for label, _ in errors] == ['ligne 2', 'ligne 3']
+    assert errors[0][1].startswith('JSON invalide')
+
+
+def test_read_jobs_rejects_duplicate_output_names(tmp_path):
+    input_path = write_jsonl(tmp_path / 'profils.jsonl', [
+        json.dumps({"id": "cv_000003", "profile": {}}),
+        json.dumps({"id": "alice", "profile": {}}),
+        json.dumps({"id": "../hors-dossier", "profile": {}}),
+        json.dumps({"id": "alice", "template_id": "classic", "profile": {}}),
+    ])
+
+    jobs, errors = _read_jobs(input_path, 'modern_free', 'out', 'html')
+
+    # Le nom de repli de la ligne 3 entre en collision avec l'id explicite de la ligne 1
+    assert [job[0] for job in jobs] == ['cv_000003', 'alice']
+    assert errors == [
+        ('ligne 3', 'id cv_000003 déjà utilisé ligne 1'),
+        ('ligne 4', 'id alice déjà utilisé ligne 2'),
+    ]
@@ -0,0 +1,72 @@
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import List, Optional
+
+import pytest
+
+from utils.compact_codec import CompactCodec
+from utils.exceptions import ValidationException
+
+
+class Level(Enum):
+    JUNIOR = "junior"
+    SENIOR = "senior"
+
+
+@dataclass
+class Item:
+    name: str
+    level: Level = Level.JUNIOR
+
+
+@dataclass
+class Document:
+    title: str
+    items: List[Item] = field(default_factory=list)
+    owner: Optional[Item] = None
+    tags: List[str] = field(default_factory=list)
+
+
+@pytest.fixture
+def codec():
+    return CompactCodec((Document, Level))
+
+
+def test_dataclass_round_trip(codec):
+    document = Document(
+        title="CV",
+        items=[Item("Python", Level.SENIOR), Item("SQL")],
+        owner=Item("Marie"),
+        tags=["data", "logistique"]
+    )
+
+    assert codec.loads(codec.dumps(document)) == document
+
+
+@pytest.mark.parametrize('value', ['texte', 42, 1.5, True, None])
+def test_primitives_round_trip(codec, value):
+    assert codec.loads(codec.dumps(value)) == value
+
+
+def test_enum_round_trip(codec):
+    assert codec.loads(codec.dumps(Level.SENIOR)) is Level.SENIOR
+
+
+def test_large_values_are_compressed(codec):
+    document = Document(title="x" * 10000)
+    packed = codec.dumps(document)
+
+    assert len(packed) < 1000
+    assert codec.loads(packed) == document
+
+
+def test_unregistered_types_are_rejected(codec):
+    with pytest.raises(ValidationException):
+        codec.dumps(Item("Python"))
+    with pytest.raises(ValidationException):
+        codec.dumps(["liste", "racine"])
+
+
+def test_schema_id_tracks_registered_fields():
+    assert CompactCodec((Document,)).schema_id == CompactCodec((Document,)).schema_id
+    assert CompactCodec((Document,)).schema_id != CompactCodec((Item,)).schema_id
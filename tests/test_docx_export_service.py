@@ -0,0 +1,38 @@
+import json
+
+import pytest
+
+cv_data = pytest.importorskip('models.cv_data')
+pytest.importorskip('docx')
+
+from services.docx_export_service import DOCXExportService
+from services.secure_template_engine import SecureTemplateEngine
+
+
+def write_template(templates_dir, template_id, manifest):
+    template_dir = templates_dir / template_id
+    template_dir.mkdir()
+    (template_dir / 'manifest.json').write_text(json.dumps(manifest), encoding='utf-8')
+    (template_dir / 'template.html').write_text('<h1>{{FULL_NAME}}</h1>', encoding='utf-8')
+
+
+def test_docx_theme_comes_from_manifest_with_defaults(tmp_path):
+    write_template(tmp_path, 'themed', {'name': 'Themed', 'docx': {'accent': '#112233', 'font': 'Georgia'}})
+    write_template(tmp_path, 'plain', {'name': 'Plain'})
+    write_template(tmp_path, 'invalid', {'name': 'Invalid', 'docx': {'accent': 'red', 'font': '<b>'}})
+    service = DOCXExportService(SecureTemplateEngine(tmp_path).registry)
+
+    assert service._theme('themed') == {'accent': (0x11, 0x22, 0x33), 'font': 'Georgia'}
+    assert service._theme('plain') == {'accent': (0x00, 0x7B, 0xFF), 'font': 'Arial'}
+    assert service._theme('invalid') == service._theme('plain')
+
+
+def test_export_works_for_every_discovered_template(tmp_path):
+    write_template(tmp_path, 'discovered', {'name': 'Discovered'})
+    service = DOCXExportService(SecureTemplateEngine(tmp_path).registry)
+    profile = cv_data.CVProfile(personal_info=cv_data.PersonalInfo(full_name="Marie Durand"))
+
+    content = service.export_docx(profile, 'discovered')
+
+    assert content.startswith(b'PK')
+    assert service.export_docx(profile, 'discovered') is content
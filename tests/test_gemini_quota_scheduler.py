@@ -0,0 +1,93 @@
+import threading
+import time
+
+import pytest
+
+cv_data = pytest.importorskip('models.cv_data')
+
+from services.gemini_quota_scheduler import GeminiQuotaScheduler
+from utils.exceptions import QuotaExceededException
+
+FREE, PRO, ECOSYSTEM = cv_data.CVTier.FREE.value, cv_data.CVTier.PRO.value, cv_data.CVTier.ECOSYSTEM.value
+
+
+def wait_until(condition, timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition non atteinte"
+        time.sleep(0.001)
+
+
+class ServedOrder:
+    """Met en file des appels bloquants, puis ouvre le quota une requête à la fois"""
+
+    def __init__(self, scheduler: GeminiQuotaScheduler):
+        self.scheduler = scheduler
+        self.served = []
+        self._threads = []
+
+    def enqueue(self, tier: str, session_key: str):
+        depth = self.scheduler._depth
+        thread = threading.Thread(target=self._acquire, args=(tier, session_key))
+        thread.start()
+        self._threads.append(thread)
+        wait_until(lambda: self.scheduler._depth == depth + 1)
+
+    def _acquire(self, tier: str, session_key: str):
+        self.scheduler.acquire(tier, session_key, 1, timeout=5)
+        self.served.append((tier, session_key))
+
+    def release_all(self):
+        for count in range(1, len(self._threads) + 1):
+            with self.scheduler._condition:
+                self.scheduler.requests_per_minute += 1
+                self.scheduler._condition.notify()
+            wait_until(lambda: len(self.served) == count)
+        for thread in self._threads:
+            thread.join()
+        return self.served
+
+
+@pytest.fixture
+def scheduler():
+    # Quota nul : tout reste en file jusqu'à l'ouverture explicite
+    return GeminiQuotaScheduler(requests_per_minute=0, tokens_per_minute=10_000, max_queue_depth=10)
+
+
+def test_higher_tiers_are_served_first(scheduler):
+    order = ServedOrder(scheduler)
+    order.enqueue(FREE, 'free-session')
+    order.enqueue(PRO, 'pro-session')
+    order.enqueue(ECOSYSTEM, 'eco-session')
+    order.enqueue(PRO, 'pro-session')
+
+    assert [tier for tier, _ in order.release_all()] == [ECOSYSTEM, PRO, PRO, FREE]
+
+
+def test_sessions_of_a_tier_are_served_round_robin(scheduler):
+    order = ServedOrder(scheduler)
+    for session_key in ('a', 'a', 'a', 'b', 'c', 'c'):
+        order.enqueue(FREE, session_key)
+
+    # Une session qui a mis trois appels en file ne passe pas devant les autres
+    assert [session for _, session in order.release_all()] == ['a', 'b', 'c', 'a', 'c', 'a']
+
+
+def test_full_queue_raises_quota_exceeded():
+    scheduler = GeminiQuotaScheduler(requests_per_minute=0, tokens_per_minute=10_000, max_queue_depth=1)
+    order = ServedOrder(scheduler)
+    order.enqueue(FREE, 'a')
+
+    with pytest.raises(QuotaExceededException):
+        scheduler.acquire(FREE, 'b', 1, timeout=5)
+    assert scheduler.rejected == 1
+
+    order.release_all()
+
+
+def test_queue_timeout_raises_quota_exceeded(scheduler):
+    with pytest.raises(QuotaExceededException):
+        scheduler.acquire(PRO, 'a', 1, timeout=0.01)
+
+    assert scheduler._depth == 0
+    assert scheduler.metrics()['tiers'][PRO]['waiting_sessions'] == 0
@@ -0,0 +1,138 @@
+import threading
+
+import pytest
+
+from services import job_queue as job_queue_module
+from services.job_queue import (
+    INTERRUPTED_JOB_ERROR, JOB_DONE, JOB_FAILED, JOB_PENDING, JOB_RUNNING, OWNER_TOKEN, JobQueue
+)
+from utils.exceptions import ValidationException
+
+DEAD_OWNER = (2 ** 22 + 12345, OWNER_TOKEN.split(':', 1)[0] + ':previous-process')
+
+
+@pytest.fixture
+def make_queue(tmp_path):
+    queues = []
+
+    def make():
+        queue = JobQueue(db_path=str(tmp_path / 'jobs.db'), max_workers=2)
+        queues.append(queue)
+        return queue
+
+    yield make
+    for queue in queues:
+        queue.shutdown()
+
+
+def insert_row(queue, job_id, kind, payload, status, owner):
+    queue._connection().execute(
+        "INSERT INTO jobs (id, kind, status, payload, created_at, updated_at, owner_pid, owner_token) "
+        "VALUES (?, ?, ?, ?, 0, 0, ?, ?)",
+        (job_id, kind, status, queue._seal(payload), *owner)
+    )
+
+
+def test_submit_runs_the_handler_and_stores_the_result(make_queue):
+    queue = make_queue()
+    queue.register('double', lambda payload: payload * 2)
+
+    job_id = queue.submit('double', 21, 'fingerprint')
+    status = queue.wait(job_id, timeout=5)
+
+    assert status.status == JOB_DONE
+    assert status.result == 42
+    assert status.finished
+
+
+def test_unknown_kind_is_rejected(make_queue):
+    with pytest.raises(ValidationException):
+        make_queue().submit('missing', None, 'fingerprint')
+
+
+def test_same_input_is_deduplicated(make_queue):
+    queue = make_queue()
+    release = threading.Event()
+    calls = []
+    queue.register('slow', lambda payload: calls.append(payload) or release.wait(5))
+
+    first = queue.submit('slow', 'a', 'same')
+    second = queue.submit('slow', 'a', 'same')
+    release.set()
+    queue.wait(first, timeout=5)
+
+    assert first == second
+    assert calls == ['a']
+    assert queue.submit('slow', 'b', 'other') != first
+
+
+def test_failed_job_is_retried_on_resubmission(make_queue):
+    queue = make_queue()
+    attempts = []
+
+    def flaky(payload):
+        attempts.append(payload)
+        if len(attempts) == 1:
+            raise RuntimeError("quota")
+        return 'ok'
+
+    queue.register('flaky', flaky)
+
+    job_id = queue.submit('flaky', 'cv', 'fingerprint')
+    failed = queue.wait(job_id, timeout=5)
+    assert failed.status == JOB_FAILED
+    assert failed.error == 'quota'
+
+    assert queue.submit('flaky', 'cv', 'fingerprint') == job_id
+    retried = queue.wait(job_id, timeout=5)
+    assert retried.status == JOB_DONE
+    assert retried.result == 'ok'
+
+
+def test_resume_restarts_jobs_of_a_dead_owner_only(make_queue):
+    queue = make_queue()
+    queue.register('echo', lambda payload: payload)
+    insert_row(queue, 'orphan', 'echo', 'recovered', JOB_RUNNING, DEAD_OWNER)
+    insert_row(queue, 'alive', 'echo', 'untouched', JOB_RUNNING, (job_queue_module.OWNER_PID, OWNER_TOKEN))
+
+    assert queue.resume_pending() == 1
+
+    assert queue.wait('orphan', timeout=5).result == 'recovered'
+    assert queue.get('alive').status == JOB_RUNNING
+
+
+def test_resume_ignores_the_age_of_interrupted_jobs(make_queue):
+    queue = make_queue()
+    queue.register('echo', lambda payload: payload)
+    insert_row(queue, 'recent', 'echo', 'value', JOB_PENDING, DEAD_OWNER)
+    queue._connection().execute("UPDATE jobs SET updated_at = strftime('%s', 'now')")
+
+    assert queue.resume_pending() == 1
+    assert queue.wait('recent', timeout=5).status == JOB_DONE
+
+
+def test_polling_a_job_of_a_dead_owner_reports_it_failed(make_queue):
+    queue = make_queue()
+    insert_row(queue, 'orphan', 'unregistered', None, JOB_RUNNING, DEAD_OWNER)
+
+    status = queue.get('orphan')
+
+    assert status.status == JOB_FAILED
+    assert status.error == INTERRUPTED_JOB_ERROR
+
+
+def test_resubmitting_a_job_of_a_dead_owner_restarts_it(make_queue):
+    queue = make_queue()
+    queue.register('echo', lambda payload: payload)
+    job_id = JobQueue.job_id('echo', 'fingerprint')
+    insert_row(queue, job_id, 'echo', 'stale', JOB_RUNNING, DEAD_OWNER)
+
+    assert queue.submit('echo', 'fresh', 'fingerprint') == job_id
+    assert queue.wait(job_id, timeout=5).result == 'fresh'
+
+
+def test_previous_process_with_the_same_pid_is_not_alive():
+    assert job_queue_module.owner_alive(job_queue_module.OWNER_PID, OWNER_TOKEN)
+    assert not job_queue_module.owner_alive(job_queue_module.OWNER_PID, DEAD_OWNER[1])
+    assert not job_queue_module.owner_alive(DEAD_OWNER[0], DEAD_OWNER[1])
+    assert not job_queue_module.owner_alive(1, 'another-boot:token')
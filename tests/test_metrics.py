@@ -0,0 +1,94 @@
+import pytest
+
+from utils.metrics import Histogram, MetricsRegistry
+
+
+def test_histogram_percentiles_are_within_bucket_precision():
+    histogram = Histogram('test_seconds', "Durées de test", ('route',))
+    for millisecond in range(1, 1001):
+        histogram.observe(millisecond / 1000, route='a')
+
+    percentiles = histogram.percentiles(route='a')
+
+    for quantile, expected in ((0.5, 0.5), (0.9, 0.9), (0.99, 0.99)):
+        assert percentiles[quantile] == pytest.approx(expected, rel=0.04)
+
+
+def test_histogram_small_values_are_exact():
+    histogram = Histogram('test_seconds', "Durées de test")
+    for microseconds in (1, 2, 3, 4):
+        histogram.observe(microseconds / 1_000_000)
+
+    assert histogram.percentiles((0.25, 1.0)) == {0.25: 1e-06, 1.0: 4e-06}
+
+
+def test_histogram_summary_and_label_merge():
+    histogram = Histogram('test_seconds', "Durées de test", ('route',))
+    histogram.observe(0.010, route='a')
+    histogram.observe(0.030, route='b')
+
+    summary = histogram.summary()
+
+    assert summary[('a',)]['count'] == 1
+    assert summary[('b',)]['max'] == pytest.approx(0.030)
+    assert histogram.percentiles((1.0,))[1.0] == pytest.approx(0.030, rel=0.04)
+    assert histogram.percentiles(route='missing') == {0.5: 0.0, 0.9: 0.0, 0.95: 0.0, 0.99: 0.0}
+
+
+def test_histogram_time_records_failures():
+    histogram = Histogram('test_seconds', "Durées de test")
+
+    with pytest.raises(RuntimeError):
+        with histogram.time():
+            raise RuntimeError()
+
+    assert histogram.summary()[()]['count'] == 1
+
+
+def test_registry_exposes_prometheus_text():
+    registry = MetricsRegistry()
+    registry.counter('test_requests', "Requêtes", ('status',)).inc(status='ok')
+    registry.gauge('test_queue', "File").set_function(lambda: 3)
+    registry.histogram('test_seconds', "Durées").observe(0.5)
+
+    text = registry.prometheus_text()
+
+    assert 'test_requests_total{status="ok"} 1' in text
+    assert 'test_queue 3' in text
+    assert '# TYPE test_seconds summary' in text
+    assert 'test_seconds_count 1' in text
+    assert registry.counter('test_requests', "Requêtes") is registry.get('test_requests')
+    with pytest.raises(ValueError):
+        registry.gauge('test_requests', "Requêtes")
+
+
+def test_exposed_values_are_not_rounded():
+    registry = MetricsRegistry()
+    registry.counter('test_requests', "Requêtes").inc(1234567)
+    registry.gauge('test_ratio', "Ratio").set(0.123456789)
+    registry.gauge('test_limit', "Limite").set(float('inf'))
+    registry.histogram('test_seconds', "Durées").observe(1234.567891)
+
+    text = registry.prometheus_text()
+
+    assert 'test_requests_total 1234567\n' in text
+    assert 'test_ratio 0.123456789\n' in text
+    assert 'test_limit +Inf\n' in text
+    assert 'test_seconds_sum 1234.567891\n' in text
+    assert 'test_seconds_count 1\n' in text
+
+
+def test_metrics_endpoint_serves_prometheus_text():
+    from urllib.request import urlopen
+
+    from utils.metrics import metrics, start_metrics_server
+
+    metrics.counter('test_endpoint_hits', "Appels").inc()
+    server = start_metrics_server(0)
+    try:
+        with urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics", timeout=5) as response:
+            body = response.read().decode('utf-8')
+    finally:
+        server.shutdown()
+
+    assert 'test_endpoint_hits_total 1' in body
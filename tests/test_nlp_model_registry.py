@@ -0,0 +1,73 @@
+import importlib.util
+import os
+import sys
+import threading
+import types
+
+import pytest
+
+# Le sous-projet phoenix_cv a son propre paquet services : module chargé depuis son chemin
+_REGISTRY_PATH = os.path.join(os.path.dirname(__file__), '..', 'phoenix_cv', 'services', 'nlp_model_registry.py')
+_spec = importlib.util.spec_from_file_location('phoenix_cv_nlp_model_registry', _REGISTRY_PATH)
+nlp_model_registry = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(nlp_model_registry)
+
+
+class FakePipeline:
+    def __init__(self, name, exclude):
+        self.name = name
+        self.exclude = exclude
+        self.consumed = []
+
+    def pipe(self, textes, batch_size, n_process):
+        for texte in textes:
+            self.consumed.append(texte)
+            yield texte.upper()
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    calls = []
+
+    def load(name, exclude):
+        calls.append((name, tuple(exclude)))
+        return FakePipeline(name, exclude)
+
+    monkeypatch.setitem(sys.modules, 'spacy', types.SimpleNamespace(load=load))
+    return calls
+
+
+def test_model_is_loaded_lazily_once_and_shared(loads):
+    registry = nlp_model_registry.NLPModelRegistry()
+    assert loads == []
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(loads) == 1
+    assert all(nlp is results[0] for nlp in results)
+    assert 'tok2vec' in loads[0][1]
+    assert registry.loaded_models() == [nlp_model_registry.MODELE_PAR_DEFAUT]
+
+
+def test_other_exclusions_load_a_separate_pipeline(loads):
+    registry = nlp_model_registry.NLPModelRegistry()
+
+    assert registry.get(exclude=()) is not registry.get()
+    assert len(loads) == 2
+
+
+def test_pipe_streams_documents(loads):
+    registry = nlp_model_registry.NLPModelRegistry()
+
+    docs = registry.pipe(['cv un', 'cv deux'])
+    nlp = registry.get()
+    assert nlp.consumed == []
+
+    assert next(docs) == 'CV UN'
+    assert nlp.consumed == ['cv un']
+    assert list(docs) == ['CV DEUX']
@@ -0,0 +1,108 @@
+import threading
+
+import pytest
+
+from utils import rate_limit_backends
+from utils.rate_limit_backends import (
+    MemoryRateLimitBackend, RateLimitBackend, SQLiteRateLimitBackend, create_backend, slide_window
+)
+
+
+class FakeClock:
+    def __init__(self, now: float = 100 * 60.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limit_backends.time, 'monotonic', fake)
+    monkeypatch.setattr(rate_limit_backends.time, 'time', fake)
+    return fake
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def backend(request, tmp_path, clock):
+    return create_backend(request.param, str(tmp_path / 'rate_limits.db'))
+
+
+def test_slide_window_weights_previous_window():
+    # Moitié de la fenêtre suivante écoulée : la moitié de l'ancienne fenêtre compte encore
+    assert slide_window(10, 8, 0, 11 * 60 + 30, 60) == (11, 0, 8, 4.0)
+    # Plus d'une fenêtre sans accès : tout est oublié
+    assert slide_window(10, 8, 3, 13 * 60, 60) == (13, 0, 0, 0.0)
+
+
+def test_backend_is_abstract():
+    with pytest.raises(TypeError):
+        RateLimitBackend()
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        create_backend('redis')
+
+
+def test_hit_denies_beyond_limit_and_reports_remaining(backend):
+    assert backend.remaining('session', 3, 60) == 3
+
+    results = [backend.hit('session', 3, 60)[0] for _ in range(4)]
+
+    assert results == [True, True, True, False]
+    assert backend.remaining('session', 3, 60) == 0
+    assert backend.remaining('other', 3, 60) == 3
+    assert len(backend) == 1
+
+
+def test_limit_is_released_as_the_window_slides(backend, clock):
+    for _ in range(4):
+        backend.hit('session', 4, 60)
+
+    clock.now += 60 * 1.5
+    assert backend.remaining('session', 4, 60) == 2
+
+    clock.now += 60
+    assert backend.remaining('session', 4, 60) == 4
+    assert backend.hit('session', 4, 60) == (True, 0.0)
+
+
+def test_memory_backend_evicts_idle_keys(clock):
+    backend = MemoryRateLimitBackend(shard_count=1)
+    backend.hit('idle', 5, 60)
+
+    clock.now += 3 * 60
+    backend.hit('active', 5, 60)
+
+    assert len(backend) == 1
+
+
+def test_memory_backend_counts_concurrent_hits_exactly():
+    backend = MemoryRateLimitBackend()
+    allowed = []
+
+    def worker():
+        for _ in range(50):
+            allowed.append(backend.hit('shared', 100, 3600)[0])
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert allowed.count(True) == 100
+
+
+def test_sqlite_backend_is_shared_between_instances(tmp_path, clock):
+    path = str(tmp_path / 'shared.db')
+    first = SQLiteRateLimitBackend(path)
+    second = SQLiteRateLimitBackend(path)
+
+    first.hit('session', 2, 60)
+    second.hit('session', 2, 60)
+
+    assert first.hit('session', 2, 60)[0] is False
+    assert second.remaining('session', 2, 60) == 0
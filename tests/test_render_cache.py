@@ -0,0 +1,95 @@
+import pytest
+
+cv_data = pytest.importorskip('models.cv_data')
+
+from services.render_cache import BoundedLRUCache, FragmentCache, RenderCache
+from services.session_store import SessionStore
+from utils.compact_codec import CompactCodec
+
+
+def test_bounded_cache_evicts_by_entries_and_bytes():
+    cache = BoundedLRUCache(max_entries=3, max_bytes=10)
+
+    for key in 'abc':
+        cache.get_or_build(key, lambda: 'xxx')
+    cache.get_or_build('a', lambda: 'unused')
+    cache.get_or_build('d', lambda: 'xxxx')
+
+    # 'b', le moins récemment utilisé, sort pour repasser sous 10 octets
+    assert len(cache) == 3
+    assert cache.size_bytes == 10
+    assert cache.get_or_build('a', lambda: 'rebuilt') == 'xxx'
+    assert cache.get_or_build('b', lambda: 'rebuilt') == 'rebuilt'
+    # Une valeur plus grande que le budget n'est pas mémorisée
+    assert cache.get_or_build('big', lambda: 'x' * 11) == 'x' * 11
+    assert cache.size_bytes <= 10
+
+
+def test_bounded_cache_counts_utf8_bytes():
+    cache = BoundedLRUCache(max_entries=8, max_bytes=10)
+    cache.get_or_build('accents', lambda: 'éèà')
+
+    assert cache.size_bytes == 6
+
+
+def test_fragment_cache_keys_on_snapshot_hash_not_content():
+    cache = FragmentCache(max_entries=8, max_bytes=1024)
+    # Chaînes égales mais distinctes, comme après un rerun qui reconstruit le profil
+    first_name, second_name = ''.join(['Marie ', 'Durand']), ''.join(['Marie ', 'Durand'])
+
+    first = cache.get_or_build(('experience', (first_name, 'Analyste')), lambda: '<div>fragment</div>')
+    second = cache.get_or_build(('experience', (second_name, 'Analyste')), lambda: '<div>rebuilt</div>')
+
+    assert second is first
+    assert all(isinstance(stored_key, int) for stored_key in cache._entries)
+
+
+def test_only_changed_section_items_are_rendered():
+    from services.secure_template_engine import SecureTemplateEngine
+
+    engine = SecureTemplateEngine()
+    rendered = []
+    render_item = engine._render_experience_item_secure
+    engine._render_experience_item_secure = lambda exp: rendered.append(exp.title) or render_item(exp)
+
+    def experiences(second_description):
+        return [
+            cv_data.Experience(title="Poste 1", company="A", description="Pilotage"),
+            cv_data.Experience(title="Poste 2", company="B", description=second_description),
+        ]
+
+    first = engine._render_experiences_secure(experiences("Analyse"))
+    assert engine._render_experiences_secure(experiences("Analyse")) == first
+    assert rendered == ["Poste 1", "Poste 2"]
+
+    edited = engine._render_experiences_secure(experiences("Analyse & reporting"))
+    assert rendered == ["Poste 1", "Poste 2", "Poste 2"]
+    assert "Analyse &amp; reporting" in edited
+
+
+def test_render_cache_lives_in_the_session_store(tmp_path):
+    store = SessionStore(CompactCodec(), disk_dir=str(tmp_path), reap_interval_seconds=3600)
+    renders = []
+
+    def render(profile, template_id, for_export=False):
+        renders.append(profile.personal_info.full_name)
+        return f"<h1>{profile.personal_info.full_name}</h1>"
+
+    cache = RenderCache(store, 'session', max_entries=2)
+    profiles = [cv_data.CVProfile(personal_info=cv_data.PersonalInfo(full_name=name)) for name in 'ABC']
+
+    cache.get_or_render(profiles[0], 'modern_free', False, render)
+    # Une autre instance sur la même session (rerun) relit le rendu depuis le store
+    assert RenderCache(store, 'session').get_or_render(profiles[0], 'modern_free', False, render) == '<h1>A</h1>'
+    assert renders == ['A']
+
+    cache.get_or_render(profiles[1], 'modern_free', False, render)
+    cache.get_or_render(profiles[2], 'modern_free', False, render)
+    assert len(cache) == 2
+
+    cache.get_or_render(profiles[0], 'modern_free', False, render)
+    assert renders == ['A', 'B', 'C', 'A']
+
+    cache.clear()
+    assert store.memory_usage() == (1, 0)
+    store.shutdown()
@@ -0,0 +1,102 @@
+import io
+
+import pytest
+from cryptography.fernet import Fernet
+
+from config.security_config import SecurityConfig
+from utils.exceptions import SecurityException
+from utils.secure_crypto import SecureCrypto
+
+# Flux chiffré par blocs de 16 octets : en-tête (magic + id de clé + préfixe de nonce),
+# puis par bloc un en-tête (longueur + drapeau), le chiffré et le tag GCM
+STREAM_HEADER_SIZE = 5 + 8 + 8
+RECORD_SIZE = 5 + 16 + 16
+
+
+@pytest.fixture
+def crypto():
+    return SecureCrypto()
+
+
+def encrypt_stream(crypto, data: bytes, chunk_size: int = 16) -> bytes:
+    destination = io.BytesIO()
+    written = crypto.encrypt_stream_aead(io.BytesIO(data), destination, chunk_size=chunk_size)
+    assert written == len(destination.getvalue())
+    return destination.getvalue()
+
+
+def decrypt_stream(crypto, sealed: bytes) -> bytes:
+    destination = io.BytesIO()
+    crypto.decrypt_stream_aead(io.BytesIO(sealed), destination)
+    return destination.getvalue()
+
+
+@pytest.mark.parametrize('data', [b'', b'x' * 15, b'x' * 16, bytes(range(256)) * 3])
+def test_stream_round_trip(crypto, data):
+    sealed = encrypt_stream(crypto, data)
+
+    assert sealed.startswith(SecureCrypto.AEAD_STREAM_MAGIC)
+    assert decrypt_stream(crypto, sealed) == data
+
+
+def test_stream_uses_a_fresh_nonce_prefix(crypto):
+    assert encrypt_stream(crypto, b'same content') != encrypt_stream(crypto, b'same content')
+
+
+def test_stream_tampering_is_detected(crypto):
+    sealed = bytearray(encrypt_stream(crypto, b'a' * 64))
+    sealed[-1] ^= 0x01
+
+    with pytest.raises(SecurityException):
+        decrypt_stream(crypto, bytes(sealed))
+
+
+def test_stream_truncation_is_detected(crypto):
+    sealed = encrypt_stream(crypto, b'a' * 64)
+
+    # Blocs de fin supprimés : le dernier bloc restant n'est pas marqué comme dernier
+    with pytest.raises(SecurityException):
+        decrypt_stream(crypto, sealed[:STREAM_HEADER_SIZE + RECORD_SIZE])
+    with pytest.raises(SecurityException):
+        decrypt_stream(crypto, sealed[:-1])
+
+
+def test_stream_record_reordering_is_detected(crypto):
+    sealed = encrypt_stream(crypto, b'a' * 16 + b'b' * 16 + b'c' * 16)
+    header, records = sealed[:STREAM_HEADER_SIZE], sealed[STREAM_HEADER_SIZE:]
+    first, second = records[:RECORD_SIZE], records[RECORD_SIZE:2 * RECORD_SIZE]
+
+    with pytest.raises(SecurityException):
+        decrypt_stream(crypto, header + second + first + records[2 * RECORD_SIZE:])
+
+
+def test_bytes_round_trip_and_tampering(crypto):
+    sealed = crypto.encrypt_bytes(b'profil serialise')
+
+    assert sealed.startswith(SecureCrypto.AEAD_BYTES_MAGIC)
+    assert crypto.decrypt_bytes(sealed) == b'profil serialise'
+
+    tampered = bytearray(sealed)
+    tampered[-1] ^= 0x01
+    with pytest.raises(SecurityException):
+        crypto.decrypt_bytes(bytes(tampered))
+    with pytest.raises(SecurityException):
+        crypto.decrypt_bytes(b'not encrypted')
+
+
+def test_previous_key_still_decrypts_after_rotation(monkeypatch):
+    old_key, new_key = Fernet.generate_key(), Fernet.generate_key()
+
+    monkeypatch.setattr(SecurityConfig, 'get_encryption_keys', staticmethod(lambda: (old_key,)))
+    old_crypto = SecureCrypto()
+    sealed_bytes = old_crypto.encrypt_bytes(b'avant rotation')
+    sealed_stream = encrypt_stream(old_crypto, b'flux avant rotation')
+
+    monkeypatch.setattr(SecurityConfig, 'get_encryption_keys', staticmethod(lambda: (new_key, old_key)))
+    rotated_crypto = SecureCrypto()
+    assert rotated_crypto.decrypt_bytes(sealed_bytes) == b'avant rotation'
+    assert decrypt_stream(rotated_crypto, sealed_stream) == b'flux avant rotation'
+
+    monkeypatch.setattr(SecurityConfig, 'get_encryption_keys', staticmethod(lambda: (new_key,)))
+    with pytest.raises(SecurityException):
+        SecureCrypto().decrypt_bytes(sealed_bytes)
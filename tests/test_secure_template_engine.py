@@ -0,0 +1,46 @@
+import pytest
+
+cv_data = pytest.importorskip('models.cv_data')
+
+from services.secure_template_engine import SecureTemplateEngine, CVTemplate
+
+
+@pytest.fixture(scope='module')
+def engine():
+    return SecureTemplateEngine()
+
+
+def build_profile():
+    return cv_data.CVProfile(
+        personal_info=cv_data.PersonalInfo(full_name="Marie <Durand>", email="marie@example.com"),
+        professional_summary="Responsable logistique",
+        target_position="Data Analyst",
+        experiences=[cv_data.Experience(title="Cheffe de projet", company="Entreprise", description="Pilotage")],
+        education=[cv_data.Education(degree="Master", institution="Université", graduation_year="2015")],
+        skills=[cv_data.Skill(name="SQL", level="Avancé", category="Technique")]
+    )
+
+
+def test_render_keeps_template_structure_and_classes(engine):
+    rendered = engine.render_cv_secure(build_profile(), 'modern_free')
+
+    assert '<div class="cv-container">' in rendered
+    assert '<header class="cv-header">' in rendered
+    assert '<section class="experience-section">' in rendered
+    assert '<section class="skills-section">' in rendered
+    assert '<h1>Marie &lt;Durand&gt;</h1>' in rendered
+    assert '<h2>Data Analyst</h2>' in rendered
+    assert '<h3>Cheffe de projet</h3>' in rendered
+    assert '.cv-container' in rendered
+
+
+def test_static_template_loses_scripts_and_event_handlers():
+    template = CVTemplate(
+        id='hostile', name='Hostile', category='', description='', is_premium=False, preview_image='',
+        html_template='<section class="cv" onclick="steal()"><h1>{{FULL_NAME}}</h1><script>alert(1)</script></section>',
+        css_styles=''
+    )
+
+    assert template.html_template.startswith('<section class="cv"><h1>{{FULL_NAME}}</h1>')
+    assert 'onclick' not in template.html_template
+    assert '<script' not in template.html_template
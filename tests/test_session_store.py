@@ -0,0 +1,117 @@
+import os
+import time
+
+import pytest
+
+from services import session_store
+from services.session_store import SESSION_FILE_SUFFIX, SessionStore
+from utils.compact_codec import CompactCodec
+
+
+@pytest.fixture
+def make_store(tmp_path):
+    stores = []
+
+    def make(memory_budget_bytes=10_000, idle_timeout_seconds=3600, codec=None):
+        store = SessionStore(
+            codec or CompactCodec(),
+            memory_budget_bytes=memory_budget_bytes,
+            disk_dir=str(tmp_path),
+            idle_timeout_seconds=idle_timeout_seconds,
+            reap_interval_seconds=3600
+        )
+        stores.append(store)
+        return store
+
+    yield make
+    for store in stores:
+        store.shutdown()
+
+
+def disk_files(store):
+    return [name for name in os.listdir(store.disk_dir) if name.endswith(SESSION_FILE_SUFFIX)]
+
+
+def test_set_get_and_delete(make_store):
+    store = make_store()
+
+    store.set('s1', 'profile', 'valeur')
+    assert store.get('s1', 'profile') == 'valeur'
+    assert store.get('s2', 'profile', 'defaut') == 'defaut'
+
+    store.set('s1', 'profile', None)
+    assert store.get('s1', 'profile') is None
+    assert store.memory_usage() == (1, 0)
+
+
+def test_sessions_over_budget_spill_to_encrypted_disk_and_come_back(make_store):
+    store = make_store(memory_budget_bytes=300)
+
+    store.set('old', 'profile', 'a' * 200)
+    store.set('new', 'profile', 'b' * 200)
+
+    assert store.memory_usage()[0] == 1
+    assert store.spilled == 1
+    [spilled_file] = disk_files(store)
+    with open(os.path.join(store.disk_dir, spilled_file), 'rb') as f:
+        assert b'a' * 50 not in f.read()
+
+    assert store.get('old', 'profile') == 'a' * 200
+    assert store.restored == 1
+    assert store.get('new', 'profile') == 'b' * 200
+
+
+def test_spilled_sessions_from_another_schema_are_dropped(make_store):
+    store = make_store(memory_budget_bytes=300)
+    store.set('old', 'profile', 'a' * 200)
+    store.set('new', 'profile', 'b' * 200)
+
+    class OtherType:
+        pass
+
+    other_codec = CompactCodec((OtherType,))
+    other = make_store(memory_budget_bytes=300, codec=other_codec)
+
+    assert other.get('old', 'profile') is None
+    assert disk_files(other) == []
+
+
+def test_drop_removes_both_tiers(make_store):
+    store = make_store(memory_budget_bytes=300)
+    store.set('old', 'profile', 'a' * 200)
+    store.set('new', 'profile', 'b' * 200)
+
+    store.drop('old')
+    store.drop('new')
+
+    assert store.memory_usage() == (0, 0)
+    assert disk_files(store) == []
+    assert store.get('old', 'profile') is None
+
+
+def test_reap_removes_idle_sessions_from_both_tiers(make_store, monkeypatch):
+    store = make_store(memory_budget_bytes=300, idle_timeout_seconds=60)
+    store.set('old', 'profile', 'a' * 200)
+    store.set('new', 'profile', 'b' * 200)
+
+    later = time.time() + 120
+    monkeypatch.setattr(session_store.time, 'time', lambda: later)
+    store.set('fresh', 'profile', 'c')
+
+    assert store.reap() == 2
+    assert disk_files(store) == []
+    assert store.memory_usage()[0] == 1
+    assert store.get('fresh', 'profile') == 'c'
+
+
+def test_failed_spill_keeps_the_session_in_memory(make_store, monkeypatch):
+    store = make_store(memory_budget_bytes=300)
+    store.set('old', 'profile', 'a' * 200)
+    monkeypatch.setattr(store, 'disk_dir', os.path.join(store.disk_dir, 'missing', 'dir'))
+
+    store.set('new', 'profile', 'b' * 200)
+
+    assert store.spilled == 0
+    assert store.memory_usage()[0] == 2
+    assert store.memory_usage()[1] > store.memory_budget_bytes
+    assert store.get('old', 'profile') == 'a' * 200
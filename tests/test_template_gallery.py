@@ -0,0 +1,21 @@
+import pytest
+
+cv_data = pytest.importorskip('models.cv_data')
+
+from services import template_gallery
+from services.secure_template_engine import SecureTemplateEngine
+from services.template_gallery import TemplateGallery
+
+
+def demo_profile():
+    return cv_data.CVProfile(personal_info=cv_data.PersonalInfo(full_name="Marie Durand"))
+
+
+def test_preview_key_changes_with_renderer_version(tmp_path, monkeypatch):
+    engine = SecureTemplateEngine()
+    template_id = engine.registry.all_infos()[0].id
+    key = TemplateGallery(engine, demo_profile, str(tmp_path)).preview_key(template_id)
+
+    monkeypatch.setattr(template_gallery, 'RENDERER_VERSION', 'next')
+
+    assert TemplateGallery(engine, demo_profile, str(tmp_path)).preview_key(template_id) != key
@@ -0,0 +1,22 @@
+import pytest
+
+pytest.importorskip('models.cv_data')
+
+from services.template_registry import minify_css
+
+
+def test_minify_css_keeps_descendant_pseudo_class_selectors():
+    css = """
+        /* Liens */
+        a :hover , ul > li { color : red ; margin: 0 ; }
+        @media (max-width: 600px) { .cv-header  :first-child { font-size : 12px; } }
+    """
+
+    assert minify_css(css) == (
+        'a :hover,ul>li{color:red;margin:0}'
+        '@media (max-width: 600px){.cv-header :first-child{font-size:12px}}'
+    )
+
+
+def test_minify_css_collapses_pseudo_classes_written_without_space():
+    assert minify_css('a:hover { color: red; }') == 'a:hover{color:red}'
@@ -0,0 +1,107 @@
+import contextvars
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utils import tracing
+from utils.tracing import STATUS_ERROR, STATUS_OK, Tracer, current_trace_id, trace_span
+
+
+@pytest.fixture
+def tracer(monkeypatch):
+    test_tracer = Tracer(buffer_size=10, export_path=None)
+    monkeypatch.setattr(tracing, 'tracer', test_tracer)
+    return test_tracer
+
+
+def test_nested_spans_share_the_trace_and_link_to_their_parent(tracer):
+    with trace_span('root', action='upload') as root:
+        with trace_span('child') as child:
+            with trace_span('grandchild') as grandchild:
+                assert current_trace_id() == root.trace_id
+
+    assert current_trace_id() is None
+    [trace] = tracer.recent_traces()
+    assert [span.name for span in trace] == ['grandchild', 'child', 'root']
+    assert {span.trace_id for span in trace} == {root.trace_id}
+    assert root.parent_id is None
+    assert child.parent_id == root.span_id
+    assert grandchild.parent_id == child.span_id
+
+
+def test_sibling_roots_start_separate_traces(tracer):
+    with trace_span('first') as first:
+        pass
+    with trace_span('second') as second:
+        pass
+
+    assert first.trace_id != second.trace_id
+    assert len(tracer.recent_traces()) == 2
+
+
+def test_context_follows_executor_threads_when_copied(tracer):
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        with trace_span('root') as root:
+            def work():
+                with trace_span('worker') as span:
+                    return span
+
+            copied = executor.submit(contextvars.copy_context().run, work).result()
+            uncopied = executor.submit(work).result()
+
+    assert copied.trace_id == root.trace_id
+    assert copied.parent_id == root.span_id
+    assert copied.attributes['thread.name'] != root.attributes['thread.name']
+    # Sans copie du contexte, le thread démarre une trace indépendante
+    assert uncopied.trace_id != root.trace_id
+    assert uncopied.parent_id is None
+
+
+def test_span_finished_after_its_root_is_published_alone(tracer):
+    with trace_span('root') as root:
+        # Job soumis pendant l'action, exécuté après la fin de la racine
+        context = contextvars.copy_context()
+
+    def background_job():
+        with trace_span('background_job') as span:
+            return span
+
+    late = context.run(background_job)
+
+    assert [span.name for span in tracer.recent_traces()[0]] == ['background_job']
+    assert late.trace_id == root.trace_id
+    assert late.parent_id == root.span_id
+
+
+def test_exceptions_mark_the_span_as_failed(tracer):
+    with pytest.raises(ValueError):
+        with trace_span('root') as root:
+            with trace_span('child') as child:
+                raise ValueError()
+
+    assert child.status_code == STATUS_ERROR
+    assert child.status_message == 'ValueError'
+    assert root.status_code == STATUS_ERROR
+
+
+def test_otlp_export_and_file_export(tmp_path, monkeypatch):
+    export_path = tmp_path / 'traces.jsonl'
+    file_tracer = Tracer(buffer_size=10, export_path=str(export_path))
+    monkeypatch.setattr(tracing, 'tracer', file_tracer)
+
+    with trace_span('root', retries=2, cached=True) as root:
+        with trace_span('child'):
+            pass
+
+    document = file_tracer.export_otlp_json(root.trace_id)
+    spans = document['resourceSpans'][0]['scopeSpans'][0]['spans']
+    assert {span['name'] for span in spans} == {'root', 'child'}
+    root_span = next(span for span in spans if span['name'] == 'root')
+    assert 'parentSpanId' not in root_span
+    assert root_span['status'] == {'code': STATUS_OK}
+    assert {'key': 'retries', 'value': {'intValue': '2'}} in root_span['attributes']
+    assert {'key': 'cached', 'value': {'boolValue': True}} in root_span['attributes']
+
+    [line] = export_path.read_text(encoding='utf-8').splitlines()
+    assert json.loads(line) == document
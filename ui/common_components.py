@@ -1,10 +1,13 @@
 """
 Composants communs UI securises - Phoenix CV
-Header et footer avec indicateurs de securite
+Header et footer avec indicateurs de securite, suivi des jobs de fond
 """
 
 import streamlit as st
 
+# Intervalle de sondage d'un job de fond en cours
+JOB_POLL_INTERVAL_SECONDS = 2
+
 
 def render_secure_header():
     """Header securise"""
@@ -86,4 +89,17 @@ def render_secure_footer():
             </span>
         </p>
     </div>
-    """, unsafe_allow_html=True)
\ No newline at end of file
+    """, unsafe_allow_html=True)
+
+
+@st.fragment(run_every=JOB_POLL_INTERVAL_SECONDS)
+def render_job_progress(job_queue, job_id: str, message: str):
+    """
+    Suivi non bloquant d'un job de fond : seul ce fragment est reexecute periodiquement,
+    le script n'attend jamais le job. Une fois le job termine, un rerun complet affiche le resultat.
+    """
+    job = job_queue.get(job_id)
+    if job is None or job.finished:
+        st.rerun()
+    
+    st.info(message)
@@ -9,6 +9,7 @@ from services.secure_session_manager import secure_session
 from utils.exceptions import SecurityException, ValidationException
 from utils.secure_logging import secure_logger
 from utils.secure_validator import SecureValidator
+from utils.tracing import trace_span
 
 
 def render_create_cv_page_secure(gemini_client, display_generated_cv_secure_func):
@@ -21,6 +22,7 @@ def render_create_cv_page_secure(gemini_client, display_generated_cv_secure_func
     
     if not can_create:
         st.error(limit_message)
+        _display_current_cv_secure(display_generated_cv_secure_func)
         return
     
     # Indicateurs de securite
@@ -161,7 +163,8 @@ def render_create_cv_page_secure(gemini_client, display_generated_cv_secure_func
                 )
                 
                 # Generation securisee
-                with st.spinner("🛡️ Generation securisee en cours..."):
+                # Racine de la trace de l'action : appel IA puis rendu du CV
+                with st.spinner("🛡️ Generation securisee en cours..."), trace_span('cv.create', tier=user_tier.value):
                     
                     # Amelioration securisee avec IA
                     if cv_profile.professional_summary:
@@ -179,7 +182,7 @@ def render_create_cv_page_secure(gemini_client, display_generated_cv_secure_func
                         cv_profile.professional_summary = enhanced_summary
                     
                     # Sauvegarde securisee
-                    st.session_state.current_cv_profile = cv_profile
+                    secure_session.set_current_profile(cv_profile)
                     secure_session.increment_usage()
                     
                     # Log succes
@@ -191,9 +194,6 @@ def render_create_cv_page_secure(gemini_client, display_generated_cv_secure_func
                     st.success("✅ CV genere avec securite maximale!")
                     st.balloons()
                     
-                    # Affichage securise du CV
-                    display_generated_cv_secure_func(cv_profile)
-                    
             except ValidationException as e:
                 st.error(f"🚫 Erreur de validation: {str(e)}")
                 secure_logger.log_security_event(
@@ -216,4 +216,16 @@ def render_create_cv_page_secure(gemini_client, display_generated_cv_secure_func
                     "CV_GENERATION_ERROR",
                     {"error": str(e)[:100]},
                     "ERROR"
-                )
\ No newline at end of file
+                )
+    
+    _display_current_cv_secure(display_generated_cv_secure_func)
+
+
+def _display_current_cv_secure(display_generated_cv_secure_func):
+    """
+    Affiche le CV courant, relu depuis le stockage serveur de la session : il reste visible
+    (exports, analyse ATS) a chaque rerun, et est rendu hors du formulaire
+    """
+    current_profile = secure_session.get_current_profile()
+    if current_profile is not None:
+        display_generated_cv_secure_func(current_profile)
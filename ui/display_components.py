@@ -7,12 +7,21 @@ import streamlit as st
 import html
 from models.cv_data import CVTier, CVProfile, PersonalInfo, Experience, Education, Skill
 from services.secure_ats_optimizer import ATSAnalysis
-from utils.exceptions import SecurityException
+from services.secure_session_manager import secure_session
+from utils.exceptions import SecurityException, ValidationException
 from utils.secure_logging import secure_logger
 from utils.secure_crypto import secure_crypto
 
 
-def display_generated_cv_secure(profile: CVProfile, template_engine, ats_optimizer):
+def display_generated_cv_secure(
+    profile: CVProfile,
+    template_engine,
+    ats_optimizer,
+    render_cache=None,
+    pdf_exporter=None,
+    docx_exporter=None,
+    job_queue=None
+):
     """Affichage sécurisé du CV généré"""
     
     st.markdown("---")
@@ -31,11 +40,16 @@ def display_generated_cv_secure(profile: CVProfile, template_engine, ats_optimiz
     
     template_id = template_options[selected_template]
     
-    # Rendu sécurisé
+    # Rendu sécurisé (mis en cache tant que profil et template sont inchangés)
     try:
-        html_cv = template_engine.render_cv_secure(
-            profile, template_id, for_export=False
-        )
+        if render_cache is not None:
+            html_cv = render_cache.get_or_render(
+                profile, template_id, False, template_engine.render_cv_secure
+            )
+        else:
+            html_cv = template_engine.render_cv_secure(
+                profile, template_id, for_export=False
+            )
         
         # Affichage sécurisé
         col1, col2 = st.columns([3, 1])
@@ -47,12 +61,10 @@ def display_generated_cv_secure(profile: CVProfile, template_engine, ats_optimiz
             st.markdown("### 🛡️ Actions Sécurisées")
             
             if st.button("📄 Export PDF Chiffré", use_container_width=True):
-                st.success("🔒 PDF généré avec chiffrement AES-256!")
-                secure_logger.log_security_event("PDF_EXPORT_SECURE", {"template": template_id})
+                _export_pdf_secure(profile, template_id, template_engine, render_cache, pdf_exporter)
             
             if st.button("📝 Export DOCX Sécurisé", use_container_width=True):
-                st.success("🔒 DOCX généré avec protection DRM!")
-                secure_logger.log_security_event("DOCX_EXPORT_SECURE", {"template": template_id})
+                _export_docx_secure(profile, template_id, docx_exporter)
             
             if st.button("🔗 Lien Sécurisé", use_container_width=True):
                 secure_token = secure_crypto.generate_secure_token(16)
@@ -63,7 +75,9 @@ def display_generated_cv_secure(profile: CVProfile, template_engine, ats_optimiz
             st.markdown("---")
             st.markdown("### ⚡ Score ATS Sécurisé")
             
-            if st.button("🔍 Analyse ATS Complete", use_container_width=True):
+            if job_queue is not None:
+                _render_ats_job_secure(profile, job_queue)
+            elif st.button("🔍 Analyse ATS Complete", use_container_width=True):
                 with st.spinner("🛡️ Analyse ATS sécurisée..."):
                     try:
                         ats_analysis = ats_optimizer.analyze_ats_compatibility_secure(profile)
@@ -93,6 +107,90 @@ def display_generated_cv_secure(profile: CVProfile, template_engine, ats_optimiz
         )
 
 
+def _render_ats_job_secure(profile: CVProfile, job_queue):
+    """
+    Analyse ATS en job de fond : le script ne l'attend jamais, et le résultat survit aux reruns
+    comme aux rafraîchissements (identifiant de session stable, job adressé par l'empreinte du profil)
+    """
+    from services.render_cache import profile_fingerprint
+    from ui.common_components import render_job_progress
+    
+    fingerprint = profile_fingerprint(profile)
+    job_id = job_queue.job_id('ats_analysis', fingerprint)
+    
+    if st.button("🔍 Analyse ATS Complete", use_container_width=True):
+        job_queue.submit('ats_analysis', {'profile': profile, 'job_description': ''}, fingerprint)
+    
+    job = job_queue.get(job_id)
+    if job is None:
+        return
+    
+    if not job.finished:
+        render_job_progress(job_queue, job_id, "⏳ Analyse ATS sécurisée en cours...")
+    elif job.status == 'done':
+        display_ats_results_secure(job.result)
+    else:
+        st.error("❌ Erreur analyse ATS")
+
+
+def _export_pdf_secure(profile: CVProfile, template_id: str, template_engine, render_cache, pdf_exporter):
+    """Export PDF serveur (stocké chiffré sur disque) et téléchargement"""
+    if pdf_exporter is None:
+        st.error("🚫 Service d'export PDF non disponible")
+        return
+    
+    try:
+        with st.spinner("🛡️ Génération du PDF sécurisé..."):
+            if render_cache is not None:
+                export_html = render_cache.get_or_render(
+                    profile, template_id, True, template_engine.render_cv_secure
+                )
+            else:
+                export_html = template_engine.render_cv_secure(profile, template_id, for_export=True)
+            
+            pdf_path = pdf_exporter.export_pdf(export_html, encrypt=True)
+        
+        with pdf_exporter.open_pdf(pdf_path) as pdf_file:
+            st.download_button(
+                "⬇️ Télécharger le PDF",
+                data=pdf_file,
+                file_name="cv_phoenix.pdf",
+                mime="application/pdf",
+                use_container_width=True
+            )
+        
+        st.success("🔒 PDF généré (stockage chiffré AES)!")
+        secure_logger.log_security_event("PDF_EXPORT_SECURE", {"template": template_id})
+    
+    except SecurityException as e:
+        st.error(f"🚫 {str(e)}")
+
+
+def _export_docx_secure(profile: CVProfile, template_id: str, docx_exporter):
+    """Export DOCX généré depuis le profil et téléchargement"""
+    if docx_exporter is None:
+        st.error("🚫 Service d'export DOCX non disponible")
+        return
+    
+    try:
+        with st.spinner("🛡️ Génération du DOCX sécurisé..."):
+            docx_content = docx_exporter.export_docx(profile, template_id)
+        
+        st.download_button(
+            "⬇️ Télécharger le DOCX",
+            data=docx_content,
+            file_name="cv_phoenix.docx",
+            mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+            use_container_width=True
+        )
+        
+        st.success("🔒 DOCX généré avec succès!")
+        secure_logger.log_security_event("DOCX_EXPORT_SECURE", {"template": template_id})
+    
+    except (SecurityException, ValidationException) as e:
+        st.error(f"🚫 {str(e)}")
+
+
 def display_parsed_cv_secure(profile: CVProfile, display_generated_cv_secure_func):
     """Affichage sécurisé du CV parsé"""
     
@@ -133,9 +231,9 @@ def display_parsed_cv_secure(profile: CVProfile, display_generated_cv_secure_fun
                 try:
                     # Amélioration sécurisée basique pour démo
                     enhanced_profile = profile  # Simplification pour l'exemple
-                    st.session_state.current_cv_profile = enhanced_profile
+                    secure_session.set_current_profile(enhanced_profile)
                     st.success("✅ CV amélioré avec sécurité maximale!")
-                    display_generated_cv_secure_func(enhanced_profile)
+                    st.session_state.show_generated_cv = True
                     
                 except Exception as e:
                     st.error("❌ Erreur amélioration sécurisée")
@@ -147,7 +245,11 @@ def display_parsed_cv_secure(profile: CVProfile, display_generated_cv_secure_fun
     
     with col2:
         if st.button("🎨 Templates Sécurisés", use_container_width=True):
-            display_generated_cv_secure_func(profile)
+            st.session_state.show_generated_cv = True
+    
+    # Le CV généré reste affiché aux reruns suivants (exports, analyse ATS)
+    if st.session_state.get('show_generated_cv'):
+        display_generated_cv_secure_func(profile)
 
 
 def display_ats_results_secure(analysis: ATSAnalysis):
@@ -5,10 +5,14 @@ Composants modernes alignés avec Phoenix Letters
 
 import streamlit as st
 from typing import Dict, List, Optional, Any
-import plotly.graph_objects as go
-import plotly.express as px
 from datetime import datetime
 
+from utils.lazy_imports import lazy_import
+
+# plotly n'est chargé qu'au premier graphique affiché
+go = lazy_import("plotly.graph_objects")
+px = lazy_import("plotly.express")
+
 class PhoenixCVUI:
     """Composants UI modernes pour Phoenix CV"""
     
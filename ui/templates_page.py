@@ -8,8 +8,8 @@ import html
 from models.cv_data import CVTier
 
 
-def render_templates_page_secure(template_engine, create_demo_profile_secure_func):
-    """Page templates securisee"""
+def render_templates_page_secure(template_engine, create_demo_profile_secure_func, template_gallery=None):
+    """Page templates securisee (apercus servis par la galerie pre-rendue si fournie)"""
     
     st.title("🎨 Templates Securises Phoenix CV")
     
@@ -45,11 +45,14 @@ def render_templates_page_secure(template_engine, create_demo_profile_secure_fun
                     st.rerun()
             else:
                 if st.button(f"👁️ Apercu Securise", key=f"preview_{template.id}"):
-                    # Profil demo securise
-                    demo_profile = create_demo_profile_secure_func()
-                    html_preview = template_engine.render_cv_secure(
-                        demo_profile, template.id, for_export=False
-                    )
+                    if template_gallery is not None:
+                        html_preview = template_gallery.get_preview(template.id)
+                    else:
+                        # Profil demo securise, rendu a la volee
+                        demo_profile = create_demo_profile_secure_func()
+                        html_preview = template_engine.render_cv_secure(
+                            demo_profile, template.id, for_export=False
+                        )
                     
                     st.markdown("**Apercu securise du template:**")
                     st.components.v1.html(html_preview, height=600, scrolling=True)
@@ -3,16 +3,21 @@ Page upload CV securisee - Phoenix CV
 Import et analyse securisee de CV existants avec validation et scanning
 """
 
+import hashlib
+from typing import Tuple
+
 import streamlit as st
 from config.security_config import SecurityConfig
 from services.secure_file_handler import SecureFileHandler
+from services.secure_session_manager import secure_session
 from utils.exceptions import SecurityException
 from utils.secure_logging import secure_logger
 from utils.secure_validator import SecureValidator
 from utils.rate_limiter import rate_limiter
+from utils.tracing import trace_span
 
 
-def render_upload_cv_page_secure(cv_parser, display_parsed_cv_secure_func):
+def render_upload_cv_page_secure(cv_parser, display_parsed_cv_secure_func, job_queue=None):
     """Page d'import CV ultra-securisee"""
     
     st.title("📁 Import CV Ultra-Securise")
@@ -57,18 +62,11 @@ def render_upload_cv_page_secure(cv_parser, display_parsed_cv_secure_func):
         try:
             file_content = uploaded_file.read()
             
-            # Validation securisee complete
-            is_valid, message = SecureFileHandler.validate_file_secure(
-                file_content, uploaded_file.name
-            )
+            # Validation une seule fois par fichier uploade, resultat reutilise aux reruns suivants
+            is_valid, message = _validate_upload_once(uploaded_file, file_content)
             
             if not is_valid:
                 st.error(f"🚫 {message}")
-                secure_logger.log_security_event(
-                    "FILE_UPLOAD_REJECTED",
-                    {"filename": uploaded_file.name[:50], "reason": message},
-                    "WARNING"
-                )
                 return
             
             st.success(f"✅ Fichier valide et securise: {uploaded_file.name}")
@@ -76,7 +74,8 @@ def render_upload_cv_page_secure(cv_parser, display_parsed_cv_secure_func):
             # Analyse securisee
             if st.button("🔍 Analyser Mon CV (Securise)", type="primary"):
                 
-                with st.spinner("🛡️ Analyse securisee en cours..."):
+                # Racine de la trace de l'action : extraction, anonymisation, appel IA, parsing
+                with st.spinner("🛡️ Analyse securisee en cours..."), trace_span('cv.upload_analysis'):
                     try:
                         # Extraction securisee du texte
                         if uploaded_file.name.endswith('.pdf'):
@@ -88,15 +87,18 @@ def render_upload_cv_page_secure(cv_parser, display_parsed_cv_secure_func):
                                 file_content.decode('utf-8'), 50000, "contenu fichier TXT"
                             )
                         
-                        # Parsing securise avec IA
-                        parsed_profile = cv_parser.parse_cv_with_ai_secure(cv_text)
-                        
-                        st.session_state.current_cv_profile = parsed_profile
-                        
-                        st.success("✅ CV analyse avec securite maximale!")
-                        
-                        # Affichage des resultats securises
-                        display_parsed_cv_secure_func(parsed_profile)
+                        if job_queue is not None:
+                            # Parsing IA en job de fond, suivi ci-dessous sans bloquer le script
+                            fingerprint = hashlib.sha256(cv_text.encode('utf-8')).hexdigest()
+                            job_id = job_queue.submit('cv_parse', {'cv_text': cv_text}, fingerprint)
+                            secure_session.set_pending_job('cv_parse', job_id)
+                        else:
+                            # Parsing securise avec IA
+                            parsed_profile = cv_parser.parse_cv_with_ai_secure(cv_text)
+                            
+                            secure_session.set_current_profile(parsed_profile)
+                            
+                            st.success("✅ CV analyse avec securite maximale!")
                         
                     except SecurityException as e:
                         st.error("🚫 Violation de securite lors de l'analyse")
@@ -120,4 +122,66 @@ def render_upload_cv_page_secure(cv_parser, display_parsed_cv_secure_func):
                 "FILE_READ_ERROR",
                 {"filename": uploaded_file.name[:50], "error": str(e)[:100]},
                 "ERROR"
-            )
\ No newline at end of file
+            )
+    
+    if job_queue is not None and _render_parse_job_secure(job_queue):
+        return
+    
+    # CV analyse courant, relu depuis le stockage serveur de la session a chaque rerun
+    current_profile = secure_session.get_current_profile()
+    if current_profile is not None:
+        display_parsed_cv_secure_func(current_profile)
+
+
+def _validate_upload_once(uploaded_file, file_content: bytes) -> Tuple[bool, str]:
+    """
+    Validation securisee d'un fichier uploade, faite des son apparition dans sa propre trace.
+    Le resultat est memorise en session sous l'identifiant du fichier (file_id, sinon empreinte
+    du contenu) : les reruns suivants ne revalident pas et ne relogguent pas le rejet.
+    """
+    upload_key = getattr(uploaded_file, 'file_id', None) or hashlib.sha256(file_content).hexdigest()
+    
+    cached = st.session_state.get('upload_validation')
+    if cached is not None and cached[0] == upload_key:
+        return cached[1], cached[2]
+    
+    with trace_span('file.upload_validation', size_bytes=len(file_content)) as span:
+        is_valid, message = SecureFileHandler.validate_file_secure(file_content, uploaded_file.name)
+        
+        if not is_valid:
+            span.set_error('file_rejected')
+            secure_logger.log_security_event(
+                "FILE_UPLOAD_REJECTED",
+                {"filename": uploaded_file.name[:50], "reason": message},
+                "WARNING"
+            )
+    
+    st.session_state.upload_validation = (upload_key, is_valid, message)
+    return is_valid, message
+
+
+def _render_parse_job_secure(job_queue) -> bool:
+    """
+    Suivi du parsing IA en job de fond : retrouve le job apres un rerun ou un rafraichissement.
+    Retourne True tant que le job est en cours ; son resultat devient le profil courant.
+    """
+    from ui.common_components import render_job_progress
+    
+    job_id = secure_session.get_pending_job('cv_parse')
+    if not job_id:
+        return False
+    
+    job = job_queue.get(job_id)
+    if job is not None and not job.finished:
+        render_job_progress(job_queue, job_id, "⏳ Analyse IA de votre CV en cours...")
+        return True
+    
+    secure_session.set_pending_job('cv_parse', None)
+    
+    if job is not None and job.status == 'done':
+        secure_session.set_current_profile(job.result)
+        st.session_state.show_generated_cv = False
+        st.success("✅ CV analyse avec securite maximale!")
+    elif job is not None:
+        st.error("❌ Erreur lors de l'analyse securisee")
+    return False
@@ -0,0 +1,128 @@
+"""
+Sérialisation compacte des objets de session
+Les dataclasses sont encodées par position (sans noms de champs) et les enums par valeur ;
+le décodage est guidé par les annotations de type. Le résultat passe par msgpack s'il est
+installé, sinon par du JSON compact, et est compressé au-delà de quelques Ko.
+"""
+
+import dataclasses
+import enum
+import hashlib
+import json
+import typing
+import zlib
+from typing import Any, Dict, Iterable, List, Tuple
+
+from utils.exceptions import ValidationException
+
+try:
+    import msgpack
+except ImportError:  # dépendance optionnelle
+    msgpack = None
+
+_RAW = 0
+_ZLIB = 1
+COMPRESS_THRESHOLD = 1024
+_PRIMITIVES = (str, int, float, bool)
+
+
+class CompactCodec:
+    """Codec des valeurs de session ; seuls les types enregistrés sont acceptés à la racine"""
+
+    def __init__(self, types: Iterable[type] = ()):
+        self._types: Dict[str, type] = {}
+        self._fields: Dict[type, List[Tuple[str, Any]]] = {}
+        for cls in types:
+            self.register(cls)
+
+    def register(self, cls: type):
+        self._types[cls.__name__] = cls
+
+    @property
+    def schema_id(self) -> str:
+        """Empreinte du format (backend + champs des types enregistrés) : invalide les données d'une autre version"""
+        parts = ['msgpack' if msgpack is not None else 'json']
+        for name in sorted(self._types):
+            cls = self._types[name]
+            if dataclasses.is_dataclass(cls):
+                parts.append(f"{name}({','.join(field for field, _ in self._field_hints(cls))})")
+            else:
+                parts.append(name)
+        return hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()[:16]
+
+    def dumps(self, value: Any) -> bytes:
+        if value is None or isinstance(value, (str, int, float, bool)):
+            tag = ''
+        else:
+            tag = type(value).__name__
+            if self._types.get(tag) is not type(value):
+                raise ValidationException(f"Type non sérialisable en session: {tag}")
+
+        payload = [tag, self._encode(value)]
+        if msgpack is not None:
+            body = msgpack.packb(payload, use_bin_type=True)
+        else:
+            body = json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+        if len(body) > COMPRESS_THRESHOLD:
+            return bytes((_ZLIB,)) + zlib.compress(body, 1)
+        return bytes((_RAW,)) + body
+
+    def loads(self, data: bytes) -> Any:
+        body = zlib.decompress(data[1:]) if data[0] == _ZLIB else data[1:]
+        if msgpack is not None:
+            tag, encoded = msgpack.unpackb(body, raw=False)
+        else:
+            tag, encoded = json.loads(body)
+        return self._decode(encoded, self._types[tag]) if tag else encoded
+
+    def _field_hints(self, cls: type) -> List[Tuple[str, Any]]:
+        fields = self._fields.get(cls)
+        if fields is None:
+            hints = typing.get_type_hints(cls)
+            fields = [(field.name, hints.get(field.name, Any)) for field in dataclasses.fields(cls) if field.init]
+            self._fields[cls] = fields
+        return fields
+
+    def _encode(self, value: Any) -> Any:
+        if value is None or type(value) in _PRIMITIVES:
+            return value
+        if isinstance(value, enum.Enum):
+            return value.value
+        if dataclasses.is_dataclass(value) and not isinstance(value, type):
+            return [self._encode(getattr(value, name)) for name, _ in self._field_hints(type(value))]
+        if isinstance(value, (list, tuple)):
+            return [self._encode(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self._encode(item) for key, item in value.items()}
+        return value
+
+    def _decode(self, data: Any, hint: Any) -> Any:
+        if data is None or hint in _PRIMITIVES or hint is Any:
+            return data
+
+        origin = typing.get_origin(hint)
+        if origin is typing.Union:
+            hint = next((arg for arg in typing.get_args(hint) if arg is not type(None)), Any)
+            origin = typing.get_origin(hint)
+
+        args = typing.get_args(hint)
+        if origin is list:
+            item_hint = args[0] if args else Any
+            return [self._decode(item, item_hint) for item in data]
+        if origin is tuple:
+            item_hint = args[0] if args else Any
+            return tuple(self._decode(item, item_hint) for item in data)
+        if origin is dict:
+            value_hint = args[1] if len(args) == 2 else Any
+            return {key: self._decode(item, value_hint) for key, item in data.items()}
+
+        if isinstance(hint, type):
+            if issubclass(hint, enum.Enum):
+                return hint(data)
+            if dataclasses.is_dataclass(hint):
+                return hint(**{
+                    name: self._decode(item, field_hint)
+                    for (name, field_hint), item in zip(self._field_hints(hint), data)
+                })
+        return data
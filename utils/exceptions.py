@@ -5,3 +5,7 @@ class SecurityException(Exception):
 class ValidationException(Exception):
     """Exception de validation"""
     pass
+
+class QuotaExceededException(SecurityException):
+    """Quota IA global saturé (file pleine ou attente trop longue) : inutile de réessayer"""
+    pass
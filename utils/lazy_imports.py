@@ -0,0 +1,49 @@
+import sys
+import types
+import importlib
+import threading
+
+_import_lock = threading.Lock()
+
+
+class LazyModule(types.ModuleType):
+    """Façade de module importé au premier accès à l'un de ses attributs"""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__['_lazy_target'] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__['_lazy_target']
+        if module is None:
+            with _import_lock:
+                module = self.__dict__['_lazy_target']
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    # Recopie des attributs : les accès suivants ne passent plus par __getattr__
+                    self.__dict__.update(module.__dict__)
+                    self.__dict__['_lazy_target'] = module
+        return module
+
+    def __getattr__(self, item: str):
+        return getattr(self._load(), item)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "chargé" if self.__dict__['_lazy_target'] is not None else "différé"
+        return f"<LazyModule {self.__name__} ({state})>"
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """Retourne le module s'il est déjà importé, sinon une façade à import différé"""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
+
+
+def is_loaded(name: str) -> bool:
+    """Indique si le module a réellement été importé dans le process"""
+    return name in sys.modules
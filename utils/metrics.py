@@ -0,0 +1,333 @@
+"""
+Registre de métriques en process (compteurs, jauges, histogrammes de latence)
+Les histogrammes suivent le principe HDR : seaux log-linéaires (32 sous-seaux par
+puissance de 2, ~3 % de précision relative) en microsecondes, mémoire bornée et
+percentiles calculables à tout moment. Exposition au format texte Prometheus.
+"""
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+# 2^5 sous-seaux par puissance de 2
+_SUB_BUCKET_BITS = 5
+_SUB_BUCKET_COUNT = 1 << _SUB_BUCKET_BITS
+
+EXPORTED_QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+def _format_value(value: float) -> str:
+    """Valeur exposée sans perte : entier tel quel, flottant au format repr (17 chiffres significatifs)"""
+    if isinstance(value, int):
+        return str(value)
+    if math.isnan(value):
+        return 'NaN'
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if value.is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class _Metric:
+    metric_type = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _label_values(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def _format_labels(self, values: LabelValues, extra: Sequence[Tuple[str, str]] = ()) -> str:
+        pairs = list(zip(self.labelnames, values)) + list(extra)
+        if not pairs:
+            return ''
+        return '{' + ','.join(f'{name}="{_escape_label(value)}"' for name, value in pairs) + '}'
+
+    def _header(self, name: str) -> List[str]:
+        return [f"# HELP {name} {self.documentation}", f"# TYPE {name} {self.metric_type}"]
+
+
+class Counter(_Metric):
+    """Compteur monotone, par combinaison de labels"""
+    metric_type = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._label_values(labels), 0)
+
+    def total(self) -> float:
+        with self._lock:
+            return sum(self._values.values())
+
+    def expose(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return self._header(f"{self.name}_total") + [
+            f"{self.name}_total{self._format_labels(key)} {_format_value(value)}" for key, value in values
+        ]
+
+
+class Gauge(_Metric):
+    """Valeur instantanée ; peut être calculée à la lecture via set_function()"""
+    metric_type = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float, **labels: str):
+        with self._lock:
+            self._values[self._label_values(labels)] = value
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str):
+        self.inc(-amount, **labels)
+
+    def set_function(self, function: Callable[[], float]):
+        """Jauge sans label évaluée à chaque lecture (taille de file, sessions...)"""
+        self._function = function
+
+    def value(self, **labels: str) -> float:
+        if self._function is not None:
+            return self._function()
+        with self._lock:
+            return self._values.get(self._label_values(labels), 0)
+
+    def expose(self) -> List[str]:
+        if self._function is not None:
+            values = [((), self._function())]
+        else:
+            with self._lock:
+                values = sorted(self._values.items())
+        return self._header(self.name) + [
+            f"{self.name}{self._format_labels(key)} {_format_value(value)}" for key, value in values
+        ]
+
+
+class _HdrCounts:
+    """Comptes par seau log-linéaire d'une combinaison de labels"""
+    __slots__ = ('counts', 'count', 'sum_us', 'max_us')
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.sum_us = 0
+        self.max_us = 0
+
+
+def _bucket_index(value_us: int) -> int:
+    if value_us < _SUB_BUCKET_COUNT:
+        return value_us
+    shift = value_us.bit_length() - 1 - _SUB_BUCKET_BITS
+    return (shift + 1) * _SUB_BUCKET_COUNT + (value_us >> shift) - _SUB_BUCKET_COUNT
+
+
+def _bucket_midpoint(index: int) -> float:
+    if index < _SUB_BUCKET_COUNT:
+        return float(index)
+    shift = index // _SUB_BUCKET_COUNT - 1
+    mantissa = index % _SUB_BUCKET_COUNT + _SUB_BUCKET_COUNT
+    return ((mantissa << shift) + ((mantissa + 1) << shift)) / 2
+
+
+class Histogram(_Metric):
+    """Histogramme de durées (secondes) à seaux HDR ; exposé comme summary Prometheus"""
+    metric_type = 'summary'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._series: Dict[LabelValues, _HdrCounts] = {}
+
+    def observe(self, seconds: float, **labels: str):
+        value_us = max(0, int(seconds * 1_000_000))
+        index = _bucket_index(value_us)
+        key = self._label_values(labels)
+
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _HdrCounts()
+            series.counts[index] = series.counts.get(index, 0) + 1
+            series.count += 1
+            series.sum_us += value_us
+            if value_us > series.max_us:
+                series.max_us = value_us
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Mesure la durée du bloc, y compris en cas d'exception"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def percentiles(self, quantiles: Sequence[float] = EXPORTED_QUANTILES, **labels: str) -> Dict[float, float]:
+        """Percentiles en secondes ; sans labels, toutes séries confondues"""
+        with self._lock:
+            if labels:
+                selected = [self._series.get(self._label_values(labels))]
+            else:
+                selected = list(self._series.values())
+            merged: Dict[int, int] = {}
+            total = 0
+            for series in selected:
+                if series is None:
+                    continue
+                total += series.count
+                for index, count in series.counts.items():
+                    merged[index] = merged.get(index, 0) + count
+
+        return self._quantiles_from(merged, total, quantiles)
+
+    @staticmethod
+    def _quantiles_from(counts: Dict[int, int], total: int, quantiles: Sequence[float]) -> Dict[float, float]:
+        result = {quantile: 0.0 for quantile in quantiles}
+        if not total:
+            return result
+
+        pending = sorted(quantiles)
+        seen = 0
+        for index in sorted(counts):
+            seen += counts[index]
+            while pending and seen >= pending[0] * total:
+                result[pending.pop(0)] = _bucket_midpoint(index) / 1_000_000
+            if not pending:
+                break
+        return result
+
+    def summary(self) -> Dict[LabelValues, Dict[str, float]]:
+        """Par série : nombre, moyenne, max et percentiles (secondes)"""
+        with self._lock:
+            series_copy = {
+                key: (dict(series.counts), series.count, series.sum_us, series.max_us)
+                for key, series in self._series.items()
+            }
+
+        summary = {}
+        for key, (counts, count, sum_us, max_us) in sorted(series_copy.items()):
+            quantiles = self._quantiles_from(counts, count, EXPORTED_QUANTILES)
+            summary[key] = {
+                'count': count,
+                'mean': sum_us / count / 1_000_000 if count else 0.0,
+                'max': max_us / 1_000_000,
+                **{f"p{int(quantile * 100)}": value for quantile, value in quantiles.items()}
+            }
+        return summary
+
+    def expose(self) -> List[str]:
+        lines = self._header(self.name)
+        with self._lock:
+            series_copy = {
+                key: (dict(series.counts), series.count, series.sum_us) for key, series in self._series.items()
+            }
+
+        for key, (counts, count, sum_us) in sorted(series_copy.items()):
+            for quantile, value in self._quantiles_from(counts, count, EXPORTED_QUANTILES).items():
+                lines.append(
+                    f"{self.name}{self._format_labels(key, [('quantile', f'{quantile:g}')])} {_format_value(value)}"
+                )
+            lines.append(f"{self.name}_sum{self._format_labels(key)} {_format_value(sum_us / 1_000_000)}")
+            lines.append(f"{self.name}_count{self._format_labels(key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Registre du process : une métrique par nom, créée au premier enregistrement"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def _get_or_create(self, metric_class, name: str, documentation: str, labelnames: Sequence[str]):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_class(name, documentation, labelnames)
+            elif not isinstance(metric, metric_class):
+                raise ValueError(f"Métrique {name} déjà enregistrée avec un autre type")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        with self._lock:
+            return self._metrics.get(name)
+
+    @property
+    def uptime_seconds(self) -> float:
+        return time.time() - self.started_at
+
+    def prometheus_text(self) -> str:
+        """Exposition au format texte Prometheus (version 0.0.4)"""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.expose())
+        return '\n'.join(lines) + '\n'
+
+
+metrics = MetricsRegistry()
+
+
+def start_metrics_server(port: int, host: str = '127.0.0.1'):
+    """Sert GET /metrics dans un thread démon (Streamlit n'expose pas de routes HTTP propres)"""
+    # http.server n'est importé que si l'endpoint est activé : l'import du module reste léger
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?', 1)[0] != '/metrics':
+                self.send_error(404)
+                return
+
+            body = metrics.prometheus_text().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # Pas de log d'accès par scrape
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+    return server
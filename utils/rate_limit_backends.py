@@ -0,0 +1,247 @@
+"""
+Backends de stockage du rate limiting (compteurs à fenêtre glissante approchée)
+- memory : process courant, verrous shardés (défaut)
+- sqlite : fichier local en mode WAL, partagé entre les process d'un même hôte
+"""
+
+import math
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+
+def slide_window(
+    window_index: int, current: int, previous: int, now: float, window_seconds: int
+) -> Tuple[int, int, int, float]:
+    """
+    Fait glisser les compteurs (courant, précédent) jusqu'à `now` et estime le compte :
+    précédent × part de la fenêtre précédente encore couverte + courant.
+    """
+    now_index = int(now // window_seconds)
+    if now_index != window_index:
+        previous = current if now_index == window_index + 1 else 0
+        current = 0
+        window_index = now_index
+
+    elapsed_fraction = (now - now_index * window_seconds) / window_seconds
+    return window_index, current, previous, previous * (1.0 - elapsed_fraction) + current
+
+
+class RateLimitBackend(ABC):
+    """Interface des backends : vérification-incrément atomique et lecture du restant"""
+
+    @abstractmethod
+    def hit(self, key: str, max_requests: int, window_seconds: int) -> Tuple[bool, float]:
+        """Compte la requête si elle est autorisée ; retourne (autorisée, compte estimé)"""
+
+    @abstractmethod
+    def remaining(self, key: str, max_requests: int, window_seconds: int) -> int:
+        """Requêtes encore autorisées dans la fenêtre, sans en compter une"""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Nombre de clés suivies"""
+
+
+class _WindowState:
+    """Compteurs de la fenêtre courante et de la précédente : mémoire constante par clé"""
+    __slots__ = ('window_index', 'current', 'previous', 'expires_at')
+
+    def __init__(self, window_index: int):
+        self.window_index = window_index
+        self.current = 0
+        self.previous = 0
+        self.expires_at = 0.0
+
+
+class _Shard:
+    __slots__ = ('lock', 'windows')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # Un OrderedDict par durée de fenêtre, ordonné par dernier accès :
+        # l'ordre d'accès y est aussi l'ordre d'expiration, les clés inactives sont en tête
+        self.windows: "Dict[int, OrderedDict[Tuple[str, int], _WindowState]]" = {}
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """
+    Compteurs en mémoire du process. Chaque vérification est en O(1) ; les verrous
+    sont répartis sur des shards et les clés inactives sont évincées au fil des accès.
+    """
+
+    def __init__(self, shard_count: int = 16):
+        self._shards = tuple(_Shard() for _ in range(shard_count))
+
+    def _shard_for(self, key: str) -> _Shard:
+        return self._shards[hash(key) % len(self._shards)]
+
+    @staticmethod
+    def _slide(state: _WindowState, now: float, window_seconds: int) -> float:
+        state.window_index, state.current, state.previous, estimated = slide_window(
+            state.window_index, state.current, state.previous, now, window_seconds
+        )
+        return estimated
+
+    @staticmethod
+    def _evict_idle(shard: _Shard, now: float):
+        """Éviction amortie : retire les clés de tête dont les deux fenêtres sont expirées"""
+        for states in shard.windows.values():
+            while states:
+                state = next(iter(states.values()))
+                if state.expires_at > now:
+                    break
+                states.popitem(last=False)
+
+    def hit(self, key: str, max_requests: int, window_seconds: int) -> Tuple[bool, float]:
+        now = time.monotonic()
+        state_key = (key, max_requests)
+        shard = self._shard_for(key)
+
+        with shard.lock:
+            self._evict_idle(shard, now)
+
+            states = shard.windows.setdefault(window_seconds, OrderedDict())
+            state = states.get(state_key)
+            if state is None:
+                state = _WindowState(int(now // window_seconds))
+                states[state_key] = state
+            else:
+                states.move_to_end(state_key)
+
+            # Au-delà de deux fenêtres sans accès, l'état n'a plus d'effet sur l'estimation
+            state.expires_at = now + 2 * window_seconds
+            estimated = self._slide(state, now, window_seconds)
+            allowed = estimated < max_requests
+            if allowed:
+                state.current += 1
+
+        return allowed, estimated
+
+    def remaining(self, key: str, max_requests: int, window_seconds: int) -> int:
+        now = time.monotonic()
+        shard = self._shard_for(key)
+
+        with shard.lock:
+            state = shard.windows.get(window_seconds, {}).get((key, max_requests))
+            if state is None:
+                return max_requests
+
+            estimated = self._slide(state, now, window_seconds)
+            return max(0, max_requests - math.ceil(estimated))
+
+    def __len__(self) -> int:
+        return sum(len(states) for shard in self._shards for states in shard.windows.values())
+
+
+class SQLiteRateLimitBackend(RateLimitBackend):
+    """
+    Compteurs partagés entre les process d'un même hôte via un fichier SQLite en mode WAL.
+    La vérification-incrément est une transaction BEGIN IMMEDIATE (verrou d'écriture
+    unique) ; l'horloge est l'heure murale, commune à tous les process.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS rate_limits (
+            key TEXT NOT NULL,
+            max_requests INTEGER NOT NULL,
+            window_seconds INTEGER NOT NULL,
+            window_index INTEGER NOT NULL,
+            current INTEGER NOT NULL,
+            previous INTEGER NOT NULL,
+            expires_at REAL NOT NULL,
+            PRIMARY KEY (key, max_requests, window_seconds)
+        ) WITHOUT ROWID
+    """
+
+    def __init__(self, path: str, busy_timeout_ms: int = 2000, evict_every: int = 1000):
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self.evict_every = evict_every
+        self._local = threading.local()
+        self._hits = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+
+        connection = self._connection()
+        connection.execute(self._SCHEMA)
+        connection.execute("CREATE INDEX IF NOT EXISTS rate_limits_expiry ON rate_limits (expires_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        """Une connexion par thread et par process (jamais héritée d'un fork)"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, isolation_level=None, timeout=self.busy_timeout_ms / 1000)
+            connection.execute("PRAGMA journal_mode=WAL")
+            # NORMAL suffit en WAL : un crash machine peut perdre les derniers compteurs, pas corrompre
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def hit(self, key: str, max_requests: int, window_seconds: int) -> Tuple[bool, float]:
+        now = time.time()
+        connection = self._connection()
+
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute(
+                "SELECT window_index, current, previous FROM rate_limits "
+                "WHERE key = ? AND max_requests = ? AND window_seconds = ?",
+                (key, max_requests, window_seconds)
+            ).fetchone()
+
+            window_index, current, previous = row if row else (int(now // window_seconds), 0, 0)
+            window_index, current, previous, estimated = slide_window(
+                window_index, current, previous, now, window_seconds
+            )
+            allowed = estimated < max_requests
+            if allowed:
+                current += 1
+
+            connection.execute(
+                "INSERT OR REPLACE INTO rate_limits VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, max_requests, window_seconds, window_index, current, previous, now + 2 * window_seconds)
+            )
+
+            self._hits += 1
+            if self._hits % self.evict_every == 0:
+                connection.execute("DELETE FROM rate_limits WHERE expires_at < ?", (now,))
+
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+        return allowed, estimated
+
+    def remaining(self, key: str, max_requests: int, window_seconds: int) -> int:
+        row = self._connection().execute(
+            "SELECT window_index, current, previous FROM rate_limits "
+            "WHERE key = ? AND max_requests = ? AND window_seconds = ?",
+            (key, max_requests, window_seconds)
+        ).fetchone()
+        if row is None:
+            return max_requests
+
+        estimated = slide_window(*row, time.time(), window_seconds)[3]
+        return max(0, max_requests - math.ceil(estimated))
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM rate_limits").fetchone()[0]
+
+
+def create_backend(name: str, sqlite_path: str = '') -> RateLimitBackend:
+    """Fabrique de backend depuis la configuration (`memory` ou `sqlite`)"""
+    if name == 'memory':
+        return MemoryRateLimitBackend()
+    if name == 'sqlite':
+        return SQLiteRateLimitBackend(sqlite_path)
+    raise ValueError(f"Backend de rate limiting inconnu: {name}")
@@ -1,55 +1,49 @@
-import time
-import threading
 from functools import wraps
-import streamlit as st
+from typing import Optional
 
+from config.security_config import SecurityConfig
+from utils.rate_limit_backends import RateLimitBackend, create_backend
+from utils.metrics import metrics
 from utils.secure_logging import secure_logger
+from utils.request_context import get_request_context
+
+RATE_LIMIT_REJECTIONS = metrics.counter(
+    'phoenix_rate_limit_rejections', "Requêtes refusées par le rate limiting", ('limit',)
+)
+
 
 class RateLimiter:
-    """Rate limiter thread-safe"""
-    
-    def __init__(self):
-        self._limits = {}
-        self._lock = threading.Lock()
-    
+    """
+    Rate limiter thread-safe à fenêtre glissante approchée (sliding window counter).
+    Le stockage des compteurs est délégué à un backend : mémoire du process par défaut,
+    SQLite partagé pour plusieurs process Streamlit sur un même hôte.
+    """
+
+    def __init__(self, backend: Optional[RateLimitBackend] = None):
+        self.backend = backend or create_backend(
+            SecurityConfig.RATE_LIMIT_BACKEND, SecurityConfig.RATE_LIMIT_SQLITE_PATH
+        )
+
     def is_allowed(self, key: str, max_requests: int, window_seconds: int) -> bool:
         """Vérifie si la requête est autorisée"""
-        now = time.time()
-        
-        with self._lock:
-            if key not in self._limits:
-                self._limits[key] = []
-            
-            self._limits[key] = [
-                timestamp for timestamp in self._limits[key]
-                if now - timestamp < window_seconds
-            ]
-            
-            if len(self._limits[key]) >= max_requests:
-                secure_logger.log_security_event(
-                    "RATE_LIMIT_EXCEEDED",
-                    {"key": key[:10], "requests": len(self._limits[key])},
-                    "WARNING"
-                )
-                return False
-            
-            self._limits[key].append(now)
-            return True
-    
+        allowed, estimated = self.backend.hit(key, max_requests, window_seconds)
+
+        if not allowed:
+            RATE_LIMIT_REJECTIONS.inc(limit=f"{max_requests}/{window_seconds}s")
+            secure_logger.log_security_event(
+                "RATE_LIMIT_EXCEEDED",
+                {"key": key[:10], "requests": int(estimated)},
+                "WARNING"
+            )
+        return allowed
+
     def get_remaining_requests(self, key: str, max_requests: int, window_seconds: int) -> int:
         """Retourne le nombre de requêtes restantes"""
-        now = time.time()
-        
-        with self._lock:
-            if key not in self._limits:
-                return max_requests
-            
-            recent_requests = [
-                timestamp for timestamp in self._limits[key]
-                if now - timestamp < window_seconds
-            ]
-            
-            return max(0, max_requests - len(recent_requests))
+        return self.backend.remaining(key, max_requests, window_seconds)
+
+    def __len__(self) -> int:
+        """Nombre de clés suivies par le backend"""
+        return len(self.backend)
 
 rate_limiter = RateLimiter()
 
@@ -58,12 +52,12 @@ def rate_limit(max_requests: int, window_seconds: int):
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            client_key = st.session_state.get('secure_session_id', 'anonymous')
-            
-            if not rate_limiter.is_allowed(client_key, max_requests, window_seconds):
-                st.error("🚫 Trop de requêtes. Veuillez patienter avant de réessayer.")
-                st.stop()
-            
+            context = get_request_context()
+
+            if not rate_limiter.is_allowed(context.session_id, max_requests, window_seconds):
+                # Politique fournie par l'adaptateur (Streamlit : message + st.stop)
+                context.on_rate_limited()
+
             return func(*args, **kwargs)
         return wrapper
     return decorator
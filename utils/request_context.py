@@ -0,0 +1,65 @@
+"""
+Contexte de requête indépendant de l'interface (contextvars)
+Fournit l'identifiant de session et la politique de rejet du rate limiting
+aux utilitaires ; Streamlit n'est qu'un adaptateur parmi d'autres (CLI, workers).
+"""
+
+import hashlib
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Callable, Iterator
+
+from utils.exceptions import SecurityException
+
+ANONYMOUS_SESSION_ID = 'anonymous'
+
+
+def raise_rate_limited():
+    """Politique de rejet par défaut : exception, adaptée aux traitements headless"""
+    raise SecurityException("Trop de requêtes")
+
+
+def hash_session_id(session_id: str) -> str:
+    """Hash anonyme de session, tel qu'il apparaît dans les logs"""
+    return hashlib.sha256(session_id.encode()).hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class RequestContext:
+    """Contexte immuable d'une session ; le hash est calculé une fois à la création"""
+    session_id: str = ANONYMOUS_SESSION_ID
+    on_rate_limited: Callable[[], None] = raise_rate_limited
+    # Valeur de CVTier, utilisée pour prioriser les appels IA
+    tier: str = 'free'
+    session_hash: str = field(init=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, 'session_hash', hash_session_id(self.session_id))
+
+
+ANONYMOUS_CONTEXT = RequestContext()
+
+_current_context: ContextVar[RequestContext] = ContextVar('phoenix_request_context', default=ANONYMOUS_CONTEXT)
+
+
+def get_request_context() -> RequestContext:
+    return _current_context.get()
+
+
+def set_request_context(context: RequestContext) -> Token:
+    return _current_context.set(context)
+
+
+def reset_request_context(token: Token):
+    _current_context.reset(token)
+
+
+@contextmanager
+def request_context(context: RequestContext) -> Iterator[RequestContext]:
+    """Active `context` le temps d'un bloc (job batch, tâche asynchrone...)"""
+    token = _current_context.set(context)
+    try:
+        yield context
+    finally:
+        _current_context.reset(token)
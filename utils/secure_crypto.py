@@ -3,8 +3,13 @@ import secrets
 import hmac
 import hashlib
 import base64
-from cryptography.fernet import Fernet
+import struct
+import threading
+from typing import BinaryIO, Dict, Tuple
+from cryptography.fernet import Fernet, MultiFernet
 from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
 from config.security_config import SecurityConfig
@@ -14,9 +19,62 @@ from utils.secure_logging import secure_logger
 class SecureCrypto:
     """Services cryptographiques sécurisés"""
     
+    STREAM_CHUNK_SIZE = 64 * 1024
+    
+    # AEAD (AES-256-GCM) : flux par blocs et données binaires, sans base64
+    AEAD_STREAM_MAGIC = b'PHXS1'
+    AEAD_BYTES_MAGIC = b'PHXB1'
+    _AEAD_KEY_ID_SIZE = 8
+    _AEAD_NONCE_PREFIX_SIZE = 8
+    _AEAD_NONCE_SIZE = 12
+    # Bloc chiffré : longueur du chiffré (4 octets) + drapeau dernier bloc (1 octet)
+    _AEAD_RECORD_HEADER = struct.Struct('>IB')
+    
     def __init__(self):
-        self._encryption_key = SecurityConfig.get_encryption_key()
-        self._fernet = Fernet(self._encryption_key)
+        # Le trousseau n'est résolu qu'au premier chiffrement : l'import et la création
+        # de l'instance ne paient pas la dérivation PBKDF2
+        self._fernet_instance = None
+        self._aead_ring = None
+        self._fernet_lock = threading.Lock()
+    
+    @property
+    def _fernet(self) -> MultiFernet:
+        """Chiffre avec la clé primaire, déchiffre avec toutes les clés du trousseau"""
+        if self._fernet_instance is None:
+            with self._fernet_lock:
+                if self._fernet_instance is None:
+                    self._fernet_instance = MultiFernet(
+                        [Fernet(key) for key in SecurityConfig.get_encryption_keys()]
+                    )
+        return self._fernet_instance
+    
+    @property
+    def _aead_keys(self) -> Tuple[bytes, Dict[bytes, AESGCM]]:
+        """
+        Clés AES-256-GCM dérivées (HKDF) du trousseau Fernet : (id de la clé primaire, id -> clé).
+        L'id est stocké en clair dans l'en-tête pour retrouver la clé après rotation.
+        """
+        if self._aead_ring is None:
+            with self._fernet_lock:
+                if self._aead_ring is None:
+                    ring = {}
+                    primary_id = None
+                    for fernet_key in SecurityConfig.get_encryption_keys():
+                        aead_key = HKDF(
+                            algorithm=hashes.SHA256(), length=32, salt=None, info=b'phoenix-cv/aead/v1'
+                        ).derive(base64.urlsafe_b64decode(fernet_key))
+                        key_id = hashlib.sha256(aead_key).digest()[:self._AEAD_KEY_ID_SIZE]
+                        ring[key_id] = AESGCM(aead_key)
+                        if primary_id is None:
+                            primary_id = key_id
+                    self._aead_ring = (primary_id, ring)
+        return self._aead_ring
+    
+    def _aead_for(self, key_id: bytes) -> AESGCM:
+        aead = self._aead_keys[1].get(key_id)
+        if aead is None:
+            raise SecurityException("Clé de chiffrement inconnue")
+        return aead
     
     def encrypt_data(self, data: str) -> str:
         """Chiffrement sécurisé AES-256"""
@@ -35,6 +93,110 @@ class SecureCrypto:
         except Exception:
             raise SecurityException("Erreur de déchiffrement")
     
+    def rotate_data(self, encrypted_data: str) -> str:
+        """Rechiffre une donnée avec la clé primaire (après rotation du trousseau)"""
+        try:
+            encrypted_bytes = base64.urlsafe_b64decode(encrypted_data.encode('utf-8'))
+            rotated = self._fernet.rotate(encrypted_bytes)
+            return base64.urlsafe_b64encode(rotated).decode('utf-8')
+        except Exception:
+            raise SecurityException("Erreur de rotation de clé")
+    
+    def encrypt_bytes(self, data: bytes) -> bytes:
+        """Chiffrement AEAD de données binaires : magic + id de clé + nonce + chiffré (sans base64)"""
+        try:
+            primary_id, ring = self._aead_keys
+            header = self.AEAD_BYTES_MAGIC + primary_id
+            nonce = os.urandom(self._AEAD_NONCE_SIZE)
+            return header + nonce + ring[primary_id].encrypt(nonce, data, header)
+        except Exception:
+            raise SecurityException("Erreur de chiffrement")
+    
+    def decrypt_bytes(self, encrypted: bytes) -> bytes:
+        try:
+            header_size = len(self.AEAD_BYTES_MAGIC) + self._AEAD_KEY_ID_SIZE
+            header = encrypted[:header_size]
+            if not header.startswith(self.AEAD_BYTES_MAGIC):
+                raise SecurityException("Format chiffré inconnu")
+            
+            nonce = encrypted[header_size:header_size + self._AEAD_NONCE_SIZE]
+            aead = self._aead_for(header[len(self.AEAD_BYTES_MAGIC):])
+            return aead.decrypt(nonce, encrypted[header_size + self._AEAD_NONCE_SIZE:], header)
+        except Exception:
+            raise SecurityException("Erreur de déchiffrement")
+    
+    def encrypt_stream_aead(self, source: BinaryIO, destination: BinaryIO, chunk_size: int = STREAM_CHUNK_SIZE) -> int:
+        """
+        Chiffrement AES-256-GCM d'un flux par blocs, en mémoire constante.
+        Nonce = préfixe aléatoire du flux + compteur de bloc ; l'en-tête, le compteur et le
+        drapeau de dernier bloc sont authentifiés (données associées) : réordonner,
+        supprimer ou tronquer des blocs est détecté au déchiffrement.
+        """
+        try:
+            primary_id, ring = self._aead_keys
+            aead = ring[primary_id]
+            nonce_prefix = os.urandom(self._AEAD_NONCE_PREFIX_SIZE)
+            header = self.AEAD_STREAM_MAGIC + primary_id + nonce_prefix
+            destination.write(header)
+            written = len(header)
+            
+            counter = 0
+            chunk = source.read(chunk_size)
+            while True:
+                next_chunk = source.read(chunk_size) if chunk else b''
+                is_last = 0 if next_chunk else 1
+                
+                counter_bytes = counter.to_bytes(4, 'big')
+                ciphertext = aead.encrypt(
+                    nonce_prefix + counter_bytes, chunk, header + counter_bytes + bytes((is_last,))
+                )
+                destination.write(self._AEAD_RECORD_HEADER.pack(len(ciphertext), is_last))
+                destination.write(ciphertext)
+                written += self._AEAD_RECORD_HEADER.size + len(ciphertext)
+                
+                if is_last:
+                    return written
+                
+                chunk = next_chunk
+                counter += 1
+        except Exception:
+            raise SecurityException("Erreur de chiffrement")
+    
+    def decrypt_stream_aead(self, source: BinaryIO, destination: BinaryIO) -> int:
+        """Déchiffrement d'un flux produit par encrypt_stream_aead"""
+        try:
+            header_size = len(self.AEAD_STREAM_MAGIC) + self._AEAD_KEY_ID_SIZE + self._AEAD_NONCE_PREFIX_SIZE
+            header = source.read(header_size)
+            if len(header) != header_size or not header.startswith(self.AEAD_STREAM_MAGIC):
+                raise SecurityException("Format chiffré inconnu")
+            
+            key_id = header[len(self.AEAD_STREAM_MAGIC):len(self.AEAD_STREAM_MAGIC) + self._AEAD_KEY_ID_SIZE]
+            nonce_prefix = header[-self._AEAD_NONCE_PREFIX_SIZE:]
+            aead = self._aead_for(key_id)
+            
+            counter = 0
+            written = 0
+            while True:
+                record_header = source.read(self._AEAD_RECORD_HEADER.size)
+                if len(record_header) != self._AEAD_RECORD_HEADER.size:
+                    raise SecurityException("Flux chiffré tronqué")
+                length, is_last = self._AEAD_RECORD_HEADER.unpack(record_header)
+                
+                ciphertext = source.read(length)
+                if len(ciphertext) != length:
+                    raise SecurityException("Flux chiffré tronqué")
+
+                counter_bytes = counter.to_bytes(4, 'big')
+                data = aead.decrypt(nonce_prefix + counter_bytes, ciphertext, header + counter_bytes + bytes((is_last,)))
+                destination.write(data)
+                written += len(data)
+                
+                if is_last:
+                    return written
+                counter += 1
+        except Exception:
+            raise SecurityException("Erreur de déchiffrement")
+    
     def generate_secure_token(self, length: int = 32) -> str:
         """Génération token cryptographiquement sécurisé"""
         return secrets.token_urlsafe(length)
@@ -1,19 +1,50 @@
+import atexit
 import logging
 import json
+import os
+import queue
 import threading
+import time
+from collections import deque
 from datetime import datetime
 from typing import Dict, Any, List
-import hashlib
-import streamlit as st # Temporaire, à revoir si Streamlit est toujours accessible ici
+
+from utils.request_context import get_request_context
+
 
 class SecureLogger:
-    """Système de logging sécurisé sans PII"""
+    """
+    Système de logging sécurisé sans PII.
+    Le chemin appelant se limite à un enqueue non bloquant dans une file bornée ;
+    anonymisation, sérialisation JSON et écriture sont faites par un thread listener.
+    """
     
-    def __init__(self):
+    def __init__(
+        self,
+        queue_size: int = 10000,
+        ring_size: int = 1000,
+        sampling_watermark: float = 0.8,
+        sample_every: int = 10
+    ):
         self.logger = logging.getLogger('phoenix_cv_secure')
         self._setup_secure_logging()
-        self._security_events = []
-        self._lock = threading.Lock()
+        self._queue_size = queue_size
+        # Anneau des derniers événements : append atomique, pas de recopie de liste
+        self._security_events = deque(maxlen=ring_size)
+        # Au-delà de ce remplissage, seul 1 événement INFO sur `sample_every` est conservé
+        self._sampling_threshold = int(queue_size * sampling_watermark)
+        self._sample_every = sample_every
+        # Compteurs indicatifs (incréments non verrouillés)
+        self._sample_counter = 0
+        self.dropped_events = 0
+        self.sampled_out_events = 0
+        self._reported_drops = 0
+        
+        self._start_listener()
+        atexit.register(self.flush)
+        if hasattr(os, 'register_at_fork'):
+            # Le thread listener n'existe pas dans un process forké : on le relance
+            os.register_at_fork(after_in_child=self._start_listener)
     
     def _setup_secure_logging(self):
         """Configure le logging sécurisé"""
@@ -29,30 +60,71 @@ class SecureLogger:
         self.logger.setLevel(logging.INFO)
         self.logger.propagate = False
     
+    def _start_listener(self):
+        self._queue = queue.Queue(maxsize=self._queue_size)
+        self._listener = threading.Thread(
+            target=self._listen, name='phoenix-secure-logger', daemon=True
+        )
+        self._listener.start()
+    
     def log_security_event(self, event_type: str, details: Dict[str, Any], severity: str = "INFO"):
-        """Log d'événement sécurisé sans PII"""
+        """Log d'événement sécurisé sans PII (enqueue en temps constant)"""
         try:
-            with self._lock:
-                safe_details = self._anonymize_log_data(details)
-                
-                event = {
-                    'timestamp': datetime.utcnow().isoformat(),
-                    'event_type': event_type,
-                    'details': safe_details,
-                    'severity': severity,
-                    'session_hash': self._get_session_hash()
-                }
-                
-                self.logger.info(f"SECURITY_EVENT: {json.dumps(event)}")
+            if severity == "INFO" and self._queue.qsize() >= self._sampling_threshold:
+                self._sample_counter += 1
+                if self._sample_counter % self._sample_every:
+                    self.sampled_out_events += 1
+                    return
                 
-                self._security_events.append(event)
-                
-                if len(self._security_events) > 1000:
-                    self._security_events = self._security_events[-500:]
-                    
+            # Le hash de session est lu ici : le contexte appartient au thread appelant
+            self._queue.put_nowait(
+                (time.time(), event_type, dict(details), severity, self._get_session_hash())
+            )
+        except queue.Full:
+            self.dropped_events += 1
         except Exception:
             pass
     
+    def _listen(self):
+        """Thread listener : met en forme et écrit les événements de la file"""
+        events_queue = self._queue
+        while True:
+            item = events_queue.get()
+            try:
+                self._write_event(*item)
+                self._report_drops()
+            except Exception:
+                pass
+            finally:
+                events_queue.task_done()
+    
+    def _write_event(self, timestamp: float, event_type: str, details: Dict[str, Any], severity: str, session_hash: str):
+        event = {
+            'timestamp': datetime.utcfromtimestamp(timestamp).isoformat(),
+            'event_type': event_type,
+            'details': self._anonymize_log_data(details),
+            'severity': severity,
+            'session_hash': session_hash
+        }
+        
+        self.logger.info(f"SECURITY_EVENT: {json.dumps(event)}")
+        self._security_events.append(event)
+    
+    def _report_drops(self):
+        dropped = self.dropped_events
+        if dropped > self._reported_drops:
+            self.logger.warning(
+                f"SECURITY_LOG_BACKPRESSURE: {dropped - self._reported_drops} événement(s) perdu(s), "
+                f"{self.sampled_out_events} échantillonné(s) au total"
+            )
+            self._reported_drops = dropped
+    
+    def flush(self, timeout: float = 2.0):
+        """Attend l'écriture des événements en file (tests, CLI, arrêt du process)"""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.005)
+    
     def _anonymize_log_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Anonymise les données de log"""
         safe_data = {}
@@ -68,14 +140,17 @@ class SecureLogger:
         return safe_data
     
     def _get_session_hash(self) -> str:
-        """Hash anonyme de session"""
-        session_id = st.session_state.get('secure_session_id', 'anonymous')
-        return hashlib.sha256(session_id.encode()).hexdigest()[:16]
+        """Hash anonyme de session, précalculé dans le contexte de requête"""
+        return get_request_context().session_hash
     
     @property
     def recent_security_events(self) -> List[Dict]:
         """Retourne les événements récents (anonymisés)"""
-        with self._lock:
-            return self._security_events[-10:].copy()
+        return list(self._security_events)[-10:]
+    
+    def recent_alerts(self, limit: int = 10) -> List[Dict]:
+        """Derniers événements WARNING ou plus graves du buffer, du plus récent au plus ancien"""
+        alerts = [event for event in reversed(list(self._security_events)) if event.get('severity') != 'INFO']
+        return alerts[:limit]
 
 secure_logger = SecureLogger()
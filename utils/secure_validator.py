@@ -88,6 +88,16 @@ class SecureValidator:
         
         return cleaned
     
+    @staticmethod
+    def sanitize_template_html(template_html: str) -> str:
+        """Sanitisation d'un template statique : structure et classes conservées, scripts et handlers retirés"""
+        return bleach.clean(
+            template_html,
+            tags=SecurityConfig.TEMPLATE_HTML_TAGS,
+            attributes=SecurityConfig.TEMPLATE_HTML_ATTRIBUTES,
+            strip=True
+        )
+    
     @staticmethod
     def validate_json_schema(data: Dict, schema: Schema) -> Dict:
         """Validation sécurisée JSON avec schéma"""
@@ -0,0 +1,210 @@
+"""
+Traces par action utilisateur (upload → extraction → parsing → rendu)
+Les spans sont des context managers imbriqués via contextvars : un span ouvert sans parent
+démarre une nouvelle trace, dont l'identifiant sert d'identifiant de corrélation. Le contexte
+suit les threads des executors lorsqu'il est copié (contextvars.copy_context).
+Export au format JSON OTLP (OpenTelemetry), en mémoire et optionnellement dans un fichier JSONL.
+"""
+
+import json
+import secrets
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from config.security_config import SecurityConfig
+
+SERVICE_NAME = 'phoenix-cv'
+
+# Codes de statut OTLP
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+
+class Span:
+    """Opération chronométrée d'une trace"""
+    __slots__ = (
+        'name', 'trace_id', 'span_id', 'parent_id', 'start_ns', 'end_ns',
+        'attributes', 'status_code', 'status_message'
+    )
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes = attributes
+        self.status_code = STATUS_UNSET
+        self.status_message = ''
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def set_error(self, message: str):
+        self.status_code = STATUS_ERROR
+        self.status_message = message[:200]
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1_000_000 if self.end_ns else 0.0
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': 1,  # SPAN_KIND_INTERNAL
+            'startTimeUnixNano': str(self.start_ns),
+            'endTimeUnixNano': str(self.end_ns),
+            'attributes': [_otlp_attribute(key, value) for key, value in self.attributes.items()],
+            'status': {'code': self.status_code}
+        }
+        if self.parent_id:
+            span['parentSpanId'] = self.parent_id
+        if self.status_message:
+            span['status']['message'] = self.status_message
+        return span
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        typed = {'boolValue': value}
+    elif isinstance(value, int):
+        typed = {'intValue': str(value)}
+    elif isinstance(value, float):
+        typed = {'doubleValue': value}
+    else:
+        typed = {'stringValue': str(value)}
+    return {'key': key, 'value': typed}
+
+
+def to_otlp_json(spans: List[Span]) -> Dict[str, Any]:
+    """Document ExportTraceServiceRequest (JSON OTLP) pour une liste de spans"""
+    return {
+        'resourceSpans': [{
+            'resource': {'attributes': [_otlp_attribute('service.name', SERVICE_NAME)]},
+            'scopeSpans': [{
+                'scope': {'name': 'phoenix_cv.tracing'},
+                'spans': [span.to_otlp() for span in spans]
+            }]
+        }]
+    }
+
+
+class Tracer:
+    """
+    Collecte les spans terminés : une trace est publiée à la fin de son span racine.
+    Les spans terminés après leur racine (jobs en arrière-plan) sont publiés seuls,
+    sous le même identifiant de trace.
+    """
+
+    def __init__(
+        self,
+        buffer_size: int = SecurityConfig.TRACE_BUFFER_SIZE,
+        export_path: Optional[str] = SecurityConfig.TRACE_FILE,
+        max_pending_traces: int = 1000
+    ):
+        self.export_path = export_path
+        self.max_pending_traces = max_pending_traces
+        self._pending: "OrderedDict[str, List[Span]]" = OrderedDict()
+        self._recent: Deque[List[Span]] = deque(maxlen=buffer_size)
+        self._lock = threading.Lock()
+        self._export_lock = threading.Lock()
+
+    def start_trace(self, trace_id: str):
+        with self._lock:
+            self._pending[trace_id] = []
+            while len(self._pending) > self.max_pending_traces:
+                self._pending.popitem(last=False)
+
+    def on_end(self, span: Span):
+        with self._lock:
+            pending = self._pending.get(span.trace_id)
+            if span.parent_id is None:
+                spans = self._pending.pop(span.trace_id, [])
+                spans.append(span)
+            elif pending is not None:
+                pending.append(span)
+                return
+            else:
+                spans = [span]
+            self._recent.append(spans)
+
+        if self.export_path:
+            self._export_to_file(spans)
+
+    def _export_to_file(self, spans: List[Span]):
+        line = json.dumps(to_otlp_json(spans), separators=(',', ':'), ensure_ascii=False)
+        try:
+            with self._export_lock:
+                with open(self.export_path, 'a', encoding='utf-8') as f:
+                    f.write(line + '\n')
+        except OSError:
+            # L'export des traces ne doit jamais faire échouer la requête tracée
+            pass
+
+    def recent_traces(self) -> List[List[Span]]:
+        """Traces publiées récemment, de la plus récente à la plus ancienne"""
+        with self._lock:
+            return list(reversed(self._recent))
+
+    def export_otlp_json(self, trace_id: Optional[str] = None) -> Dict[str, Any]:
+        """Traces récentes (ou une seule) au format JSON OTLP"""
+        spans = [
+            span
+            for trace in self.recent_traces()
+            for span in trace
+            if trace_id is None or span.trace_id == trace_id
+        ]
+        return to_otlp_json(spans)
+
+
+tracer = Tracer()
+
+_current_span: ContextVar[Optional[Span]] = ContextVar('phoenix_current_span', default=None)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def current_trace_id() -> Optional[str]:
+    """Identifiant de corrélation de l'action utilisateur en cours"""
+    span = _current_span.get()
+    return span.trace_id if span is not None else None
+
+
+@contextmanager
+def trace_span(name: str, **attributes: Any) -> Iterator[Span]:
+    """
+    Ouvre un span enfant du span courant, ou la racine d'une nouvelle trace.
+    Utilisable aussi comme décorateur (attributs fixes).
+    """
+    parent = _current_span.get()
+    if parent is None:
+        trace_id = secrets.token_hex(16)
+        tracer.start_trace(trace_id)
+        span = Span(name, trace_id, None, attributes)
+    else:
+        span = Span(name, parent.trace_id, parent.span_id, attributes)
+
+    span.attributes['thread.name'] = threading.current_thread().name
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        if span.status_code == STATUS_UNSET:
+            span.set_error(type(e).__name__)
+        raise
+    finally:
+        _current_span.reset(token)
+        span.end_ns = time.time_ns()
+        if span.status_code == STATUS_UNSET:
+            span.status_code = STATUS_OK
+        tracer.on_end(span)